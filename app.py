@@ -1 +1,2 @@
-from main import *
\ No newline at end of file
+if __name__ != "__mp_main__":
+    from main import *
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Compara o tamanho e o tempo de gravação/leitura das sessões dos players no formato atual e com pickle
+# (ex: python -m benchmarks.session_format 5000)
+import base64
+import datetime
+import os
+import pickle
+import random
+import string
+import struct
+import sys
+import zlib
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.music.session_codec import convert_pickle, decode_session, encode_session, verify_session
+
+
+def random_text(size: int):
+    return "".join(random.choices(string.ascii_letters + " ", k=size))
+
+
+def utf(text: str):
+    data = text.encode()
+    return struct.pack(">H", len(data)) + data
+
+
+# id no mesmo formato das tracks do lavalink (os dados da música codificados em base64).
+def lavalink_id(title: str, author: str, length: int, identifier: str, uri: str):
+    data = bytes([2]) + utf(title) + utf(author) + struct.pack(">q", length) + utf(identifier) + b"\x00" + \
+        b"\x01" + utf(uri) + utf("youtube") + struct.pack(">q", 0)
+    return base64.b64encode(struct.pack(">i", len(data) | (1 << 30)) + data).decode()
+
+
+def track_info(authors: list, requesters: list, playlist: dict):
+    identifier = "".join(random.choices(string.ascii_letters + string.digits, k=11))
+    title = random_text(40)
+    author = random.choice(authors)
+    uri = f"https://www.youtube.com/watch?v={identifier}"
+    length = random.randint(90000, 400000)
+    return {
+        "identifier": identifier,
+        "author": author,
+        "title": title,
+        "uri": uri,
+        "length": length,
+        "isStream": False,
+        "isSeekable": True,
+        "sourceName": "youtube",
+        "extra": {
+            "requester": random.choice(requesters),
+            "track_loops": 0,
+            "autoplay": False,
+            "thumb": f"https://img.youtube.com/vi/{identifier}/mqdefault.jpg",
+        },
+        "id": lavalink_id(title, author, length, identifier, uri),
+        "playlist": playlist,
+    }
+
+
+def session_data(amount: int):
+    authors = [random_text(12) for _ in range(max(amount // 20, 1))]
+    requesters = [random.randint(10 ** 17, 10 ** 18) for _ in range(5)]
+    playlist = {"name": random_text(30), "url": "https://www.youtube.com/playlist?list=PLbenchmark"}
+    return {
+        "_id": 1234567890123456,
+        "volume": 100,
+        "position": 123456,
+        "voice_channel": 1234567890123457,
+        "dj": {requesters[0]},
+        "paused": False,
+        "loop": False,
+        "skin": "default",
+        "time": datetime.datetime.now(datetime.timezone.utc),
+        "voice_state": {"sessionId": random_text(32), "event": {"token": random_text(16), "endpoint": "test"}},
+        "queue": [track_info(authors, requesters, playlist) for _ in range(amount)],
+        "played": [track_info(authors, requesters, playlist) for _ in range(min(amount, 30))],
+        "queue_autoplay": [],
+        "failed_tracks": [],
+    }
+
+
+def timeit(func, runs: int):
+    start = perf_counter()
+    for _ in range(runs):
+        result = func()
+    return result, (perf_counter() - start) / runs * 1000
+
+
+def main(amount: int = 5000, runs: int = 5):
+
+    random.seed(0)
+    data = session_data(amount)
+
+    pickled, pickle_dump = timeit(lambda: zlib.compress(pickle.dumps(data)), runs)
+    _, pickle_load = timeit(lambda: pickle.loads(zlib.decompress(pickled)), runs)
+
+    encoded, dump = timeit(lambda: encode_session(data), runs)
+    decoded, load = timeit(lambda: decode_session(encoded), runs)
+
+    assert decoded == data
+
+    _, convert = timeit(lambda: convert_pickle(pickled), runs)
+
+    print(f"{amount} tracks ({runs} runs)")
+    print(f"pickle + zlib:  {len(pickled) / 1024:.1f} KB | save: {pickle_dump:.1f} ms | load: {pickle_load:.1f} ms")
+    print(f"session format: {len(encoded) / 1024:.1f} KB | save: {dump:.1f} ms | load: {load:.1f} ms")
+    print(f"raw (without zlib): pickle {len(pickle.dumps(data)) / 1024:.1f} KB | "
+          f"session format {len(zlib.decompress(verify_session(encoded))) / 1024:.1f} KB")
+    print(f".pkl conversion: {convert:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Compara o tempo de renderização das skins do player com e sem o cache de renderização
+# (ex: python -m benchmarks.skin_render 2000)
+import os
+import sys
+from importlib import import_module
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import disnake
+
+from utils.music.models import LavalinkPlayer, PartialTrack
+from utils.music.player_queue import PlayerQueue, QueueStats
+from utils.others import TTLCache
+
+
+class FakeNode:
+    identifier = "benchmark"
+    version = 4
+    lyric_support = True
+
+
+class FakeUser:
+    id = 1234567890123455
+
+
+class FakeBot:
+    config = {"HINT_RATE": 4}
+    user = FakeUser()
+    player_skins = {}
+    player_static_skins = {}
+
+    def get_color(self, me=None):
+        return disnake.Color(0x2b2d31)
+
+
+class FakeMember:
+    color = disnake.Color(0)
+
+
+class FakeGuild:
+    id = 1234567890123456
+    me = FakeMember()
+
+
+class FakePlayer:
+
+    render_key = LavalinkPlayer.render_key
+    render_skin = LavalinkPlayer.render_skin
+    __str__ = LavalinkPlayer.__str__
+
+    def __init__(self, skin: str, static: bool):
+        self.bot = FakeBot()
+        self.guild = FakeGuild()
+        self.node = FakeNode()
+        self.skin = self.skin_static = skin
+        self.static = static
+        self.paused = False
+        self.loop = False
+        self.volume = 100
+        self.position = 30000
+        self.current_hint = "Use /play to add songs."
+        self.command_log = "<@1234567890123456> skipped the song."
+        self.command_log_emoji = "⏭️"
+        self.nightcore = False
+        self.autoplay = False
+        self.restrict_mode = False
+        self.keep_connected = False
+        self.mini_queue_feature = True
+        self.mini_queue_enabled = True
+        self.controller_mode = True
+        self.stage_title_event = False
+        self.has_thread = False
+        self.last_channel = None
+        self.auto_update = 0
+        self.controller_link = ""
+        self.message = None
+        self.text_channel = None
+        self.queue_autoplay = PlayerQueue()
+        self.queue = PlayerQueue(
+            PartialTrack(uri=f"https://www.youtube.com/watch?v={n:011d}", title=f"Benchmark song {n}",
+                         author="Benchmark", thumb="https://i.ytimg.com/vi/benchmark/mqdefault.jpg",
+                         duration=200000, requester=1234567890123456, source_name="youtube") for n in range(50)
+        )
+        self.queue_stats = QueueStats(self.queue)
+        self.current = self.queue.popleft()
+
+
+def load_skins(folder: str):
+    for name in sorted(os.listdir(f"./utils/music/skins/{folder}")):
+        if name.endswith(".py"):
+            yield name[:-3], import_module(f"utils.music.skins.{folder}.{name[:-3]}").load()
+
+
+def main(amount: int = 2000):
+
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    for folder, static in (("normal_player", False), ("static_player", True)):
+
+        for name, skin in load_skins(folder):
+
+            (FakeBot.player_static_skins if static else FakeBot.player_skins)[name] = skin
+
+            player = FakePlayer(name, static)
+            skin.setup_features(player)
+
+            start = perf_counter()
+            for _ in range(amount):
+                skin.load(player)
+            render = (perf_counter() - start) / amount
+
+            # skins com render_cache = False não montam a chave nem consultam o cache (renderizam direto).
+            cache = TTLCache(maxsize=1000, ttl=300) if getattr(skin, "render_cache", True) else None
+            start = perf_counter()
+            for _ in range(amount):
+                if cache is None:
+                    skin.load(player)
+                    continue
+                key = player.render_key()
+                if (data := cache.get(key)) is None:
+                    data = skin.load(player)
+                    cache.set(key, data)
+            cached = (perf_counter() - start) / amount
+
+            print(f"{folder}/{name}: load {render * 1e6:.1f}µs | cached {cached * 1e6:.1f}µs "
+                  f"({render / cached:.1f}x){'' if cache is not None else ' [cache bypassed]'}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
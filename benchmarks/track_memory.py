@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Mede o consumo de memória das músicas de uma playlist grande (ex: python -m benchmarks.track_memory 5000)
+import base64
+import gc
+import os
+import random
+import string
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.music.models import LavalinkPlaylist, PartialPlaylist, PartialTrack
+
+
+def random_text(size: int):
+    return "".join(random.choices(string.ascii_letters + " ", k=size))
+
+
+def lavalink_payload(amount: int):
+    authors = [random_text(12) for _ in range(max(amount // 20, 1))]
+    tracks = []
+    for _ in range(amount):
+        identifier = "".join(random.choices(string.ascii_letters + string.digits, k=11))
+        tracks.append({
+            "encoded": base64.b64encode(os.urandom(180)).decode(),
+            "info": {
+                "identifier": identifier,
+                "isSeekable": True,
+                "author": random.choice(authors),
+                "length": random.randint(90000, 400000),
+                "isStream": False,
+                "position": 0,
+                "title": random_text(40),
+                "uri": f"https://www.youtube.com/watch?v={identifier}",
+                "sourceName": "youtube",
+                "artworkUrl": f"https://i.ytimg.com/vi/{identifier}/maxresdefault.jpg",
+            }
+        })
+    return {"loadType": "playlist", "playlistInfo": {"name": random_text(30), "selectedTrack": -1}, "tracks": tracks}
+
+
+def measure(func):
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, current
+
+
+def main(amount: int = 5000):
+
+    random.seed(0)
+    url = "https://www.youtube.com/playlist?list=PLbenchmark"
+
+    # o payload é criado dentro da medição para contabilizar apenas o que continua referenciado pela playlist.
+    playlist, size = measure(lambda: LavalinkPlaylist(lavalink_payload(amount), url=url, encoded_name="encoded",
+                                                      requester=1234567890123456))
+    print(f"LavalinkTrack: {size / amount:.0f} bytes/track ({size / 1024 / 1024:.2f} MB for {amount} tracks)")
+
+    def partial_tracks():
+        pl = PartialPlaylist({"playlistInfo": {"name": "benchmark"}}, url="https://open.spotify.com/playlist/benchmark")
+        pl.tracks = [
+            PartialTrack(uri=f"https://open.spotify.com/track/{i}", title=random_text(40), author=random_text(12),
+                         thumb="https://i.scdn.co/image/benchmark", duration=200000, requester=1234567890123456,
+                         source_name="spotify", original_id=str(i), playlist=pl) for i in range(amount)
+        ]
+        return pl
+
+    playlist, size = measure(partial_tracks)
+    print(f"PartialTrack: {size / amount:.0f} bytes/track ({size / 1024 / 1024:.2f} MB for {amount} tracks)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -66,7 +66,20 @@ DEFAULT_CONFIG = {
     "PLAYER_INFO_BACKUP_INTERVAL": 45,
     "PLAYER_INFO_BACKUP_INTERVAL_MONGO": 300,
     "PLAYER_SESSIONS_MONGODB": False,
+    "PLAYER_SESSION_JOURNAL_ENTRIES": 50,
+    "PLAYER_SESSION_SAVES_PER_SECOND": 20,
+    "PLAYER_RESUME_CONCURRENCY": 10,
+    "SHUTDOWN_SNAPSHOT_TIMEOUT": 8,
+    "PLAYER_RESUME_NODE_CONCURRENCY": 4,
+    "PLAYER_RESUME_VOICE_RATE": 90,
+    "PLAYER_HIBERNATE_TIMEOUT": 600,
+    "PLAYER_SESSION_DECODE_PROCESSES": 2,
+    "PLAYER_SESSION_DECODE_PROCESSES_MIN": 200,
     "QUEUE_MAX_ENTRIES": 0,
+    "QUEUE_SPILL_WINDOW": 2000,
+    "CONTROLLER_EDITS_PER_SECOND": 8,
+    "CONTROLLER_EDITS_PER_CHANNEL": 5,
+    "FAILED_TRACKS_CACHE_TTL": 1800,
     "ENABLE_DEFER_TYPING": True,
     "DEFAULT_SEARCH_PROVIDER": "ytsearch",
 
@@ -76,6 +89,9 @@ DEFAULT_CONFIG = {
     "SPOTIFY_CLIENT_ID": '',
     "SPOTIFY_CLIENT_SECRET": '',
     "PARTIALTRACK_SEARCH_PROVIDER": "ytsearch",
+    "PARTIALTRACK_PREFETCH_AMOUNT": 5,
+    "PARTIALTRACK_PREFETCH_CONCURRENCY": 2,
+    "AUTOPLAY_PREFETCH_THRESHOLD": 1,
 
     ###########################################
     ### Music System - RPC (Rich Presence): ###
@@ -190,8 +206,24 @@ def load_config():
         "PREFIXED_POOL_TIMEOUT",
         "PLAYER_INFO_BACKUP_INTERVAL",
         "PLAYER_INFO_BACKUP_INTERVAL_MONGO",
+        "PLAYER_SESSION_JOURNAL_ENTRIES",
+        "PLAYER_SESSION_SAVES_PER_SECOND",
+        "PLAYER_RESUME_CONCURRENCY",
+        "SHUTDOWN_SNAPSHOT_TIMEOUT",
+        "PLAYER_RESUME_NODE_CONCURRENCY",
+        "PLAYER_RESUME_VOICE_RATE",
+        "PLAYER_HIBERNATE_TIMEOUT",
+        "PLAYER_SESSION_DECODE_PROCESSES",
+        "PLAYER_SESSION_DECODE_PROCESSES_MIN",
         "LAVALINK_RECONNECT_RETRIES",
         "QUEUE_MAX_ENTRIES",
+        "QUEUE_SPILL_WINDOW",
+        "CONTROLLER_EDITS_PER_SECOND",
+        "CONTROLLER_EDITS_PER_CHANNEL",
+        "FAILED_TRACKS_CACHE_TTL",
+        "PARTIALTRACK_PREFETCH_AMOUNT",
+        "PARTIALTRACK_PREFETCH_CONCURRENCY",
+        "AUTOPLAY_PREFETCH_THRESHOLD",
     ]:
         try:
             CONFIG[i] = int(CONFIG[i])
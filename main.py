@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 from utils.client import BotPool
 
-pool = BotPool()
+# os processos usados pra carregar as sessões dos players (spawn) executam este arquivo novamente como __mp_main__.
+if __name__ != "__mp_main__":
 
-pool.setup()
+    pool = BotPool()
 
-import os
-from keep_alive import keep_alive
-keep_alive()
-bot = Bot(token=os.environ.get('TOKEN'))
-client.run(token)
+    pool.setup()
+
+    import os
+    from keep_alive import keep_alive
+    keep_alive()
+    bot = Bot(token=os.environ.get('TOKEN'))
+    client.run(token)
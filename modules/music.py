@@ -1624,14 +1624,13 @@ class Music(commands.Cog):
 
                 tracks = tracks[0]
 
-                if tracks.info.get("sourceName") == "http":
+                if tracks.source_name == "http":
 
                     if tracks.title == "Unknown title":
                         if attachment:
-                            tracks.info["title"] = attachment.filename
+                            tracks.title = attachment.filename
                         else:
-                            tracks.info["title"] = tracks.uri.split("/")[-1]
-                        tracks.title = tracks.info["title"]
+                            tracks.title = tracks.uri.split("/")[-1]
 
                     tracks.uri = ""
 
@@ -1667,17 +1666,13 @@ class Music(commands.Cog):
                 if options == "shuffle":
                     shuffle(tracks)
 
-                if position < 0 or len(tracks) < 2:
+                if options == "reversed":
+                    tracks.reverse()
 
-                    if options == "reversed":
-                        tracks.reverse()
-                    for track in tracks:
-                        player.queue.append(track)
+                if position < 0 or len(tracks) < 2:
+                    player.queue.extend(tracks)
                 else:
-                    if options != "reversed":
-                        tracks.reverse()
-                    for track in tracks:
-                        player.queue.insert(position, track)
+                    player.queue.insert_many(position, tracks)
 
                     pos_txt = f" (Pos. {position + 1})"
 
@@ -1720,17 +1715,13 @@ class Music(commands.Cog):
             if options == "shuffle":
                 shuffle(tracks.tracks)
 
-            if position < 0 or len(tracks.tracks) < 2:
+            if options == "reversed":
+                tracks.tracks.reverse()
 
-                if options == "reversed":
-                    tracks.tracks.reverse()
-                for track in tracks.tracks:
-                    player.queue.append(track)
+            if position < 0 or len(tracks.tracks) < 2:
+                player.queue.extend(tracks.tracks)
             else:
-                if options != "reversed":
-                    tracks.tracks.reverse()
-                for track in tracks.tracks:
-                    player.queue.insert(position, track)
+                player.queue.insert_many(position, tracks.tracks)
 
                 pos_txt = f" (Pos. {position + 1})"
 
@@ -2060,7 +2051,7 @@ class Music(commands.Cog):
                 player.loop = False
 
         try:
-            (player.current or player.last_track).info["extra"]["track_loops"] = 0
+            (player.current or player.last_track).track_loops = 0
         except AttributeError:
             pass
 
@@ -2548,12 +2539,12 @@ class Music(commands.Cog):
 
         if mode == 'off':
             mode = False
-            player.current.info["extra"]["track_loops"] = 0
+            player.current.track_loops = 0
             emoji = "⭕"
             txt = ['disabled loop.', f"{emoji} **⠂{inter.author.mention} disabled loop.**"]
 
         elif mode == "current":
-            player.current.info["extra"]["track_loops"] = 0
+            player.current.track_loops = 0
             emoji = "🔂"
             txt = ["enabled loop for the current song.",
                    f"{emoji} **⠂{inter.author.mention} enabled loop for the current song.**"]
@@ -2588,7 +2579,7 @@ class Music(commands.Cog):
 
         player: LavalinkPlayer = bot.music.players[inter.guild_id]
 
-        player.current.info["extra"]["track_loops"] = value
+        player.current.track_loops = value
 
         txt = [
             f"set the number of loops for the song "
@@ -2759,7 +2750,7 @@ class Music(commands.Cog):
 
         player: LavalinkPlayer = bot.music.players[inter.guild_id]
 
-        track = (player.queue + player.queue_autoplay)[index]
+        track = player.queue[index] if index < len(player.queue) else player.queue_autoplay[index - len(player.queue)]
 
         if index <= 0:
             raise GenericError(f"**The song **[`{track.title}`]({track.uri or track.search_uri}) is already next in the queue.")
@@ -2960,10 +2951,10 @@ class Music(commands.Cog):
         components = [disnake.ui.Button(custom_id=f"np_{inter.author.id}", label="Update", emoji="🔄")]
 
         if player.queue or player.queue_autoplay:
-            txt += f"### 🎶 ⠂Next songs ({(qsize:=len(player.queue + player.queue_autoplay))}):\n" + ("\n> `" + ("-"*38) + "`\n").join(
+            txt += f"### 🎶 ⠂Next songs ({(qsize:=len(player.queue) + len(player.queue_autoplay))}):\n" + ("\n> `" + ("-"*38) + "`\n").join(
                 f"> `{n+1})` [`{fix_characters(t.title, limit=38)}`]({t.uri})\n" \
                 f"> `⏲️ {time_format(t.duration) if not t.is_stream else '🔴 Live'}`" + (f" - `Repetitions: {t.track_loops}`" if t.track_loops else "") + \
-                f" **|** " + (f"`✋` <@{t.requester}>" if not t.autoplay else f"`👍⠂Recommended`") for n, t in enumerate(itertools.islice(player.queue + player.queue_autoplay, 3))
+                f" **|** " + (f"`✋` <@{t.requester}>" if not t.autoplay else f"`👍⠂Recommended`") for n, t in enumerate(itertools.islice(itertools.chain(player.queue, player.queue_autoplay), 3))
             )
 
             if qsize > 3:
@@ -3285,16 +3276,10 @@ class Music(commands.Cog):
         tracks = []
 
         if player.current:
-            player.current.info["id"] = player.current.id
-            if player.current.playlist:
-                player.current.info["playlist"] = {"name": player.current.playlist_name, "url": player.current.playlist_url}
-            tracks.append(player.current.info)
+            tracks.append(player.current.to_dict())
 
-        for t in player.queue:
-            t.info["id"] = t.id
-            if t.playlist:
-                t.info["playlist"] = {"name": t.playlist_name, "url": t.playlist_url}
-            tracks.append(t.info)
+        for t in player.queue.iter_snapshot():
+            tracks.append(t.to_dict())
 
         if len(tracks) < 3:
             raise GenericError(f"**You need to have at least 3 songs to save (current and/or in the queue)**")
@@ -3373,7 +3358,7 @@ class Music(commands.Cog):
         if len(player.queue) < 3:
             raise GenericError("**The queue must have at least 3 songs to be shuffled.**")
 
-        shuffle(player.queue)
+        player.queue.shuffle()
 
         await self.interaction_message(
             inter,
@@ -3611,6 +3596,10 @@ class Music(commands.Cog):
         if duplicates:
             filters.append('duplicates')
 
+        if user and not player.queue_stats.requesters[user.id]:
+            await inter.send("No songs found!", ephemeral=True)
+            return
+
         if not filters and not range_start and not range_end:
             player.queue.clear()
             txt = ['cleared the music queue.', f'♻️ **⠂{inter.author.mention} cleared the music queue.**']
@@ -4034,9 +4023,8 @@ class Music(commands.Cog):
 
                 if not temp_filter:
 
-                    track = player.queue[player.queue.index(t)]
                     player.queue.remove(t)
-                    tracklist.append(track)
+                    tracklist.append(t)
                     if playlist_link:
                         playlist_hyperlink.add(playlist_link)
 
@@ -4048,8 +4036,7 @@ class Music(commands.Cog):
         if not tracklist:
             raise GenericError("No songs found with the selected filters!")
 
-        for t in reversed(tracklist):
-            player.queue.insert(position-1, t)
+        player.queue.insert_many(position-1, tracklist)
 
         try:
             final_filters.remove("song_name")
@@ -4148,8 +4135,7 @@ class Music(commands.Cog):
         except KeyError:
             return
 
-        return list(set([track.playlist_name for track in player.queue if track.playlist_name and
-                         query.lower() in track.playlist_name.lower()]))[:20]
+        return player.queue_search.search_playlists(query)
 
     @rotate.autocomplete("name")
     @move.autocomplete("song_name")
@@ -4177,34 +4163,7 @@ class Music(commands.Cog):
         except KeyError:
             return
 
-        results = []
-
-        count = 0
-
-        for track in player.queue + player.queue_autoplay:
-
-            if count == 20:
-                break
-
-            title = track.title.lower().split()
-
-            query_words = query.lower().split()
-
-            word_count = 0
-
-            for query_word in query.lower().split():
-                for title_word in title:
-                    if query_word in title_word:
-                        title.remove(title_word)
-                        word_count += 1
-                        break
-
-            if word_count == len(query_words):
-                results.append(f"{track.title[:81]} || ID > {track.unique_id}")
-                count += 1
-
-        return results or [f"{track.title[:81]} || ID > {track.unique_id}" for n, track in enumerate(player.queue + player.queue_autoplay)
-                           if query.lower() in track.title.lower()][:20]
+        return [f"{track.title[:81]} || ID > {track.unique_id}" for n, track in player.search_queue(query, limit=20)]
 
     @move.autocomplete("song_author")
     @clear.autocomplete("song_author")
@@ -4224,10 +4183,7 @@ class Music(commands.Cog):
         except KeyError:
             return
 
-        if not query:
-            return list(set([track.authors_string for track in player.queue]))[:20]
-        else:
-            return list(set([track.authors_string for track in player.queue if query.lower() in track.authors_string.lower()]))[:20]
+        return player.queue_search.search_authors(query)
 
     restrict_cd = commands.CooldownMapping.from_cooldown(2, 7, commands.BucketType.member)
     restrict_mc =commands.MaxConcurrency(1, per=commands.BucketType.member, wait=False)
@@ -4880,6 +4836,8 @@ class Music(commands.Cog):
             await interaction.response.edit_message(components=None)
             return
 
+        await self.bot.pool.wake_players(interaction.guild_id)
+
         cmd_kwargs = {}
 
         cmd: Optional[disnake.AppCmdInter] = None
@@ -5434,9 +5392,9 @@ class Music(commands.Cog):
 
                     await interaction.response.defer(ephemeral=True, with_message=True)
 
-                    if player.current.info["extra"].get("lyrics") is None:
-                        player.current.info["extra"]["lyrics"] = await player.node.fetch_ytm_lyrics(player.current.ytid)
-                    elif not player.current.info["extra"]["lyrics"]:
+                    if player.current.extra.get("lyrics") is None:
+                        player.current.extra["lyrics"] = await player.node.fetch_ytm_lyrics(player.current.ytid)
+                    elif not player.current.extra["lyrics"]:
                         try:
                             await self.player_interaction_concurrency.release(interaction)
                         except:
@@ -5444,21 +5402,21 @@ class Music(commands.Cog):
                         await interaction.edit_original_message(f"**{not_found_msg}**")
                         return
 
-                    if not player.current.info["extra"]["lyrics"]:
+                    if not player.current.extra["lyrics"]:
                         try:
                             await self.player_interaction_concurrency.release(interaction)
                         except:
                             pass
-                        player.current.info["extra"]["lyrics"] = {}
+                        player.current.extra["lyrics"] = {}
                         await interaction.edit_original_message(f"**{not_found_msg}**")
                         return
 
-                    player.current.info["extra"]["lyrics"]["track"]["albumArt"] = player.current.info["extra"]["lyrics"]["track"]["albumArt"][:-1]
+                    player.current.extra["lyrics"]["track"]["albumArt"] = player.current.extra["lyrics"]["track"]["albumArt"][:-1]
 
                     try:
-                        lyrics_string = "\n".join([d['line'] for d in  player.current.info["extra"]["lyrics"]['lines']])
+                        lyrics_string = "\n".join([d['line'] for d in  player.current.extra["lyrics"]['lines']])
                     except KeyError:
-                        lyrics_string = player.current.info["extra"]["lyrics"]["text"]
+                        lyrics_string = player.current.extra["lyrics"]["text"]
 
                     try:
                         await self.player_interaction_concurrency.release(interaction)
@@ -6201,14 +6159,13 @@ class Music(commands.Cog):
         else:
             track = tracks[0]
 
-            if track.info.get("sourceName") == "http":
+            if track.source_name == "http":
 
                 if track.title == "Unknown title":
                     if attachment:
-                        track.info["title"] = attachment.filename
+                        track.title = attachment.filename
                     else:
-                        track.info["title"] = track.uri.split("/")[-1]
-                    track.title = track.info["title"]
+                        track.title = track.uri.split("/")[-1]
 
                 track.uri = ""
 
@@ -6631,7 +6588,7 @@ class Music(commands.Cog):
             raise GenericError("**There were no results for your search.**")
 
         if isinstance(tracks, list):
-            tracks[0].info["extra"]["track_loops"] = track_loops
+            tracks[0].track_loops = track_loops
 
         else:
 
@@ -6719,11 +6676,7 @@ class Music(commands.Cog):
             # ignorar outros bots
             if player.bot.user.id == member.id and not after.channel and not player.is_closing:
                 await asyncio.sleep(3)
-                try:
-                    player.reconnect_voice_channel_task.cancel()
-                except:
-                    pass
-                player.reconnect_voice_channel_task = player.bot.loop.create_task(player.reconnect_voice_channel())
+                player.start_reconnect_voice_channel()
 
             return
 
@@ -6733,15 +6686,11 @@ class Music(commands.Cog):
             except AttributeError:
                 pass
             else:
-                try:
-                    player.members_timeout_task.cancel()
-                except:
-                    pass
                 try:
                     check = (m for m in vc.members if not m.bot and not (m.voice.deaf or m.voice.self_deaf))
                 except:
                     check = None
-                player.members_timeout_task = player.bot.loop.create_task(player.members_timeout(check=bool(check)))
+                player.start_members_timeout(check=bool(check))
             return
 
         try:
@@ -6813,7 +6762,7 @@ class Music(commands.Cog):
                 except Exception:
                     traceback.print_exc()
 
-        player.members_timeout_task = player.bot.loop.create_task(player.members_timeout(check=bool(check)))
+        player.start_members_timeout(check=bool(check))
 
         if check:
             try:
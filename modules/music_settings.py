@@ -1409,11 +1409,7 @@ class MusicSettings(commands.Cog):
 
             try:
                 if player.controller_mode and not [m for m in player.guild.me.voice.channel.members if not m.bot]:
-                    try:
-                        player.auto_skip_track_task.cancel()
-                    except:
-                        pass
-                    player.auto_skip_track_task = b.loop.create_task(player.auto_skip_track())
+                    player.start_auto_skip_track()
             except:
                 traceback.print_exc()
 
@@ -1742,6 +1738,7 @@ class MusicSettings(commands.Cog):
                             "[34;1m{playlist.url}[0m -> Link/URL of the original playlist\n"
                             "[34;1m{player.loop.mode}[0m -> Player loop mode\n"
                             "[34;1m{player.queue.size}[0m -> Number of songs in the queue\n"
+                            "[34;1m{player.queue.duration}[0m -> Total duration of the songs in the queue\n"
                             "[34;1m{player.volume}[0m -> Player volume\n"
                             "[34;1m{player.autoplay}[0m -> Autoplay status (Enabled/Disabled)\n"
                             "[34;1m{player.nightcore}[0m -> Nightcore effect (Enabled/Disabled)\n"
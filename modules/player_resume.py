@@ -2,13 +2,13 @@
 
 # nota: este sistema é totalmente experimental.
 import asyncio
+import multiprocessing
 import os
-import pickle
-import shutil
 import traceback
-import zlib
-from base64 import b64decode, b64encode
-from typing import Union
+from base64 import b64decode
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
 
 import aiofiles
 import disnake
@@ -18,6 +18,11 @@ import wavelink
 from utils.client import BotCore
 from utils.music.checks import can_connect, can_send_message
 from utils.music.models import LavalinkPlayer, LavalinkTrack, PartialTrack, PartialPlaylist, LavalinkPlaylist
+from utils.music.resume_scheduler import PlayerResumeScheduler
+from utils.music.session_codec import decode_session, encode_session
+from utils.music.session_journal import SessionJournal, SessionTables, apply_journal, encode_entry, \
+    expand_session_tables, iter_frames, load_stored_session
+from utils.music.session_store import SessionStore
 from utils.others import SongRequestPurgeMode, send_idle_embed, CustomContext
 
 
@@ -35,25 +40,25 @@ class PlayerSession(commands.Cog):
         if not hasattr(bot, 'players_resumed'):
             bot.players_resumed ={}
 
+        self.store: Optional[SessionStore] = None
+        self.resume_scheduler: Optional[PlayerResumeScheduler] = None
+
         self.resume_task = bot.loop.create_task(self.resume_players())
 
     @commands.Cog.listener()
     async def on_player_destroy(self, player: LavalinkPlayer):
 
-        try:
-            player.queue_updater_task.cancel()
-        except:
-            pass
-
-        await self.delete_data(player)
+        self.bot.pool.session_saver.discard(player)
 
-    @commands.Cog.listener('on_wavelink_track_end')
-    async def track_end(self, node, payload: wavelink.TrackStart):
+        if player.session_journal:
+            player.session_journal.close()
+            player.session_journal = None
 
-        if len(payload.player.queue) > 0:
+        # os players desconectados ao finalizar a aplicação devem ser restaurados.
+        if self.bot.pool.shutting_down:
             return
 
-        await self.save_info(payload.player)
+        await self.delete_data(player)
 
     @commands.is_owner()
     @commands.command(hidden=True, description="Save information of players in the database instantly.", aliases=["svplayers"])
@@ -61,38 +66,74 @@ class PlayerSession(commands.Cog):
 
         await ctx.defer()
 
-        player_count = 0
-
-        for bot in self.bot.pool.bots:
-            for player in bot.music.players.values():
-                try:
-                    await player.process_save_queue()
-                    player_count += 1
-                except:
-                    continue
+        player_count, missed = await self.bot.pool.snapshot_players(self.bot.config["SHUTDOWN_SNAPSHOT_TIMEOUT"])
 
         txt = f"The information of the current players has been successfully saved ({player_count})!" if player_count else "There are no active players..."
+
+        if missed:
+            txt += f"\nFailed to save: {sum(len(g) for g in missed.values())}"
+
         await ctx.send(txt)
 
-    async def queue_updater_task(self, player: LavalinkPlayer):
+    async def snapshot_player(self, player: LavalinkPlayer) -> bool:
 
-        while True:
+        async with self.bot.pool.session_saver.exclusive(player):
+            version = player.state_version
+            saved = await self.save_info(player)
 
-            if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
-                await asyncio.sleep(self.bot.config["PLAYER_INFO_BACKUP_INTERVAL_MONGO"])
-            else:
-                await asyncio.sleep(self.bot.config["PLAYER_INFO_BACKUP_INTERVAL"])
+        if saved is False:
+            player.mark_dirty()
+            return False
 
-            try:
-                await self.save_info(player)
-            except:
-                traceback.print_exc()
+        player.saved_version = version
+        return True
 
     async def save_info(self, player: LavalinkPlayer):
 
+        if player.hibernating:
+            # a sessão do player hibernando já está gravada.
+            return True
+
         if not player.guild.me.voice or player.is_closing:
             return
 
+        if not (journal := player.session_journal):
+            journal = player.session_journal = SessionJournal(
+                player, max_entries=self.bot.config["PLAYER_SESSION_JOURNAL_ENTRIES"])
+
+        state = self.player_state(player)
+
+        if not journal.snapshot_due:
+
+            if not (entry := journal.entry(player, state)):
+                return True
+
+            try:
+                await self.save_journal_entry(player, entry)
+            except Exception:
+                traceback.print_exc()
+                journal.request_snapshot()
+                return False
+            return True
+
+        data = self.session_data(player, state)
+
+        journal.snapshot(player, data)
+
+        try:
+            saved = await self.save_session(player, data=data)
+        except Exception:
+            traceback.print_exc()
+            saved = False
+
+        if saved is False:
+            journal.request_snapshot()
+            return False
+
+        return True
+
+    def player_state(self, player: LavalinkPlayer) -> dict:
+
         try:
             message_id = player.message.id
         except:
@@ -104,39 +145,6 @@ class PlayerSession(commands.Cog):
             text_channel_id = None
             message_id = None
 
-        tracks = []
-        played = []
-        autoqueue = []
-        failed_tracks = []
-
-        if player.current:
-            player.current.info["id"] = player.current.id
-            if player.current.playlist_name:
-                player.current.info["playlist"] = {"name": player.current.playlist_name, "url": player.current.playlist_url}
-            tracks.append(player.current.info)
-
-        for t in player.queue:
-            t.info["id"] = t.id
-            if t.playlist:
-                t.info["playlist"] = {"name": t.playlist_name, "url": t.playlist_url}
-            tracks.append(t.info)
-
-        for t in player.played:
-            t.info["id"] = t.id
-            if t.playlist:
-                t.info["playlist"] = {"name": t.playlist_name, "url": t.playlist_url}
-            played.append(t.info)
-
-        for t in player.queue_autoplay:
-            t.info["id"] = t.id
-            autoqueue.append(t.info)
-
-        for t in player.failed_tracks:
-            t.info["id"] = t.id
-            if t.playlist:
-                t.info["playlist"] = {"name": t.playlist_name, "url": t.playlist_url}
-            failed_tracks.append(t.info)
-
         try:
             vc_id = player.guild.me.voice.channel.id
         except AttributeError:
@@ -149,7 +157,7 @@ class PlayerSession(commands.Cog):
             "nightcore": player.nightcore,
             "position": player.position,
             "voice_channel": vc_id,
-            "dj": player.dj,
+            "dj": set(player.dj),
             "player_creator": player.player_creator,
             "static": player.static,
             "paused": player.paused and not player.auto_pause,
@@ -168,13 +176,9 @@ class PlayerSession(commands.Cog):
             "restrict_mode": player.restrict_mode,
             "mini_queue_enabled": player.mini_queue_enabled,
             "listen_along_invite": player.listen_along_invite,
-            "queue": tracks,
-            "played": played,
-            "queue_autoplay": autoqueue,
-            "failed_tracks": failed_tracks,
             "prefix_info": player.prefix_info,
             "purge_mode": player.purge_mode,
-            "voice_state": player._voice_state,
+            "voice_state": dict(player._voice_state),
             "time": disnake.utils.utcnow(),
         }
 
@@ -187,10 +191,30 @@ class PlayerSession(commands.Cog):
             custom_skin = player.skin[15:]
             data["custom_skin_data"] = {custom_skin: player.custom_skin_data[custom_skin]}
 
-        try:
-            await self.save_session(player, data=data)
-        except:
-            traceback.print_exc()
+        return data
+
+    def session_data(self, player: LavalinkPlayer, state: dict) -> dict:
+
+        tables = SessionTables()
+        tracks = []
+        uids = []
+
+        if player.current:
+            tracks.append(tables.track_info(player.current))
+
+        for t in player.queue.iter_snapshot():
+            tracks.append(tables.track_info(t))
+            uids.append(t.unique_id)
+
+        return dict(
+            state,
+            queue=tracks,
+            queue_uids=uids,
+            played=[tables.track_info(t) for t in player.played],
+            queue_autoplay=[tables.track_info(t) for t in player.queue_autoplay],
+            failed_tracks=[tables.track_info(t) for t in player.failed_tracks],
+            session_tables=tables.to_dict(),
+        )
 
     def process_track_cls(self, data: list, playlists: dict = None):
 
@@ -243,12 +267,30 @@ class PlayerSession(commands.Cog):
                         playlists[playlist["url"]] = playlist_cls
                         playlist = playlist_cls
 
-                t = LavalinkTrack(id_=info.get("id", ""), info=info, playlist=playlist, requester=info["extra"]["requester"])
+                t = LavalinkTrack(id_=info.get("id", ""), info=info, playlist=playlist, requester=info["extra"]["requester"], lazy=True)
 
             tracks.append(t)
 
         return tracks, playlists
 
+    def restore_tracks(self, player: LavalinkPlayer, data: dict):
+
+        tracks, playlists = self.process_track_cls(data["queue"])
+
+        player.queue.extend(tracks)
+
+        played_tracks, playlists = self.process_track_cls(data["played"], playlists)
+
+        player.played.extend(played_tracks)
+
+        queue_autoplay_tracks, playlists = self.process_track_cls(data.get("queue_autoplay", []))
+
+        player.queue_autoplay.extend(queue_autoplay_tracks)
+
+        failed_tracks, playlists = self.process_track_cls(data.get("failed_tracks", []), playlists)
+
+        player.failed_tracks.extend(failed_tracks)
+
     async def resume_players(self):
 
         try:
@@ -269,49 +311,64 @@ class PlayerSession(commands.Cog):
 
         try:
 
-            mongo_sessions = await self.get_player_sessions_mongo()
-            local_sessions = await self.get_player_sessions_local()
+            hints = self.bot.config["EXTRA_HINTS"].split("||")
 
-            data_list = {}
+            self.resume_scheduler = PlayerResumeScheduler(
+                self.bot,
+                resume=lambda d, n: self.resume_player(d, hints=hints, node=n),
+                concurrency=self.bot.config["PLAYER_RESUME_CONCURRENCY"],
+                node_concurrency=self.bot.config["PLAYER_RESUME_NODE_CONCURRENCY"],
+                voice_rate=self.bot.config["PLAYER_RESUME_VOICE_RATE"],
+            )
 
-            if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
-                for d in local_sessions:
-                    data_list[d["_id"]] = d
-                    print(f"{self.bot.user} - Migrating session data from the server: {d['_id']} | Local DB -> Mongo")
-                    await self.save_session_mongo(d["_id"], d)
-                    self.delete_data_local(d["_id"])
-                for d in mongo_sessions:
-                    data_list[d["_id"]] = d
+            # os players são restaurados conforme as sessões são carregadas.
+            scheduler_task = self.bot.loop.create_task(self.resume_scheduler.run())
 
-            else:
-                for d in mongo_sessions:
-                    data_list[d["_id"]] = d
-                    print(f"{self.bot.user} - Migrating session data from the server: {d['_id']} | Mongo -> Local DB")
-                    await self.save_session_local(d["_id"], d)
-                    if self.bot.config["MONGO"]:
+            added = set(self.bot.players_resumed)
+
+            def add_session(data: dict):
+                if data["_id"] not in added:
+                    added.add(data["_id"])
+                    self.resume_scheduler.add([data])
+
+            try:
+
+                if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
+                    async for d in self.get_player_sessions_local():
+                        print(f"{self.bot.user} - Migrating session data from the server: {d['_id']} | Local DB -> Mongo")
+                        await self.save_session_mongo(d["_id"], d)
+                        await self.delete_data_local(d["_id"])
+                        add_session(d)
+                    async for d in self.get_player_sessions_mongo():
+                        add_session(d)
+
+                else:
+                    async for d in self.get_player_sessions_mongo():
+                        print(f"{self.bot.user} - Migrating session data from the server: {d['_id']} | Mongo -> Local DB")
+                        await self.save_session_local(d["_id"], d)
                         await self.delete_data_mongo(d["_id"])
-                for d in local_sessions:
-                    data_list[d["_id"]] = d
+                        add_session(d)
+                    async for d in self.get_player_sessions_local():
+                        add_session(d)
 
-            mongo_sessions.clear()
-            local_sessions.clear()
+            except BaseException:
+                scheduler_task.cancel()
+                raise
 
-            hints = self.bot.config["EXTRA_HINTS"].split("||")
+            finally:
+                self.resume_scheduler.close()
 
-            for data in data_list.values():
+            await scheduler_task
 
-                try:
-                    self.bot.players_resumed[data['_id']]
-                except KeyError:
-                    self.bot.players_resumed[data['_id']] = self.bot.loop.create_task(self.resume_player(data, hints=hints))
-                    await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            raise
 
         except Exception:
-            print(f"{self.bot.user} - Failure to resume player {data['_id']}:\n{traceback.format_exc()}")
+            print(f"{self.bot.user} - Failure to resume players:\n{traceback.format_exc()}")
 
         self.bot.player_resumed = True
 
-    async def resume_player(self, data: dict, hints: list = None):
+    async def resume_player(self, data: dict, hints: list = None, node: wavelink.Node = None):
 
         if hints is None:
             hints = []
@@ -426,7 +483,8 @@ class PlayerSession(commands.Cog):
 
             while True:
 
-                node = self.bot.music.get_best_node()
+                if not node or not node.is_available:
+                    node = self.bot.music.get_best_node()
 
                 if not node:
                     try:
@@ -521,21 +579,7 @@ class PlayerSession(commands.Cog):
                     print(f"{self.bot.user} - Failure to speak on the server stage {guild.name}. Error: {repr(e)}")
                     return
 
-            tracks, playlists = self.process_track_cls(data["queue"])
-
-            player.queue.extend(tracks)
-
-            played_tracks, playlists = self.process_track_cls(data["played"], playlists)
-
-            player.played.extend(played_tracks)
-
-            queue_autoplay_tracks, playlists = self.process_track_cls(data.get("queue_autoplay", []))
-
-            player.queue_autoplay.extend(queue_autoplay_tracks)
-
-            failed_tracks, playlists = self.process_track_cls(data.get("failed_tracks", []), playlists)
-
-            player.failed_tracks.extend(failed_tracks)
+            self.restore_tracks(player, data)
 
             if player.keep_connected and not player.queue:
                 if player.failed_tracks:
@@ -584,135 +628,262 @@ class PlayerSession(commands.Cog):
                 print(f"{self.bot.user} - Playback failure when resuming music from server player {guild.name} [{guild.id}]:\n{traceback.format_exc()}")
                 return
 
-            try:
-                player.members_timeout_task.cancel()
-            except:
-                pass
-
-            player.members_timeout_task = self.bot.loop.create_task(player.members_timeout(check=check, idle_timeout=10))
+            player.start_members_timeout(check=check, idle_timeout=10)
 
             print(f"{self.bot.user} - Player Resumed: {guild.name} [{guild.id}]")
 
+            return True
+
         except Exception:
             print(f"{self.bot.user} - Critical failure when resuming players:\n{traceback.format_exc()}")
 
+    # sessões gravadas no mongo: os dados são gravados em binário (bson) e as sessões gravadas anteriormente em
+    # base64 continuam sendo carregadas.
+    @staticmethod
+    def mongo_session_bytes(value: Union[str, bytes]) -> bytes:
+        return b64decode(value) if isinstance(value, str) else bytes(value)
+
+    def mongo_session(self, d: dict) -> tuple[int, bytes, Optional[bytes], list[bytes]]:
+        return (
+            int(d["_id"]),
+            self.mongo_session_bytes(d["data"]),
+            None,
+            [self.mongo_session_bytes(e) for e in (d.get("journal") or {}).values()],
+        )
+
     async def get_player_sessions_mongo(self):
 
         if not self.bot.config["MONGO"]:
-            return []
+            return
 
-        guild_data = []
+        sessions = []
 
         for d in (await self.bot.pool.mongo_database.query_data(db_name=str(self.bot.user.id), collection="player_sessions")):
 
             try:
-                data = d["data"]
+                sessions.append(self.mongo_session(d))
             except KeyError:
                 await self.delete_data(int(d["_id"]))
-                continue
-            data = b64decode(data)
+            except Exception:
+                print(f"{self.bot.user} - Failed to load player session [{d['_id']}]:\n{traceback.format_exc()}")
+
+        async for data in self.decode_sessions(sessions):
+            yield data
+
+    def decode_stored_session(self, guild_id: int, data: bytes, previous: Optional[bytes], journal: list[bytes]) -> dict:
+        data, error = load_stored_session(data, previous, journal)
+        self.print_session_fallback(guild_id, error)
+        return data
+
+    def print_session_fallback(self, guild_id: int, error: Optional[str]):
+        if error:
+            print(f"{self.bot.user} - Failed to load player session [{guild_id}], using the previous one:\n{error}")
+
+    # as sessões são retornadas conforme são carregadas (a restauração dos players começa antes de todas as sessões
+    # serem carregadas). Com muitas sessões elas são carregadas em paralelo em outros processos.
+    async def decode_sessions(self, sessions: list[tuple[int, bytes, Optional[bytes], list[bytes]]]):
+
+        processes = self.bot.config["PLAYER_SESSION_DECODE_PROCESSES"]
+
+        if not processes or len(sessions) < self.bot.config["PLAYER_SESSION_DECODE_PROCESSES_MIN"]:
+            async for data in self.decode_sessions_inline(sessions):
+                yield data
+            return
+
+        loop = asyncio.get_running_loop()
+
+        # spawn: fork não existe no windows e pode travar os processos criados a partir de um processo com várias
+        # threads. Caso os processos não possam ser iniciados as sessões são carregadas no processo principal.
+        executor = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+
+        try:
+
             try:
-                data = zlib.decompress(data)
-            except zlib.error:
-                pass
-            guild_data.append(pickle.loads(data))
+                tasks = {loop.run_in_executor(executor, load_stored_session, *s[1:]): s for s in sessions}
+            except (BrokenProcessPool, OSError):
+                traceback.print_exc()
+                async for data in self.decode_sessions_inline(sessions):
+                    yield data
+                return
+
+            sessions.clear()
+
+            pending = set(tasks)
 
-        return guild_data
+            while pending:
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+
+                    session = tasks.pop(task)
+
+                    try:
+                        data, error = task.result()
+                    except (BrokenProcessPool, OSError):
+                        async for data in self.decode_sessions_inline([session]):
+                            yield data
+                        continue
+                    except Exception:
+                        print(f"{self.bot.user} - Failed to load player session [{session[0]}]:\n{traceback.format_exc()}")
+                        continue
+
+                    self.print_session_fallback(session[0], error)
+
+                    yield data
+
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def decode_sessions_inline(self, sessions: list[tuple[int, bytes, Optional[bytes], list[bytes]]]):
+
+        for guild_id, data, previous, journal in sessions:
+            try:
+                yield self.decode_stored_session(guild_id, data, previous, journal)
+            except Exception:
+                print(f"{self.bot.user} - Failed to load player session [{guild_id}]:\n{traceback.format_exc()}")
+            await asyncio.sleep(0)
+
+    # sessão gravada de um único servidor (ex: ao restaurar um player que estava hibernando).
+    async def load_session(self, guild_id: int) -> Optional[dict]:
+
+        if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
+
+            for d in await self.bot.pool.mongo_database.query_data(
+                    db_name=str(self.bot.user.id), collection="player_sessions", filter={"_id": str(guild_id)}
+            ):
+                return self.decode_stored_session(*self.mongo_session(d))
+            return
+
+        if session := await self.session_store.load(guild_id):
+            return self.decode_stored_session(guild_id, *session)
+
+    @property
+    def session_store(self) -> SessionStore:
+        if not self.store:
+            self.store = SessionStore(f"./local_database/player_sessions/{self.bot.user.id}.db")
+        return self.store
 
     async def get_player_sessions_local(self):
 
-        guild_data = []
+        try:
+            await self.import_session_files()
+        except Exception:
+            traceback.print_exc()
+
+        async for data in self.decode_sessions(await self.session_store.load_all()):
+            yield data
+
+    # sessões salvas em arquivos (.session/.pkl/.bak/.journal de cada servidor) antes do banco de dados atual.
+    async def import_session_files(self):
+
+        directory = f"./local_database/player_sessions/{self.bot.user.id}"
 
         try:
-            files = os.listdir(f"./local_database/player_sessions/{self.bot.user.id}")
+            files = os.listdir(directory)
         except FileNotFoundError:
-            return guild_data
+            return
 
-        for file_content in files:
+        for guild_id in {f.split(".")[0] for f in files}:
 
-            if not file_content.endswith(".pkl"):
-                continue
+            path = f'{directory}/{guild_id}'
 
-            guild_id = file_content[:-4]
+            data = None
 
-            async with aiofiles.open(f'./local_database/player_sessions/{self.bot.user.id}/{guild_id}.pkl', 'rb') as f:
-                file_content = await f.read()
+            for ext in (".session", ".pkl", ".bak"):
                 try:
-                    file_content = zlib.decompress(file_content)
-                except zlib.error:
-                    pass
-                data = pickle.loads(file_content)
+                    async with aiofiles.open(f'{path}{ext}', 'rb') as f:
+                        data = expand_session_tables(decode_session(await f.read()))
+                    break
+                except FileNotFoundError:
+                    continue
+                except Exception:
+                    print(f"{self.bot.user} - Failed to load player session file: {path}{ext}\n{traceback.format_exc()}")
 
             if data:
-                guild_data.append(data)
 
-        return guild_data
+                try:
+                    async with aiofiles.open(f'{path}.journal', 'rb') as f:
+                        data = apply_journal(data, list(iter_frames(await f.read())))
+                except FileNotFoundError:
+                    pass
+
+                if not await self.save_session_local(guild_id, data):
+                    continue
+
+            for ext in (".session", ".pkl", ".bak", ".journal"):
+                try:
+                    os.remove(f'{path}{ext}')
+                except FileNotFoundError:
+                    continue
+
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+    # a sessão é codificada numa thread: várias sessões gravadas ao mesmo tempo (ex: ao desligar o bot) não travam o
+    # loop (e o tempo limite das gravações continua valendo). Os dados são cópias (não são alterados pelo player).
+    async def encode_session(self, data: dict) -> bytes:
+        return await self.bot.loop.run_in_executor(None, encode_session, data)
 
     async def save_session_mongo(self, id_: Union[int, str], data: dict):
         await self.bot.pool.mongo_database.update_data(
             id_=str(id_),
-            data={"data": b64encode(zlib.compress(pickle.dumps(data))).decode('utf-8')},
+            data={"data": await self.encode_session(data), "journal": {}},
             collection="player_sessions",
             db_name=str(self.bot.user.id)
         )
 
     async def save_session_local(self, id_: Union[int, str], data: dict):
 
-        if not os.path.isdir(f"./local_database/player_sessions/{self.bot.user.id}"):
-            os.makedirs(f"./local_database/player_sessions/{self.bot.user.id}")
-
-        path = f'./local_database/player_sessions/{self.bot.user.id}/{id_}'
-
         try:
-            async with aiofiles.open(f"{path}.pkl", "wb") as f:
-                await f.write(zlib.compress(pickle.dumps(data)))
+            await self.session_store.save(int(id_), await self.encode_session(data))
         except Exception:
             traceback.print_exc()
-            try:
-                os.rename(f"{path}.bak", f"{path}.pkl")
-            except:
-                pass
+            return False
+
+        return True
+
+    async def save_journal_entry(self, player: LavalinkPlayer, entry: dict):
+
+        if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
+            await self.bot.pool.mongo_database.update_data(
+                id_=str(player.guild.id),
+                data={f"journal.{entry['seq']}": encode_entry(entry)},
+                collection="player_sessions",
+                db_name=str(self.bot.user.id)
+            )
             return
 
-        try:
-            shutil.copy(f'{path}.pkl', f'{path}.bak')
-        except FileNotFoundError:
-            pass
-        except Exception:
-            traceback.print_exc()
+        await self.session_store.append(player.guild.id, entry["seq"], encode_entry(entry))
 
     async def save_session(self, player: LavalinkPlayer, data: dict):
 
         try:
             player = player.bot.music.players[player.guild.id]
         except:
-            try:
-                player.queue_updater_task.cancel()
-            except:
-                pass
             return
 
         try:
             if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
                 await self.save_session_mongo(player.guild.id, data)
             else:
-                await self.save_session_local(player.guild.id, data)
+                return await self.save_session_local(player.guild.id, data)
 
         except asyncio.CancelledError as e:
             print(f"❌ - {self.bot.user} - Saving cancelled: {repr(e)}")
+            return False
 
     async def delete_data_mongo(self, id_: Union[LavalinkPlayer, int]):
         await self.bot.pool.mongo_database.delete_data(id_=str(id_), db_name=str(self.bot.user.id),
                                                        collection="player_sessions")
 
-    def delete_data_local(self, id_: Union[LavalinkPlayer, int]):
-        for ext in ('.pkl', '.bak'):
-            try:
-                os.remove(f'./local_database/player_sessions/{self.bot.user.id}/{id_}{ext}')
-            except FileNotFoundError:
-                continue
-            except Exception:
-                traceback.print_exc()
+    async def delete_data_local(self, id_: Union[LavalinkPlayer, int]):
+        try:
+            await self.session_store.delete(int(id_))
+        except Exception:
+            traceback.print_exc()
 
     async def delete_data(self, player: Union[LavalinkPlayer, int]):
 
@@ -724,7 +895,7 @@ class PlayerSession(commands.Cog):
         if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
             await self.delete_data_mongo(guild_id)
         else:
-            self.delete_data_local(guild_id)
+            await self.delete_data_local(guild_id)
 
     def cog_unload(self):
         try:
@@ -732,6 +903,10 @@ class PlayerSession(commands.Cog):
         except:
             pass
 
+        if self.store:
+            self.store.close()
+            self.store = None
+
         for guild_id in list(self.bot.players_resumed):
             try:
                 self.bot.players_resumed[guild_id].cancel()
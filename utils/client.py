@@ -8,6 +8,7 @@ import json
 import logging
 import os
 import pickle
+import signal
 import subprocess
 import traceback
 from configparser import ConfigParser
@@ -29,9 +30,12 @@ from utils.db import MongoDatabase, LocalDatabase, get_prefix, DBModel, global_d
 from utils.music.checks import check_pool_bots
 from utils.music.errors import GenericError
 from utils.music.local_lavalink import run_lavalink
+from utils.music.message_scheduler import ControllerUpdateScheduler
 from utils.music.models import music_mode, LavalinkPlayer
+from utils.music.session_saver import PlayerSessionSaver
 from utils.music.spotify import spotify_client
-from utils.others import CustomContext, token_regex, sort_dict_recursively
+from utils.music.timer_wheel import TimerWheel
+from utils.others import CustomContext, token_regex, sort_dict_recursively, TTLCache
 from utils.owner_panel import PanelView
 from web_app import WSClient, start
 
@@ -59,6 +63,13 @@ class BotPool:
 
     def __init__(self):
         self.playlist_cache = {}
+        self.partial_track_cache = TTLCache(maxsize=20000, ttl=43200)
+        self.recommendations_cache = TTLCache(maxsize=5000, ttl=3600)
+        self.failed_track_cache = TTLCache(maxsize=10000, ttl=1800)
+        self.controller_updater = ControllerUpdateScheduler()
+        self.timers = TimerWheel()
+        self.session_saver = PlayerSessionSaver()
+        self.skin_render_cache = TTLCache(maxsize=1000, ttl=300)
         self.user_prefix_cache = {}
         self.guild_prefix_cache = {}
         self.mongo_database: Optional[MongoDatabase] = None
@@ -79,6 +90,8 @@ class BotPool:
         self.controller_bot: Optional[BotCore] = None
         self.current_useragent = self.reset_useragent()
         self.processing_gc: bool = False
+        self.shutting_down: bool = False
+        self.shutdown_task: Optional[asyncio.Task] = None
 
     def reset_useragent(self):
         self.current_useragent = generate_user_agent()
@@ -184,6 +197,103 @@ class BotPool:
             self.failed_bots[bot.identifier] = e
             self.bots.remove(bot)
 
+    # grava as sessões dos players de todos os bots ao mesmo tempo, retornando os servidores que não foram salvos
+    # dentro do tempo limite.
+    async def snapshot_players(self, timeout: float) -> tuple[int, dict[BotCore, list[int]]]:
+
+        tasks = {}
+
+        for bot in self.bots:
+
+            if not (cog := bot.get_cog("PlayerSession")):
+                continue
+
+            for player in list(bot.music.players.values()):
+                tasks[asyncio.create_task(cog.snapshot_player(player))] = (bot, player.guild.id)
+
+        if not tasks:
+            return 0, {}
+
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+
+        missed = {}
+
+        for task in pending:
+            task.cancel()
+            bot, guild_id = tasks[task]
+            missed.setdefault(bot, []).append(guild_id)
+
+        saved = 0
+
+        for task in done:
+            if task.exception():
+                bot, guild_id = tasks[task]
+                missed.setdefault(bot, []).append(guild_id)
+                print(f"{bot.user} - Failed to save player session [{guild_id}]: {repr(task.exception())}")
+            elif task.result() is False:
+                bot, guild_id = tasks[task]
+                missed.setdefault(bot, []).append(guild_id)
+                print(f"{bot.user} - Failed to save player session [{guild_id}]")
+            else:
+                saved += 1
+
+        return saved, missed
+
+    # restaura os players hibernando no servidor (de qualquer bot da pool) antes de processar um comando.
+    # A espera é limitada pra não esgotar o tempo de resposta da interação (a restauração continua em segundo plano).
+    async def wake_players(self, guild_id: int, timeout: float = 2):
+
+        players = []
+
+        for bot in self.bots:
+            try:
+                if (player := bot.music.players.get(guild_id)) and player.hibernating:
+                    players.append(player)
+            except AttributeError:
+                continue
+
+        if players:
+            await asyncio.wait([asyncio.create_task(p.wake()) for p in players], timeout=timeout)
+
+    async def shutdown(self):
+
+        self.shutting_down = True
+
+        print("Shutdown requested: saving player sessions...")
+
+        try:
+            saved, missed = await self.snapshot_players(self.config["SHUTDOWN_SNAPSHOT_TIMEOUT"])
+        except Exception:
+            traceback.print_exc()
+        else:
+            print(f"Player sessions saved: {saved}")
+            for bot, guild_ids in missed.items():
+                print(f"{bot.user} - Player sessions not saved ({len(guild_ids)}): {', '.join(str(i) for i in guild_ids)}")
+
+        for bot in self.bots:
+            if (cog := bot.get_cog("PlayerSession")) and cog.store:
+                cog.store.close()
+                cog.store = None
+
+        await asyncio.gather(*(bot.close() for bot in self.bots), return_exceptions=True)
+
+        if self.config["RUN_RPC_SERVER"]:
+            asyncio.get_event_loop().stop()
+
+    def handle_sigterm(self):
+        if not self.shutdown_task:
+            self.shutdown_task = asyncio.get_event_loop().create_task(self.shutdown())
+
+    def setup_signal_handlers(self, loop: asyncio.AbstractEventLoop):
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self.handle_sigterm)
+        except (NotImplementedError, RuntimeError):
+            # windows
+            try:
+                signal.signal(signal.SIGTERM, lambda *_: loop.call_soon_threadsafe(self.handle_sigterm))
+            except Exception:
+                traceback.print_exc()
+
     async def run_bots(self, bots: List[BotCore]):
         await asyncio.wait(
             [asyncio.create_task(self.start_bot(bot)) for bot in bots]
@@ -208,6 +318,13 @@ class BotPool:
     def load_cfg(self):
 
         self.config = load_config()
+        self.controller_updater.rate = max(self.config["CONTROLLER_EDITS_PER_SECOND"], 1)
+        self.controller_updater.tokens = self.controller_updater.rate
+        self.controller_updater.route_limit = max(self.config["CONTROLLER_EDITS_PER_CHANNEL"], 1)
+        self.failed_track_cache.ttl = self.config["FAILED_TRACKS_CACHE_TTL"]
+        self.session_saver.rate = max(self.config["PLAYER_SESSION_SAVES_PER_SECOND"], 1)
+        self.session_saver.tokens = self.session_saver.rate
+        self.session_saver.interval = self.config["PLAYER_INFO_BACKUP_INTERVAL"]
 
         try:
             with open("emojis.json") as f:
@@ -608,6 +725,8 @@ class BotPool:
 
         loop = asyncio.get_event_loop()
 
+        self.setup_signal_handlers(loop)
+
         if start_local:
             loop.create_task(self.start_lavalink(loop=loop))
 
@@ -1001,6 +1120,9 @@ class BotCore(commands.AutoShardedBot):
         except:
             pass
 
+        if ctx.valid or ((player := self.music.players.get(message.guild.id)) and player.text_channel == message.channel):
+            await self.pool.wake_players(message.guild.id)
+
         self.dispatch("song_request", ctx, message)
 
         if not ctx.valid:
@@ -1144,6 +1266,8 @@ class BotCore(commands.AutoShardedBot):
                                  ephemeral=True, components=[disnake.ui.Button(custom_id="bot_invite", label="Adicionar bots")])
                 return
 
+        await self.pool.wake_players(inter.guild_id)
+
         await super().on_application_command(inter)
 
     def load_modules(self):
@@ -108,6 +108,11 @@ async def get_prefix(bot: BotCore, message: disnake.Message):
     return guild_prefix
 
 
+# coleções que não são copiadas pro cache local (json) do mongo: as sessões dos players são gravadas em binário
+# e são lidas diretamente do mongo.
+uncached_collections = {"player_sessions"}
+
+
 class BaseDB:
 
     def get_default(self, collection: str, db_name: Union[DBModel.guilds, DBModel.users]):
@@ -305,7 +310,8 @@ class MongoDatabase(BaseDB):
                           collection: str, default_model: dict = None):
 
         await self._connect[collection][db_name].update_one({'_id': str(id_)}, {'$set': data}, upsert=True)
-        await self.cache.update_data(id_, data, db_name=db_name, collection=collection, default_model=default_model)
+        if collection not in uncached_collections:
+            await self.cache.update_data(id_, data, db_name=db_name, collection=collection, default_model=default_model)
         return data
 
     async def query_data(self, db_name: str, collection: str, filter: dict = None, limit=100) -> list:
@@ -71,6 +71,8 @@ class QueueInteraction(disnake.ui.View):
         self.max_items = 8
         self.message: Optional[disnake.Message] = None
         self.current_track: Optional[LavalinkTrack] = None
+        self.total_duration = 0
+        self.total_streams = 0
         super().__init__(timeout=timeout)
         self.embed = disnake.Embed(color=self.bot.get_color(user.guild.me))
         self.update_pages()
@@ -80,9 +82,13 @@ class QueueInteraction(disnake.ui.View):
 
         player: LavalinkPlayer = self.bot.music.players[self.user.guild.id]
 
+        tracks = player.queue + player.queue_autoplay
+
         self.current_page = 0
         self.track_pages.clear()
-        self.track_pages = list(disnake.utils.as_chunks(player.queue + player.queue_autoplay, max_size=self.max_items))
+        self.track_pages = list(disnake.utils.as_chunks(tracks, max_size=self.max_items))
+        self.total_streams = sum(1 for t in tracks if t.is_stream)
+        self.total_duration = sum(t.duration for t in tracks if not t.is_stream)
         self.current_track = self.track_pages[self.current_page][0]
         self.max_page = len(self.track_pages) - 1
         self.update_components()
@@ -180,6 +186,10 @@ class QueueInteraction(disnake.ui.View):
                 )
             )
 
+        if self.track_pages:
+            txt += f"\n`⌛ Total duration: {time_format(self.total_duration)}`" + \
+                   (f" `(+{self.total_streams} livestream(s))`" if self.total_streams else "")
+
         self.embed.description = txt
         self.select_options = opts
         self.embed.set_thumbnail(self.current_track.thumb)
@@ -197,10 +207,7 @@ class QueueInteraction(disnake.ui.View):
             self.stop()
             return
 
-        for t in  player.queue + player.queue_autoplay:
-            if t.unique_id == track_id:
-                track = t
-                break
+        track = player.queue.get_by_id(track_id) or player.queue_autoplay.get_by_id(track_id)
 
         if not track:
             await interaction.send(f"Music with id \"{track_id}\" not found in the player's queue...", ephemeral=True)
@@ -2072,7 +2079,8 @@ class SkinEditorMenu(disnake.ui.View):
         elif not skin_data:
             self.message_data = deepcopy(base_skin)
         else:
-            self.message_data = skin_data
+            # cópia pra não alterar a skin em uso pelo player antes de salvar.
+            self.message_data = deepcopy(skin_data)
 
         self.update_components()
         await self.update_message(inter)
@@ -2231,7 +2239,8 @@ class SkinEditorMenu(disnake.ui.View):
             except KeyError:
                 continue
 
-        data = skin_converter(self.message_data, ctx=self.ctx, player=player)
+        # a skin em edição é alterada diretamente (não pode ser compilada pelo cache).
+        data = skin_converter(self.message_data, ctx=self.ctx, player=player, cache=False)
         return {"content": data.get("content", ""), "embeds": data.get("embeds", [])}
 
     async def embed_select_callback(self, inter: disnake.MessageInteraction):
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import json
+import traceback
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from utils.music.models import LavalinkPlayer
+
+
+# Agendador (compartilhado por todos os players da pool) das edições das mensagens de controle dos players.
+# Os players são marcados como pendentes (player.update = True) e várias alterações seguidas dentro do intervalo
+# de agrupamento viram uma única edição. As edições respeitam um limite global (por segundo) e um limite por canal
+# (mesmo limite de edições do discord: 5 a cada 5 segundos), com prioridade pras atualizações causadas por
+# interações em relação às atualizações automáticas (ex: barra de progresso).
+class ControllerUpdateScheduler:
+
+    PRIORITY_HIGH = 0
+    PRIORITY_LOW = 1
+
+    def __init__(self, rate: float = 8, route_limit: int = 5, route_period: float = 5, delay: float = 1.5,
+                 concurrency: int = 10):
+        self.rate = rate
+        self.route_limit = route_limit
+        self.route_period = route_period
+        self.delay = delay
+        self.concurrency = concurrency
+        self.scheduled: list[tuple] = []
+        self.ready: list[tuple] = []
+        self.pending: dict[int, tuple] = {}
+        self.routes: dict[int, deque] = {}
+        self.running: set[int] = set()
+        self.tokens = rate
+        self.last_refill = monotonic()
+        self.counter = count()
+        self.wakeup: Optional[asyncio.Event] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {"edits": 0, "coalesced": 0, "deferred": 0, "errors": 0, "skipped": 0, "bytes_sent": 0,
+                      "bytes_saved": 0}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def is_pending(self, player: LavalinkPlayer) -> bool:
+        return id(player) in self.pending
+
+    def mark_dirty(self, player: LavalinkPlayer, delay: Optional[float] = None, priority: int = PRIORITY_HIGH):
+
+        due = monotonic() + (self.delay if delay is None else delay)
+
+        if entry := self.pending.get(id(player)):
+            if entry[0] <= due and entry[1] <= priority:
+                self.stats["coalesced"] += 1
+                return
+            due = min(due, entry[0])
+            priority = min(priority, entry[1])
+
+        self._push(player, due, priority)
+
+    def discard(self, player: LavalinkPlayer):
+        # as entradas antigas nas filas são ignoradas ao serem processadas.
+        self.pending.pop(id(player), None)
+
+    def _push(self, player: LavalinkPlayer, due: float, priority: int):
+        entry = (due, priority, next(self.counter), player)
+        self.pending[id(player)] = entry
+        heappush(self.scheduled, entry)
+        self.start()
+        self.wakeup.set()
+
+    def start(self):
+        if self.task and not self.task.done():
+            return
+        self.wakeup = asyncio.Event()
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.task = asyncio.get_event_loop().create_task(self.run())
+
+    def _refill(self, now: float):
+        self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def _route_wait(self, route: int, now: float) -> float:
+        try:
+            edits = self.routes[route]
+        except KeyError:
+            return 0
+        while edits and edits[0] <= now - self.route_period:
+            edits.popleft()
+        if not edits:
+            del self.routes[route]
+            return 0
+        if len(edits) < self.route_limit:
+            return 0
+        return edits[0] + self.route_period - now
+
+    async def run(self):
+
+        while True:
+
+            now = monotonic()
+
+            while self.scheduled and self.scheduled[0][0] <= now:
+                entry = heappop(self.scheduled)
+                if self.pending.get(id(entry[3])) is entry:
+                    heappush(self.ready, (entry[1], entry[0], entry[2], entry))
+
+            timeout = None
+
+            while self.ready:
+
+                entry = self.ready[0][3]
+
+                if self.pending.get(id(entry[3])) is not entry:
+                    heappop(self.ready)
+                    continue
+
+                player = entry[3]
+
+                if id(player) in self.running:
+                    # a edição anterior ainda não terminou.
+                    heappop(self.ready)
+                    self.stats["deferred"] += 1
+                    self._push(player, now + 0.5, entry[1])
+                    continue
+
+                try:
+                    route = player.text_channel.id
+                except AttributeError:
+                    route = 0
+
+                if wait := self._route_wait(route, now):
+                    heappop(self.ready)
+                    self.stats["deferred"] += 1
+                    self._push(player, now + wait, entry[1])
+                    continue
+
+                self._refill(now)
+
+                if self.tokens < 1:
+                    timeout = (1 - self.tokens) / self.rate
+                    break
+
+                heappop(self.ready)
+                del self.pending[id(player)]
+                self.tokens -= 1
+                self.routes.setdefault(route, deque()).append(now)
+                self.running.add(id(player))
+                asyncio.create_task(self.edit(player))
+
+            if timeout is None and self.scheduled:
+                timeout = max(self.scheduled[0][0] - monotonic(), 0)
+
+            self.wakeup.clear()
+
+            if timeout is None and not self.ready:
+                await self.wakeup.wait()
+                continue
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def edit(self, player: LavalinkPlayer):
+        try:
+            async with self.semaphore:
+                await player.process_controller_update()
+            self.stats["edits"] += 1
+        except Exception:
+            self.stats["errors"] += 1
+            traceback.print_exc()
+        finally:
+            self.running.discard(id(player))
+
+
+def component_data(component):
+    if isinstance(component, (list, tuple)):
+        return [component_data(c) for c in component]
+    try:
+        return component.to_component_dict()
+    except AttributeError:
+        return repr(component)
+
+
+# representação (serializada) de cada parte da mensagem pra comparar com o que foi enviado anteriormente.
+# partes desconhecidas (ex: view, files) ficam como None e são sempre enviadas.
+def payload_fingerprint(data: dict) -> dict:
+
+    fingerprint = {}
+
+    for key, value in data.items():
+
+        if key == "content":
+            fingerprint[key] = json.dumps(value)
+
+        elif key in ("embed", "embeds"):
+            embeds = value if isinstance(value, (list, tuple)) else [value]
+            fingerprint[key] = json.dumps([e.to_dict() if e else None for e in embeds], sort_keys=True, default=str)
+
+        elif key == "components":
+            fingerprint[key] = json.dumps(component_data(value or []), sort_keys=True, default=str)
+
+        elif key != "allowed_mentions":
+            fingerprint[key] = None
+
+    return fingerprint
+
+
+def payload_size(fingerprint: dict) -> int:
+    return sum(len(v) for v in fingerprint.values() if isinstance(v, str))
+
+
+# retorna apenas as partes que mudaram desde o último envio (partes omitidas não são alteradas pelo discord).
+def diff_payload(last: Optional[dict], fingerprint: dict, data: dict) -> dict:
+
+    if not last:
+        return data
+
+    changes = {
+        k: v for k, v in data.items()
+        if k != "allowed_mentions" and (fingerprint.get(k) is None or last.get(k) != fingerprint[k])
+    }
+
+    if changes and "allowed_mentions" in data:
+        changes["allowed_mentions"] = data["allowed_mentions"]
+
+    return changes
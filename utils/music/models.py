@@ -5,10 +5,12 @@ import asyncio
 import datetime
 import pprint
 import random
+import re
+import sys
 import traceback
-import uuid
 from collections import deque
-from itertools import cycle
+from functools import partial
+from itertools import count, cycle, chain, islice
 from time import time
 from typing import Optional, Union, TYPE_CHECKING, List
 from urllib import parse
@@ -21,7 +23,12 @@ from utils.db import DBModel
 from utils.music.checks import can_connect
 from utils.music.converters import fix_characters, time_format, get_button_style, YOUTUBE_VIDEO_REG
 from utils.music.filters import AudioFilter
+from utils.music.message_scheduler import diff_payload, payload_fingerprint, payload_size
+from utils.music.player_actor import PlayerMailbox, PlayNext, EndTrack, HandleTrackEnd, HandleTrackException, \
+    HandleTrackStuck
+from utils.music.player_queue import PlayerQueue, QueueSearchIndex, QueueSpillStore, QueueStats
 from utils.music.skin_utils import skin_converter
+from utils.music.timer_wheel import Timer
 from utils.others import music_source_emoji, send_idle_embed, PlayerControls, SongRequestPurgeMode, \
     song_request_buttons
 
@@ -73,167 +80,251 @@ class PartialPlaylist:
         except:
             return ""
 
+    def release_tracks(self):
+        # a lista de músicas só é usada ao carregar a playlist (e impediria liberar as músicas da fila da memória).
+        if self.tracks:
+            self.data.setdefault("playlistInfo", {})["thumb"] = self.thumb
+            self.tracks = []
 
-class PartialTrack:
-    __slots__ = ('id', 'thumb', 'source_name', 'info', 'playlist', 'unique_id', 'ytid')
 
-    def __init__(self, *, uri: str = "", title: str = "", author="", thumb: str = "", duration: int = 0,
-                 requester: int = 0, track_loops: int = 0, source_name: str = "", autoplay: bool = False,
-                 original_id: str = "", info: dict = None, playlist: PartialPlaylist = None):
+_unique_ids = count(int(time()) << 8)
 
-        self.info = info or {
-            "author": fix_characters(author)[:97],
-            "title": title[:97],
-            "uri": uri,
-            "length": duration,
-            "isStream": False,
-            "isSeekable": True,
-            "sourceName": source_name,
-            "extra": {
-                "original_id": original_id,
-                "requester": requester,
-                "track_loops": track_loops,
-                "thumb": thumb,
-                "autoplay": autoplay
-            }
-        }
 
-        self.id = ""
-        self.ytid = ""
-        self.unique_id = str(uuid.uuid4().hex)[:10]
-        self.thumb = self.info["extra"]["thumb"]
-        self.playlist: Optional[PartialPlaylist] = playlist
+def new_unique_id() -> str:
+    return format(next(_unique_ids), "x")
 
-    def __repr__(self):
-        return f"{self.info['sourceName']} - {self.duration} - {self.authors_string} - {self.title}"
 
-    @property
-    def uri(self) -> str:
-        return self.info["uri"]
+def intern_str(value):
+    try:
+        return sys.intern(value)
+    except TypeError:
+        return value
 
-    @property
-    def url(self) -> str:
-        return self.uri
 
-    @property
-    def search_uri(self):
-        return f"https://www.youtube.com/results?search_query={quote(self.title)}"
+state_slots: dict[type, tuple[str, ...]] = {}
 
-    @property
-    def title(self) -> str:
-        return f"{self.author} - {self.single_title}"
 
-    @property
-    def name(self) -> str:
-        return self.title
+class CompactTrack:
+    # Os dados das músicas ficam em slots e o dict info só é montado quando requisitado (ex: sessões e skins).
+    # Alterações devem ser feitas nos atributos da track ou em track.extra (não no dict retornado em track.info).
+    __slots__ = ()
 
-    @property
-    def original_id(self) -> str:
+    # o slot "info" herdado do wavelink.Track é substituído pela property e não deve ser copiado (pickle/copy).
+    def __getstate__(self):
         try:
-            return self.info["extra"]["original_id"]
+            names = state_slots[type(self)]
         except KeyError:
-            return ""
+            names = state_slots[type(self)] = tuple(
+                {n: None for c in reversed(type(self).__mro__) for n in getattr(c, "__slots__", ()) if n != "info"}
+            )
+        state = {}
+        for name in names:
+            try:
+                state[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+        return None, state
+
+    def _load_extra(self, extra: dict, requester=0, track_loops=0, autoplay=False, thumb=""):
+        extra = dict(extra)
+        self.requester = extra.pop("requester", requester)
+        self.track_loops = extra.pop("track_loops", track_loops)
+        self.autoplay = extra.pop("autoplay", autoplay)
+        thumb = extra.pop("thumb", None) or thumb
+        self._extra = extra or None
+        return thumb
+
+    def _info_extra(self) -> dict:
+        extra = {
+            "requester": self.requester,
+            "track_loops": self.track_loops,
+            "autoplay": self.autoplay,
+            "thumb": self.thumb,
+        }
+        if self._extra:
+            extra.update(self._extra)
+        return extra
 
     @property
-    def single_title(self) -> str:
-        return self.info["title"]
+    def extra(self) -> dict:
+        if self._extra is None:
+            self._extra = {}
+        return self._extra
+
+    def get_info(self, key: str, default=None):
+        try:
+            return self._raw[key]
+        except (TypeError, KeyError):
+            return default
+
+    def update_info(self, data: dict):
+        if self._raw is None:
+            self._raw = {}
+        self._raw.update(data)
 
     @property
-    def author(self) -> str:
-        return self.info["author"]
+    def isrc(self) -> str:
+        return self.get_info("isrc", "")
+
+    @isrc.setter
+    def isrc(self, value: str):
+        self.update_info({"isrc": value})
 
     @property
-    def authors_string(self) -> str:
+    def lyrics(self) -> str:
         try:
-            return ", ".join(self.info["extra"]["authors"])
-        except KeyError:
-            return self.author
+            return self._extra["lyrics"]
+        except (TypeError, KeyError):
+            return ""
 
     @property
-    def authors_md(self) -> str:
+    def album_name(self) -> str:
         try:
-            return self.info["extra"]["authors_md"]
-        except KeyError:
+            return self._extra["album"]["name"]
+        except (TypeError, KeyError):
             return ""
 
     @property
-    def authors(self) -> List[str]:
+    def album_url(self) -> str:
         try:
-            return self.info["extra"]["authors"]
-        except KeyError:
-            return [self.author]
+            return self._extra["album"]["url"]
+        except (TypeError, KeyError):
+            return ""
 
     @property
-    def lyrics(self) -> str:
-
+    def playlist_name(self) -> str:
         try:
-            return self.info["extra"]["lyrics"]
-        except KeyError:
+            return self.playlist.name[:97]
+        except AttributeError:
             return ""
 
     @property
-    def requester(self) -> int:
-        return self.info["extra"]["requester"]
+    def playlist_url(self) -> str:
+        try:
+            return self.playlist.url
+        except AttributeError:
+            return ""
+
+    def to_dict(self) -> dict:
+        info = self.info
+        info["id"] = self.id
+        if self.playlist:
+            info["playlist"] = {"name": self.playlist_name, "url": self.playlist_url}
+        return info
+
+
+class PartialTrack(CompactTrack):
+    __slots__ = ('id', 'thumb', 'source_name', 'playlist', 'unique_id', 'ytid', 'single_title', 'author', 'uri',
+                 'duration', 'is_stream', 'requester', 'track_loops', 'autoplay', 'original_id', '_extra', '_raw')
+
+    def __init__(self, *, uri: str = "", title: str = "", author="", thumb: str = "", duration: int = 0,
+                 requester: int = 0, track_loops: int = 0, source_name: str = "", autoplay: bool = False,
+                 original_id: str = "", info: dict = None, playlist: PartialPlaylist = None):
+
+        self.id = ""
+        self.ytid = ""
+        self.unique_id = new_unique_id()
+        self.playlist: Optional[PartialPlaylist] = playlist
+        self._raw = None
+
+        if info:
+            info = dict(info)
+            self.single_title = info.pop("title", "")
+            self.author = intern_str(info.pop("author", ""))
+            self.uri = info.pop("uri", "")
+            self.duration = info.pop("length", 0)
+            self.is_stream = info.pop("isStream", False)
+            self.source_name = intern_str(info.pop("sourceName", ""))
+            self.thumb = self._load_extra(info.pop("extra", {}))
+            self.original_id = self._extra.pop("original_id", "") if self._extra else ""
+            for k in ("isSeekable", "id", "playlist"):
+                info.pop(k, None)
+            self._raw = info or None
+
+        else:
+            self.single_title = title[:97]
+            self.author = intern_str(fix_characters(author)[:97])
+            self.uri = uri
+            self.duration = duration
+            self.is_stream = False
+            self.source_name = intern_str(source_name)
+            self.requester = requester
+            self.track_loops = track_loops
+            self.autoplay = autoplay
+            self.thumb = thumb
+            self.original_id = original_id
+            self._extra = None
+
+    def __repr__(self):
+        return f"{self.source_name} - {self.duration} - {self.authors_string} - {self.title}"
 
     @property
-    def autoplay(self) -> bool:
-        try:
-            return self.info["extra"]["autoplay"]
-        except KeyError:
-            return False
+    def info(self) -> dict:
+        info = {
+            "author": self.author,
+            "title": self.single_title,
+            "uri": self.uri,
+            "length": self.duration,
+            "isStream": self.is_stream,
+            "isSeekable": not self.is_stream,
+            "sourceName": self.source_name,
+        }
+        if self._raw:
+            info.update(self._raw)
+        info["extra"] = self._info_extra()
+        info["extra"]["original_id"] = self.original_id
+        return info
 
     @property
-    def track_loops(self) -> int:
-        return self.info["extra"]["track_loops"]
+    def url(self) -> str:
+        return self.uri
 
     @property
-    def is_stream(self) -> bool:
-        return self.info["isStream"]
+    def search_uri(self):
+        return f"https://www.youtube.com/results?search_query={quote(self.title)}"
 
     @property
-    def duration(self) -> int:
-        return self.info["length"]
+    def title(self) -> str:
+        return f"{self.author} - {self.single_title}"
 
     @property
-    def album_name(self) -> str:
-        try:
-            return self.info["extra"]["album"]["name"]
-        except KeyError:
-            return ""
+    def name(self) -> str:
+        return self.title
 
     @property
-    def album_url(self) -> str:
+    def authors_string(self) -> str:
         try:
-            return self.info["extra"]["album"]["url"]
-        except KeyError:
-            return ""
+            return ", ".join(self._extra["authors"])
+        except (TypeError, KeyError):
+            return self.author
 
     @property
-    def playlist_name(self) -> str:
+    def authors_md(self) -> str:
         try:
-            return self.playlist.name[:97]
-        except AttributeError:
+            return self._extra["authors_md"]
+        except (TypeError, KeyError):
             return ""
 
     @property
-    def playlist_url(self) -> str:
+    def authors(self) -> List[str]:
         try:
-            return self.playlist.url
-        except AttributeError:
-            return ""
+            return self._extra["authors"]
+        except (TypeError, KeyError):
+            return [self.author]
 
 
 class LavalinkPlaylist:
     __slots__ = ('data', 'url', 'tracks')
 
     def __init__(self, data: dict, **kwargs):
-        self.data = data
+        # os dados brutos das músicas não são mantidos (as tracks já guardam o necessário).
+        self.data = {k: v for k, v in data.items() if k != "tracks"}
         self.url = kwargs.pop("url")
 
         encoded_name = kwargs.pop("encoded_name", "track")
 
         try:
-            if self.data['tracks'][0]['info'].get("sourceName") == "youtube":
+            if data['tracks'][0]['info'].get("sourceName") == "youtube":
                 try:
                     self.url = f"https://www.youtube.com/playlist?list={parse.parse_qs(parse.urlparse(self.url).query)['list'][0]}"
                 except KeyError:
@@ -241,7 +332,7 @@ class LavalinkPlaylist:
         except IndexError:
             pass
         self.tracks = [LavalinkTrack(
-            id_=track[encoded_name], info=track['info'], playlist=self, **kwargs) for track in data['tracks']]
+            id_=track[encoded_name], info=track['info'], playlist=self, lazy=True, **kwargs) for track in data['tracks']]
 
     @property
     def name(self):
@@ -258,65 +349,112 @@ class LavalinkPlaylist:
         except:
             return ""
 
+    def release_tracks(self):
+        # a lista de músicas só é usada ao carregar a playlist (e impediria liberar as músicas da fila da memória).
+        if self.tracks:
+            self.data.setdefault("playlistInfo", {})["thumb"] = self.thumb
+            self.tracks = []
 
-class LavalinkTrack(wavelink.Track):
-    __slots__ = ('extra', 'playlist', 'unique_id')
 
-    def __init__(self, *args, **kwargs):
-        try:
-            args[1]['title'] = fix_characters(args[1]['title'])[:97]
-        except IndexError:
-            pass
-        super().__init__(*args, **kwargs)
-        self.title = fix_characters(self.title)
-        self.info["title"] = self.title
-        self.unique_id = str(uuid.uuid4().hex)[:10]
+LAVALINK_INFO_KEYS = {"title", "identifier", "length", "uri", "author", "isStream", "sourceName", "artworkUrl", "extra",
+                      "isSeekable", "position", "id", "playlist"}
 
-        try:
-            self.info['sourceName']
-        except:
-            self.info['sourceName'] = 'LavalinkTrack'
 
-        try:
-            self.info["extra"]
-        except KeyError:
-            self.info["extra"] = {
-                "track_loops": kwargs.pop('track_loops', 0),
-                "requester": kwargs.pop('requester', ''),
-                "autoplay": kwargs.pop("autoplay", '')
-            }
+class LavalinkTrack(CompactTrack, wavelink.Track):
+    __slots__ = ('source_name', 'playlist', 'unique_id', 'requester', 'track_loops', 'autoplay', '_extra', '_raw',
+                 '_pending')
+
+    def __init__(self, id_, info: dict, query: str = None, *args, **kwargs):
+
+        self.id = id_
+        self.query = query
+        self.length = self.duration = info.get("length")
+        self.is_stream = info.get("isStream")
+        self.dead = False
+        self.source_name = intern_str(info.get("sourceName") or "LavalinkTrack")
+        self.unique_id = new_unique_id()
+        self.playlist: Optional[LavalinkPlaylist] = kwargs.pop("playlist", None)
+
+        thumb = self._load_extra(
+            info.get("extra") or {},
+            requester=kwargs.pop('requester', ''),
+            track_loops=kwargs.pop('track_loops', 0),
+            autoplay=kwargs.pop("autoplay", ''),
+        )
+
+        self._pending = (
+            info.get("title", ""), info.get("author", ""), info.get("identifier", ""), info.get("uri"),
+            info.get("artworkUrl") or thumb or "", {k: v for k, v in info.items() if k not in LAVALINK_INFO_KEYS} or None
+        )
+
+        # com lazy=True os demais dados (título, url, thumb etc) só são processados quando forem acessados
+        # (ex: músicas de playlists grandes que vão demorar pra tocar).
+        if not kwargs.pop("lazy", False):
+            self._load()
+
+    def __getattr__(self, name):
+        if name == "_pending" or name.startswith("__") or not self._pending:
+            raise AttributeError(name)
+        self._load()
+        return getattr(self, name)
+
+    def _load(self):
 
-        self.playlist: Optional[LavalinkPlaylist] = kwargs.pop(
-            "playlist", None)
+        title, author, identifier, uri, thumb, raw = self._pending
+        self._pending = None
+        self._raw = raw
 
-        if self.info["sourceName"] == "youtube":
-            self.info["extra"]["thumb"] = f"https://img.youtube.com/vi/{self.ytid}/mqdefault.jpg"
-            if "list=" not in self.uri:
+        ytid = identifier if re.match(r"^[a-zA-Z0-9_-]{11}$", identifier) else None
+
+        if self.source_name == "youtube":
+            thumb = f"https://img.youtube.com/vi/{ytid}/mqdefault.jpg"
+            if "list=" not in uri:
                 try:
-                    self.uri = f"{self.uri}&list={parse.parse_qs(parse.urlparse(self.playlist_url).query)['list'][0]}"
-                    self.info["uri"] = self.uri
+                    uri = f"{uri}&list={parse.parse_qs(parse.urlparse(self.playlist_url).query)['list'][0]}"
                 except KeyError:
                     pass
 
-        elif self.info["sourceName"] == "soundcloud":
+        elif self.source_name == "soundcloud":
 
-            self.info["extra"]["thumb"] = self.info.get(
-                "artworkUrl", "").replace('large.jpg', 't500x500.jpg')
+            thumb = thumb.replace('large.jpg', 't500x500.jpg')
 
-            if "?in=" not in self.uri:
+            if "?in=" not in uri:
                 try:
-                    self.uri = f"{self.uri}?in=" + self.playlist_url.split("soundcloud.com/")[1]
-                    self.info["uri"] = self.uri
+                    uri = f"{uri}?in=" + self.playlist_url.split("soundcloud.com/")[1]
                 except:
                     pass
 
-        else:
-            self.info["extra"]["thumb"] = self.info.get("artworkUrl", "")
-
-        self.thumb = self.info["extra"]["thumb"] or ""
+        # os valores alterados antes dos dados serem processados (ex: track.title = ...) são mantidos.
+        for name, value in (
+            ("title", fix_characters(title)[:97]), ("identifier", identifier), ("ytid", ytid), ("uri", uri),
+            ("author", intern_str(author[:97])), ("thumb", thumb),
+        ):
+            try:
+                object.__getattribute__(self, name)
+            except AttributeError:
+                setattr(self, name, value)
 
     def __repr__(self):
-        return f"{self.info['sourceName']} - {self.duration if not self.is_stream else 'stream'} - {self.authors_string} - {self.title}"
+        return f"{self.source_name} - {self.duration if not self.is_stream else 'stream'} - {self.authors_string} - {self.title}"
+
+    @property
+    def info(self) -> dict:
+        info = {
+            "identifier": self.identifier,
+            "author": self.author,
+            "title": self.title,
+            "uri": self.uri,
+            "length": self.duration,
+            "isStream": self.is_stream,
+            "isSeekable": not self.is_stream,
+            "sourceName": self.source_name,
+        }
+        if self.source_name != "youtube":
+            info["artworkUrl"] = self.thumb
+        if self._raw:
+            info.update(self._raw)
+        info["extra"] = self._info_extra()
+        return info
 
     @property
     def name(self) -> str:
@@ -328,7 +466,7 @@ class LavalinkTrack(wavelink.Track):
 
     @property
     def url(self) -> str:
-        return self.info["uri"]
+        return self.uri
 
     @property
     def search_uri(self):
@@ -342,55 +480,103 @@ class LavalinkTrack(wavelink.Track):
     def authors_string(self) -> str:
         return f"{self.author}"
 
-    @property
-    def album_name(self) -> str:
-        try:
-            return self.info["extra"]["album"]["name"]
-        except KeyError:
-            return ""
 
-    @property
-    def album_url(self) -> str:
-        try:
-            return self.info["extra"]["album"]["url"]
-        except KeyError:
-            return ""
+class PartialTrackPrefetcher:
+
+    def __init__(self, player: LavalinkPlayer, lookahead: int = 5, concurrency: int = 2):
+        self.player = player
+        self.lookahead = lookahead
+        self.semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self.waiting: dict[str, asyncio.Task] = {}
+        self.running: dict[str, asyncio.Task] = {}
+        self.update_handle: Optional[asyncio.Handle] = None
+
+    def queue_event(self, event: str, items: list):
+        self.schedule()
+
+    def schedule(self):
+        if self.lookahead < 1 or self.update_handle or self.player.is_closing:
+            return
+        # agrupar várias alterações seguidas na fila em uma única verificação.
+        self.update_handle = self.player.bot.loop.call_soon(self.update)
+
+    def update(self):
+
+        self.update_handle = None
+
+        if self.player.is_closing:
+            return
+
+        targets = {}
+
+        for t in islice(chain(self.player.queue, self.player.queue_autoplay), self.lookahead * 4):
+
+            if len(targets) >= self.lookahead:
+                break
+
+            if isinstance(t, PartialTrack) and not t.id:
+                targets[t.unique_id] = t
+
+        # a fila foi alterada: músicas que ainda não começaram a ser processadas e saíram do alcance perdem a vez.
+        for unique_id in [u for u in self.waiting if u not in targets]:
+            self.waiting.pop(unique_id).cancel()
+
+        for unique_id, track in targets.items():
+            if unique_id in self.waiting or unique_id in self.running:
+                continue
+            self.waiting[unique_id] = self.player.bot.loop.create_task(self.resolve(track))
+
+    async def resolve(self, track: PartialTrack):
+
+        unique_id = track.unique_id
+        task = asyncio.current_task()
 
-    @property
-    def lyrics(self) -> str:
         try:
-            return self.info["extra"]["lyrics"]
-        except KeyError:
-            return ""
+            async with self.semaphore:
+                if self.waiting.get(unique_id) is task:
+                    del self.waiting[unique_id]
+                self.running[unique_id] = task
+                if not track.id:
+                    await self.player.resolve_track(track, report=False)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            traceback.print_exc()
+        finally:
+            if self.waiting.get(unique_id) is task:
+                del self.waiting[unique_id]
+            if self.running.get(unique_id) is task:
+                del self.running[unique_id]
 
-    @property
-    def requester(self) -> int:
-        return self.info["extra"]["requester"]
+    async def wait(self, track: PartialTrack):
 
-    @property
-    def autoplay(self) -> bool:
         try:
-            return self.info["extra"]["autoplay"]
+            task = self.running[track.unique_id]
         except KeyError:
-            return False
-
-    @property
-    def track_loops(self) -> int:
-        return self.info["extra"]["track_loops"]
+            try:
+                self.waiting.pop(track.unique_id).cancel()
+            except KeyError:
+                pass
+            return
 
-    @property
-    def playlist_name(self) -> str:
         try:
-            return self.playlist.name[:97]
-        except AttributeError:
-            return ""
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+
+    def cancel(self):
 
-    @property
-    def playlist_url(self) -> str:
         try:
-            return self.playlist.url
+            self.update_handle.cancel()
         except AttributeError:
-            return ""
+            pass
+        self.update_handle = None
+
+        for tasks in (self.waiting, self.running):
+            for task in tasks.values():
+                task.cancel()
+            tasks.clear()
 
 
 class LavalinkPlayer(wavelink.Player):
@@ -409,24 +595,50 @@ class LavalinkPlayer(wavelink.Player):
         self.skin_static: str = kwargs.pop("skin_static", None) or self.bot.default_static_skin
         self.custom_skin_data = kwargs.pop("custom_skin_data", {})
         self.custom_skin_static_data = kwargs.pop("custom_skin_static_data", {})
-        self.queue: deque = deque()
+        self.queue: PlayerQueue = PlayerQueue()
+        self.prefetcher = PartialTrackPrefetcher(
+            self, lookahead=self.bot.config["PARTIALTRACK_PREFETCH_AMOUNT"],
+            concurrency=self.bot.config["PARTIALTRACK_PREFETCH_CONCURRENCY"]
+        )
+        self.queue.add_listener(self.prefetcher.queue_event)
         self.played: deque = deque(maxlen=20)
-        self.queue_autoplay: deque = deque(maxlen=30)
+        self.queue_autoplay: PlayerQueue = PlayerQueue(maxlen=30)
+        self.queue_search = QueueSearchIndex(self.queue)
+        self.queue_stats = QueueStats(self.queue)
+        self.queue.add_listener(self.session_queue_event)
+        self.queue_autoplay.add_listener(self.session_queue_event)
+        self.state_version = 0
+        self.saved_version = 0
+        self.queue_autoplay_search = QueueSearchIndex(self.queue_autoplay)
+        self.autoplay_prefetch_task: Optional[asyncio.Task] = None
+        self.queue_spill_window: int = self.bot.config["QUEUE_SPILL_WINDOW"]
+        self.queue_spill_task: Optional[asyncio.TimerHandle] = None
+        if self.queue_spill_window:
+            self.queue.set_spill_store(
+                QueueSpillStore(f"./local_database/queue_spill/{self.bot.user.id}/{self.guild.id}.db",
+                                shared_types=(LavalinkPlaylist, PartialPlaylist))
+            )
+            self.queue.add_listener(self.queue_spill_event)
         self.failed_tracks: deque = deque(maxlen=30)
         self.autoplay: bool = kwargs.pop("autoplay", False)
         self.nightcore: bool = False
         self.loop = False
         self.last_track: Optional[LavalinkTrack] = None
-        self.locked: bool = False
+        self.mailbox = PlayerMailbox(self)
+        self.session_journal = None
+        self.hibernating = False
+        self.hibernate_task: Optional[Timer] = None
+        self.hibernate_lock = asyncio.Lock()
+        self.waiting_node: bool = False
         self.is_previows_music: bool = False
         self.interaction_cooldown: bool = False
         self.votes: set = set()
         self.dj: set = set()
         self.player_creator: Optional[int] = kwargs.pop('player_creator', None)
         self.filters: dict = {}
-        self.idle_task: Optional[asyncio.Task] = None
-        self.members_timeout_task: Optional[asyncio.Task] = None
-        self.reconnect_voice_channel_task: Optional[asyncio.Task] = None
+        self.idle_task: Optional[Timer] = None
+        self.members_timeout_task: Optional[Timer] = None
+        self.reconnect_voice_channel_task: Optional[Timer] = None
         self.idle_endtime: Optional[datetime.datetime] = None
         self.hint_rate = self.bot.config["HINT_RATE"]
         self.command_log: str = ""
@@ -438,7 +650,6 @@ class LavalinkPlayer(wavelink.Player):
         self.updating: bool = False
         self.auto_update: int = 0
         self.listen_along_invite = kwargs.pop("listen_along_invite", "")
-        self.message_updater_task: Optional[asyncio.Task] = None
         # limitar apenas para dj's e staff's
         self.restrict_mode = kwargs.pop('restrict_mode', False)
         self.ignore_np_once = False  # não invocar player controller em determinadas situações
@@ -455,8 +666,7 @@ class LavalinkPlayer(wavelink.Player):
         self.last_channel: Optional[disnake.VoiceChannel] = None
         self._rpc_update_task: Optional[asyncio.Task] = None
         self._new_node_task: Optional[asyncio.Task] = None
-        self._queue_updater_task: Optional[asyncio.Task] = None
-        self.auto_skip_track_task: Optional[asyncio.Task] = None
+        self.auto_skip_track_task: Optional[Timer] = None
 
         stage_template = kwargs.pop("stage_title_template", None)
 
@@ -519,6 +729,8 @@ class LavalinkPlayer(wavelink.Player):
         self.hints: cycle = []
         self.current_hint: str = ""
         self.last_data: dict = {}
+        self.last_render_key: Optional[tuple] = None
+        self.sent_payload: Optional[tuple[int, dict]] = None
         self.check_skins()
         self.setup_features()
         self.setup_hints()
@@ -528,6 +740,48 @@ class LavalinkPlayer(wavelink.Player):
     def __str__(self) -> str:
         return f"Current music server: {self.node.identifier} (v{self.node.version})"
 
+    def session_queue_event(self, event: str, items: list):
+        if event != "spill":
+            self.mark_dirty()
+
+    def queue_spill_event(self, event: str, items: list):
+
+        if event == "add":
+            self.schedule_queue_spill()
+
+        elif event == "spill":
+            for t in items:
+                try:
+                    t.playlist.release_tracks()
+                except AttributeError:
+                    continue
+
+    def schedule_queue_spill(self, delay: float = 10):
+        if self.queue_spill_window and not self.queue_spill_task:
+            self.queue_spill_task = self.bot.loop.call_later(delay, self.spill_queue)
+
+    def spill_queue(self):
+        self.queue_spill_task = None
+        try:
+            # poucos blocos por vez pra não travar o loop em filas muito grandes.
+            if self.queue.spill(self.queue_spill_window, limit=8):
+                self.schedule_queue_spill(delay=0.5)
+        except Exception:
+            traceback.print_exc()
+
+    def search_queue(self, query: str, limit: int = None, exact: bool = False) -> List[tuple[int, Union[LavalinkTrack, PartialTrack]]]:
+
+        results = self.queue_search.search(query, limit=limit, exact=exact)
+
+        if not limit or len(results) < limit:
+            offset = len(self.queue)
+            results.extend(
+                (offset + n, t) for n, t in
+                self.queue_autoplay_search.search(query, limit=limit - len(results) if limit else None, exact=exact)
+            )
+
+        return results
+
     def __repr__(self):
         return f"<volume={self.volume} " \
                f"current_position={time_format(self.position) if self.position else 'Idling'} " \
@@ -592,7 +846,7 @@ class LavalinkPlayer(wavelink.Player):
 
         if cog and cog.error_report_queue:
 
-            embed.description += f"\n**Source:** `{track.info['sourceName']}`" \
+            embed.description += f"\n**Source:** `{track.source_name}`" \
                                  f"\n**Server:** `{disnake.utils.escape_markdown(self.guild.name)} [{self.guild.id}]`"
 
             try:
@@ -632,315 +886,344 @@ class LavalinkPlayer(wavelink.Player):
                 await self.destroy()
                 return
 
-        while True:
-
-            try:
-                self.bot.music.players[self.guild_id]
-            except KeyError:
-                return
-
-            if self.guild.me.voice:
-                if isinstance(vc, disnake.StageChannel) \
-                        and self.guild.me not in vc.speakers \
-                        and vc.permissions_for(self.guild.me).mute_members:
-                    try:
-                        await self.guild.me.edit(suppress=False)
-                    except Exception:
-                        traceback.print_exc()
-                return
+        await self.reconnect_voice_channel_attempt(vc)
 
-            if self.is_closing:
-                return
+    def start_reconnect_voice_channel(self):
+        try:
+            self.reconnect_voice_channel_task.cancel()
+        except AttributeError:
+            pass
+        self.reconnect_voice_channel_task = self.bot.pool.timers.schedule(
+            0, self.reconnect_voice_channel, name="reconnect_voice_channel")
 
-            if not self._new_node_task:
+    async def reconnect_voice_channel_attempt(self, vc: Optional[disnake.VoiceChannel]):
 
-                try:
-                    can_connect(vc, self.guild, bot=self.bot)
-                except Exception as e:
-                    self.set_command_log(f"The Player was terminated due to an error: {e}")
-                    await self.destroy()
-                    return
+        try:
+            self.bot.music.players[self.guild_id]
+        except KeyError:
+            return
 
+        if self.guild.me.voice:
+            if isinstance(vc, disnake.StageChannel) \
+                    and self.guild.me not in vc.speakers \
+                    and vc.permissions_for(self.guild.me).mute_members:
                 try:
-                    await self.connect(vc.id)
-                    self.set_command_log(text="I noticed an attempt to disconnect me from the channel. "
-                                                "If you want to disconnect me, use the command/button: **stop**.",
-                                           emoji="⚠️")
-                    self.update = True
-                    await asyncio.sleep(5)
-                    continue
+                    await self.guild.me.edit(suppress=False)
                 except Exception:
                     traceback.print_exc()
-
-            await asyncio.sleep(30)
-
-    async def hook(self, event) -> None:
+            return
 
         if self.is_closing:
             return
 
-        await self.bot.wait_until_ready()
-
-        if isinstance(event, wavelink.TrackEnd):
+        retry_delay = 30
 
-            self.bot.dispatch("wavelink_track_end", self.node, event)
+        if not self._new_node_task:
 
-            if self.locked or self.auto_pause:
+            try:
+                can_connect(vc, self.guild, bot=self.bot)
+            except Exception as e:
+                self.set_command_log(f"The Player was terminated due to an error: {e}")
+                await self.destroy()
                 return
 
-            if event.reason == "FINISHED":
-                self.set_command_log()
+            try:
+                await self.connect(vc.id)
+                self.set_command_log(text="I noticed an attempt to disconnect me from the channel. "
+                                            "If you want to disconnect me, use the command/button: **stop**.",
+                                       emoji="⚠️")
+                self.update = True
+                retry_delay = 5
+            except Exception:
+                traceback.print_exc()
 
-            elif event.reason == "STOPPED":
+        self.reconnect_voice_channel_task = self.bot.pool.timers.schedule(
+            retry_delay, partial(self.reconnect_voice_channel_attempt, vc), name="reconnect_voice_channel")
 
-                if len(self.queue) == 0:
-                    return
+    async def on_track_end(self, event: wavelink.TrackEnd):
 
-                self.ignore_np_once = True
+        if self.is_closing or self.waiting_node or self.auto_pause:
+            return
 
-            else:
-                return
+        if event.reason == "FINISHED":
+            self.set_command_log()
 
-            try:
-                self.message_updater_task.cancel()
-            except:
-                pass
+        elif len(self.queue) == 0:
+            return
 
-            await self.track_end()
+        else:
+            self.ignore_np_once = True
 
-            self.update = False
+        self.bot.pool.controller_updater.discard(self)
 
-            await self.process_next()
+        await self.track_end()
 
-            return
+        self.update = False
 
-        if isinstance(event, wavelink.TrackStart):
+        await self.process_next()
 
-            self.start_time = disnake.utils.utcnow()
+    async def on_track_stuck(self, event: wavelink.TrackStuck):
 
-            if not self.current.autoplay:
-                self.queue_autoplay.clear()
+        if self.is_closing:
+            return
 
-            if self.auto_pause:
-                return
+        self.bot.pool.controller_updater.discard(self)
 
-            if not self.text_channel:
-                return
+        await self.track_end()
 
-            if isinstance(self.text_channel, disnake.Thread):
-                send_message_perm = self.text_channel.parent.permissions_for(self.guild.me).send_messages_in_threads
-            else:
-                send_message_perm = self.text_channel.permissions_for(self.guild.me).send_messages
+        self.update = False
 
-            if not send_message_perm:
-                self.text_channel = None
-                return
+        try:
+            self.set_command_log(text=f"The song [{fix_characters(self.current.single_title, 25)}]({self.current.uri}) froze.", emoji="⚠️")
+        except:
+            pass
 
-            if not self.guild.me.voice:
-                try:
-                    await self.bot.wait_for(
-                        "voice_state_update", check=lambda m, b, a: m == self.guild.me and m.voice, timeout=7
-                    )
-                except asyncio.TimeoutError:
-                    self.update = True
-                    return
+        await self.process_next()
 
-            try:
-                await self.process_save_queue()
-            except:
-                traceback.print_exc()
+    async def on_track_exception(self, event: wavelink.TrackException, stale: bool = False):
 
-            await asyncio.sleep(2)
-            await self.update_stage_topic()
+        if self.is_closing:
             return
 
-        if isinstance(event, wavelink.TrackException):
-
-            track = self.last_track
-            embed = disnake.Embed(
-                description=f"**Failed to play music:\n[{track.title}]({track.uri or track.search_uri})** ```java\n{event.message}```\n"
-                            f"**Cause:** ```java\n{event.cause[:200]}```\n"
-                            f"**Severity:** `{event.severity}`\n"
-                            f"**Music Server:** `{self.node.identifier}`",
-                color=disnake.Colour.red())
-
-            error_format = pprint.pformat(event.data)
+        track = self.last_track
+        embed = disnake.Embed(
+            description=f"**Failed to play music:\n[{track.title}]({track.uri or track.search_uri})** ```java\n{event.message}```\n"
+                        f"**Cause:** ```java\n{event.cause[:200]}```\n"
+                        f"**Severity:** `{event.severity}`\n"
+                        f"**Music Server:** `{self.node.identifier}`",
+            color=disnake.Colour.red())
 
-            async def send_report():
+        error_format = pprint.pformat(event.data)
 
-                print(("-" * 50) + f"\nError while playing the song: {track.uri or track.search_uri}\n"
-                                   f"Server: {self.node.identifier}\n"
-                                   f"{error_format}\n" + ("-" * 50))
+        async def send_report():
 
-                await self.report_error(embed, track)
+            print(("-" * 50) + f"\nError while playing the song: {track.uri or track.search_uri}\n"
+                               f"Server: {self.node.identifier}\n"
+                               f"{error_format}\n" + ("-" * 50))
 
-            if self.locked:
-                self.set_command_log(
-                    text=f"The music playback failed (trying to play again): [`{fix_characters(track.title, 15)}`]({track.uri or track.search_uri}). **Cause:** `{event.cause[:50]}`")
-                self.update = True
-                await send_report()
-                return
+            await self.report_error(embed, track)
 
-            self.locked = True
+        if stale:
+            self.set_command_log(
+                text=f"The music playback failed (trying to play again): [`{fix_characters(track.title, 15)}`]({track.uri or track.search_uri}). **Cause:** `{event.cause[:50]}`")
+            self.update = True
+            await send_report()
+            return
 
-            self.current = None
+        self.current = None
 
-            error_403 = False
+        error_403 = False
 
-            cooldown = 10
+        cooldown = 10
 
-            if (event.error == "This IP address has been blocked by YouTube (429)" or
-                event.message == "Video returned by YouTube isn't what was requested" or
-                (error_403 := event.cause.startswith(("java.lang.RuntimeException: Not success status code: 403",
-                                                      "java.io.IOException: Invalid status code for video page response: 400")))
-            ):
+        if (event.error == "This IP address has been blocked by YouTube (429)" or
+            event.message == "Video returned by YouTube isn't what was requested" or
+            (error_403 := event.cause.startswith(("java.lang.RuntimeException: Not success status code: 403",
+                                                  "java.io.IOException: Invalid status code for video page response: 400")))
+        ):
 
-                if error_403 and self.node.retry_403:
+            if error_403 and self.node.retry_403:
 
-                    if not hasattr(self, 'retries_403'):
-                        self.retries_403 = {"last_time": None, 'counter': 0}
+                if not hasattr(self, 'retries_403'):
+                    self.retries_403 = {"last_time": None, 'counter': 0}
 
-                    if not self.retries_403["last_time"] or ((disnake.utils.utcnow() - self.retries_403["last_time"]).total_seconds() > self.bot.pool.config.get("ERROR_403_RETRIES", 7)):
-                        self.retries_403 = {"last_time": disnake.utils.utcnow(), 'counter': 0}
-                        if self.auto_pause:
-                            self.update = True
-                        else:
-                            await self.play(track, start=get_start_pos(self, track, self.bot.pool.config.get("ERROR_403_ADDITIONAL_MILLISECONDS", 430)))
-                            await asyncio.sleep(3)
-                        self.locked = False
+                if not self.retries_403["last_time"] or ((disnake.utils.utcnow() - self.retries_403["last_time"]).total_seconds() > self.bot.pool.config.get("ERROR_403_RETRIES", 7)):
+                    self.retries_403 = {"last_time": disnake.utils.utcnow(), 'counter': 0}
+                    if self.auto_pause:
                         self.update = True
-                        return
-
-                    elif self.retries_403["counter"] < 3:
-                        self.retries_403["counter"] += 1
+                    else:
+                        await self.play(track, start=get_start_pos(self, track, self.bot.pool.config.get("ERROR_403_ADDITIONAL_MILLISECONDS", 430)))
                         await asyncio.sleep(3)
-                        self.retries_403["last_time"] = disnake.utils.utcnow()
+                    self.update = True
+                    return
 
-                        if self.is_closing:
-                            return
+                elif self.retries_403["counter"] < 3:
+                    self.retries_403["counter"] += 1
+                    await asyncio.sleep(3)
+                    self.retries_403["last_time"] = disnake.utils.utcnow()
 
-                        self.locked = False
-                        self.set_command_log(
-                            text=f'Error 403 occurred while playing the current song on YouTube. Attempt {self.retries_403["counter"]}/5...')
-                        if not self.auto_pause:
-                            self.update = True
-                        else:
-                            await self.play(track, start=get_start_pos(self, track, self.bot.pool.config.get("ERROR_403_ADDITIONAL_MILLISECONDS", 430)))
-                            self.update = True
-                        await send_report()
+                    if self.is_closing:
                         return
 
-                    self.queue.append(track)
-
-                self.retries_403 = {"last_time": None, 'counter': 0}
-
-                if track.info["sourceName"] == "youtube" or (self.bot.config["PARTIALTRACK_SEARCH_PROVIDER"] == "ytsearch" and
-                                                             track.info["sourceName"] == "spotify"):
-
+                    self.set_command_log(
+                        text=f'Error 403 occurred while playing the current song on YouTube. Attempt {self.retries_403["counter"]}/5...')
+                    if not self.auto_pause:
+                        self.update = True
+                    else:
+                        await self.play(track, start=get_start_pos(self, track, self.bot.pool.config.get("ERROR_403_ADDITIONAL_MILLISECONDS", 430)))
+                        self.update = True
                     await send_report()
+                    return
 
-                    self.node.available = False
-
-                    if self.node._closing:
-                        return
+                self.queue.append(track)
 
-                    await asyncio.sleep(3)
+            self.retries_403 = {"last_time": None, 'counter': 0}
 
-                    current_node: wavelink.Node = self.bot.music.nodes[self.node.identifier]
-                    current_node.close()
+            if track.source_name == "youtube" or (self.bot.config["PARTIALTRACK_SEARCH_PROVIDER"] == "ytsearch" and
+                                                         track.source_name == "spotify"):
 
-                    for player_id in list(self.node.players):
+                await send_report()
 
-                        p = self.node.players[player_id]
+                self.node.available = False
 
-                        node = [n for n in self.bot.music.nodes.values() if n.available and n.is_available]
-                        p.current = p.last_track
-                        if node:
-                            await p.change_node(node[0].identifier)
-                            p.set_command_log(f"The player has reconnected to a new music server: **{p.node.identifier}**.")
-                            p.update = True
-                            p.locked = False
-                        else:
-                            try:
-                                p._new_node_task.cancel()
-                            except:
-                                pass
-                            p._new_node_task = p.bot.loop.create_task(p._wait_for_new_node(
-                                f"The server **{current_node.identifier}** received a YouTube ratelimit "
-                                f"and is currently unavailable (waiting for a new server to become available)."))
+                if self.node._closing:
                     return
 
-            await send_report()
+                await asyncio.sleep(3)
 
-            start_position = 0
+                current_node: wavelink.Node = self.bot.music.nodes[self.node.identifier]
+                current_node.close()
 
-            if event.cause.startswith((
-                    "java.lang.IllegalStateException: Failed to get media URL: 2000: An error occurred while decoding track token",
-                    "java.net.SocketTimeoutException: Read timed out",
-                    "java.lang.RuntimeException: Not success status code: 204",
-                    "java.net.SocketTimeoutException: Connect timed out",
-                    "java.lang.IllegalArgumentException: Invalid bitrate",
-                    "java.net.UnknownHostException:",
-                    "java.lang.IllegalStateException: Error from decoder",
-                    "java.lang.IllegalStateException: Current position is beyond this element",
-                    "com.sedmelluq.discord.lavaplayer.tools.io.PersistentHttpStream$PersistentHttpException: Not success status code: 403",
-            )):
+                for player_id in list(self.node.players):
 
-                if not hasattr(self, 'retries_general_errors'):
-                    self.retries_general_errors = {'counter': 6, 'last_node': self.node.identifier, "last_time": disnake.utils.utcnow()}
+                    p = self.node.players[player_id]
 
-                embed = None
+                    node = [n for n in self.bot.music.nodes.values() if n.available and n.is_available]
+                    p.current = p.last_track
+                    if node:
+                        await p.change_node(node[0].identifier)
+                        p.set_command_log(f"The player has reconnected to a new music server: **{p.node.identifier}**.")
+                        p.update = True
+                    else:
+                        try:
+                            p._new_node_task.cancel()
+                        except:
+                            pass
+                        p._new_node_task = p.bot.loop.create_task(p._wait_for_new_node(
+                            f"The server **{current_node.identifier}** received a YouTube ratelimit "
+                            f"and is currently unavailable (waiting for a new server to become available)."))
+                return
 
-                self.queue.appendleft(track)
+        await send_report()
 
-                if self.retries_general_errors["counter"] < 1 and self.node.identifier == self.retries_general_errors["last_node"] and (disnake.utils.utcnow() - self.retries_general_errors["last_time"]).total_seconds() < 180:
+        start_position = 0
 
-                    try:
-                        self._new_node_task.cancel()
-                    except:
-                        pass
-                    self._new_node_task = self.bot.loop.create_task(self._wait_for_new_node(ignore_node=self.node.identifier))
-                    return
+        if event.cause.startswith((
+                "java.lang.IllegalStateException: Failed to get media URL: 2000: An error occurred while decoding track token",
+                "java.net.SocketTimeoutException: Read timed out",
+                "java.lang.RuntimeException: Not success status code: 204",
+                "java.net.SocketTimeoutException: Connect timed out",
+                "java.lang.IllegalArgumentException: Invalid bitrate",
+                "java.net.UnknownHostException:",
+                "java.lang.IllegalStateException: Error from decoder",
+                "java.lang.IllegalStateException: Current position is beyond this element",
+                "com.sedmelluq.discord.lavaplayer.tools.io.PersistentHttpStream$PersistentHttpException: Not success status code: 403",
+        )):
 
-                self.retries_general_errors["last_time"] = disnake.utils.utcnow()
+            if not hasattr(self, 'retries_general_errors'):
+                self.retries_general_errors = {'counter': 6, 'last_node': self.node.identifier, "last_time": disnake.utils.utcnow()}
 
-                if self.retries_general_errors['last_node'] == self.node.identifier:
-                    self.retries_general_errors['counter'] -= 1
-                else:
-                    self.retries_general_errors = {'counter': 6, 'last_node': self.node.identifier, "last_time": disnake.utils.utcnow()}
+            embed = None
 
-                start_position = get_start_pos(self, track)
+            self.queue.appendleft(track)
 
-                cooldown = 4
+            if self.retries_general_errors["counter"] < 1 and self.node.identifier == self.retries_general_errors["last_node"] and (disnake.utils.utcnow() - self.retries_general_errors["last_time"]).total_seconds() < 180:
 
-            elif event.cause == "java.lang.InterruptedException":
-                embed = None
-                self.queue.appendleft(track)
                 try:
                     self._new_node_task.cancel()
                 except:
                     pass
-                self._new_node_task = self.bot.loop.create_task(self._wait_for_new_node())
+                self._new_node_task = self.bot.loop.create_task(self._wait_for_new_node(ignore_node=self.node.identifier))
                 return
 
-            elif not track.track_loops:
-                self.failed_tracks.append(track)
+            self.retries_general_errors["last_time"] = disnake.utils.utcnow()
 
-            elif self.keep_connected and not track.autoplay and len(self.queue) > 15:
-                self.queue.append(track)
+            if self.retries_general_errors['last_node'] == self.node.identifier:
+                self.retries_general_errors['counter'] -= 1
+            else:
+                self.retries_general_errors = {'counter': 6, 'last_node': self.node.identifier, "last_time": disnake.utils.utcnow()}
+
+            start_position = get_start_pos(self, track)
+
+            cooldown = 4
+
+        elif event.cause == "java.lang.InterruptedException":
+            embed = None
+            self.queue.appendleft(track)
+            try:
+                self._new_node_task.cancel()
+            except:
+                pass
+            self._new_node_task = self.bot.loop.create_task(self._wait_for_new_node())
+            return
+
+        elif not track.track_loops:
+            self.failed_tracks.append(track)
+            self.mark_track_failed(track, event.message or event.cause, node_failure=True)
+
+        elif self.keep_connected and not track.autoplay and len(self.queue) > 15:
+            self.queue.append(track)
+
+        if isinstance(self.text_channel, disnake.Thread):
+            send_message_perm = self.text_channel.parent.permissions_for(self.guild.me).send_messages_in_threads
+        else:
+            send_message_perm = self.text_channel.permissions_for(self.guild.me).send_messages
+
+        if embed and self.text_channel and send_message_perm:
+            await self.text_channel.send(embed=embed, delete_after=10)
+
+        await asyncio.sleep(cooldown)
+
+        await self.process_next(start_position=start_position)
+
+    async def hook(self, event) -> None:
+
+        if self.is_closing:
+            return
+
+        await self.bot.wait_until_ready()
+
+        if isinstance(event, wavelink.TrackEnd):
+
+            self.bot.dispatch("wavelink_track_end", self.node, event)
+
+            if event.reason in ("FINISHED", "STOPPED"):
+                await self.mailbox.submit(HandleTrackEnd(event))
+
+            return
+
+        if isinstance(event, wavelink.TrackStart):
+
+            self.start_time = disnake.utils.utcnow()
+
+            if not self.current.autoplay:
+                self.queue_autoplay.clear()
+
+            if self.auto_pause:
+                return
+
+            if not self.text_channel:
+                return
 
             if isinstance(self.text_channel, disnake.Thread):
                 send_message_perm = self.text_channel.parent.permissions_for(self.guild.me).send_messages_in_threads
             else:
                 send_message_perm = self.text_channel.permissions_for(self.guild.me).send_messages
 
-            if embed and self.text_channel and send_message_perm:
-                await self.text_channel.send(embed=embed, delete_after=10)
+            if not send_message_perm:
+                self.text_channel = None
+                return
 
-            await asyncio.sleep(cooldown)
+            if not self.guild.me.voice:
+                try:
+                    await self.bot.wait_for(
+                        "voice_state_update", check=lambda m, b, a: m == self.guild.me and m.voice, timeout=7
+                    )
+                except asyncio.TimeoutError:
+                    self.update = True
+                    return
+
+            try:
+                await self.process_save_queue()
+            except:
+                traceback.print_exc()
 
-            self.locked = False
-            await self.process_next(start_position=start_position)
+            await asyncio.sleep(2)
+            await self.update_stage_topic()
+            return
+
+        if isinstance(event, wavelink.TrackException):
+            await self.mailbox.submit(HandleTrackException(event))
             return
 
         if isinstance(event, wavelink.WebsocketClosed):
@@ -996,23 +1279,7 @@ class LavalinkPlayer(wavelink.Player):
                 return
 
         if isinstance(event, wavelink.TrackStuck):
-
-            try:
-                self.message_updater_task.cancel()
-            except:
-                pass
-
-            await self.track_end()
-
-            self.update = False
-
-            try:
-                self.set_command_log(text=f"The song [{fix_characters(self.current.single_title, 25)}]({self.current.uri}) froze.", emoji="⚠️")
-            except:
-                pass
-
-            await self.process_next()
-
+            await self.mailbox.submit(HandleTrackStuck(event))
             return
 
         elif isinstance(event, wavelink.WebsocketClosed):
@@ -1152,6 +1419,16 @@ class LavalinkPlayer(wavelink.Player):
 
     async def members_timeout(self, check: bool, force: bool = False, idle_timeout = None):
 
+        if self.hibernating:
+            if not check or not await self.wake():
+                return
+
+        try:
+            self.hibernate_task.cancel()
+        except AttributeError:
+            pass
+        self.hibernate_task = None
+
         if self.auto_pause:
             if self.current:
                 try:
@@ -1201,14 +1478,28 @@ class LavalinkPlayer(wavelink.Player):
             if not idle_timeout:
                 idle_timeout = self.bot.config["WAIT_FOR_MEMBERS_TIMEOUT"]
 
-            await asyncio.sleep(idle_timeout)
+            self.members_timeout_task = self.bot.pool.timers.schedule(
+                idle_timeout, partial(self.members_timeout_expired, vc), name="members_timeout")
+            return
 
-            if [m for m in vc.members if not m.bot and not (m.voice.deaf or m.voice.self_deaf)]:
-                try:
-                    self.auto_skip_track_task.cancel()
-                except:
-                    pass
-                return
+        await self.members_timeout_expired()
+
+    def start_members_timeout(self, check: bool, idle_timeout = None):
+        try:
+            self.members_timeout_task.cancel()
+        except AttributeError:
+            pass
+        self.members_timeout_task = self.bot.pool.timers.schedule(
+            0, partial(self.members_timeout, check=check, idle_timeout=idle_timeout), name="members_timeout")
+
+    async def members_timeout_expired(self, vc: Optional[disnake.VoiceChannel] = None):
+
+        if vc and [m for m in vc.members if not m.bot and not (m.voice.deaf or m.voice.self_deaf)]:
+            try:
+                self.auto_skip_track_task.cancel()
+            except:
+                pass
+            return
 
         if self.keep_connected:
 
@@ -1219,11 +1510,8 @@ class LavalinkPlayer(wavelink.Player):
             track = self.current
             await self.stop()
             self.current = track
-            try:
-                self.auto_skip_track_task.cancel()
-            except:
-                pass
-            self.auto_skip_track_task = self.bot.loop.create_task(self.auto_skip_track())
+            self.start_auto_skip_track()
+            self.schedule_hibernate()
             await self.update_stage_topic()
 
         else:
@@ -1244,19 +1532,245 @@ class LavalinkPlayer(wavelink.Player):
 
             await self.destroy()
 
+    def schedule_hibernate(self):
+        try:
+            self.hibernate_task.cancel()
+        except AttributeError:
+            pass
+        self.hibernate_task = None
+        if timeout := self.bot.config["PLAYER_HIBERNATE_TIMEOUT"]:
+            self.hibernate_task = self.bot.pool.timers.schedule(timeout, self.hibernate, name="hibernate")
+
+    # player 24/7 pausado automaticamente há muito tempo: a sessão é gravada e as músicas/tasks do player são
+    # liberadas da memória (o player continua conectado no canal de voz) até algum membro entrar no canal ou
+    # ser usado algum comando.
+    async def hibernate(self):
+
+        self.hibernate_task = None
+
+        async with self.hibernate_lock:
+
+            if self.hibernating or self.is_closing or not self.auto_pause or not self.keep_connected:
+                return
+
+            if not (cog := self.bot.get_cog("PlayerSession")):
+                return
+
+            if self.session_journal:
+                self.session_journal.request_snapshot()
+
+            async with self.bot.pool.session_saver.exclusive(self):
+
+                version = self.state_version
+
+                try:
+                    saved = await cog.save_info(self)
+                except Exception:
+                    traceback.print_exc()
+                    saved = False
+
+            if not saved:
+                self.mark_dirty()
+                self.schedule_hibernate()
+                return
+
+            self.saved_version = version
+            self.hibernating = True
+
+            for task in (self.auto_skip_track_task, self.autoplay_prefetch_task, self.queue_spill_task):
+                try:
+                    task.cancel()
+                except AttributeError:
+                    pass
+
+            self.auto_skip_track_task = None
+            self.autoplay_prefetch_task = None
+            self.queue_spill_task = None
+            self.prefetcher.cancel()
+
+            if self.session_journal:
+                self.session_journal.close()
+                self.session_journal = None
+
+            self.queue.clear()
+            self.queue_autoplay.clear()
+            self.played.clear()
+            self.failed_tracks.clear()
+            self.current = None
+            self.last_track = None
+            self.hints = []
+            self.current_hint = ""
+            self.temp_embed = None
+            self.last_render_key = None
+            self.sent_payload = None
+
+        print(f"{self.bot.user} - Player hibernating: {self.guild.name} [{self.guild.id}]")
+
+    # caso a sessão não possa ser carregada o player continua hibernando (e a sessão gravada é mantida) até a próxima
+    # tentativa.
+    async def wake(self) -> bool:
+
+        async with self.hibernate_lock:
+
+            if not self.hibernating:
+                return True
+
+            if not (cog := self.bot.get_cog("PlayerSession")):
+                return False
+
+            try:
+                data = await cog.load_session(self.guild.id)
+            except Exception:
+                print(f"{self.bot.user} - Failed to restore player from hibernation: {self.guild.name} [{self.guild.id}]\n"
+                      f"{traceback.format_exc()}")
+                return False
+
+            if data:
+
+                try:
+                    cog.restore_tracks(self, data)
+                except Exception:
+                    print(f"{self.bot.user} - Failed to restore player from hibernation: {self.guild.name} [{self.guild.id}]\n"
+                          f"{traceback.format_exc()}")
+                    self.queue.clear()
+                    self.queue_autoplay.clear()
+                    self.played.clear()
+                    self.failed_tracks.clear()
+                    return False
+
+                # a música atual é a primeira da fila gravada.
+                if len(self.queue) > len(data.get("queue_uids") or []):
+                    self.current = self.last_track = self.queue.popleft()
+                    self.last_position = int(float(data.get("position", 0)))
+                    self.last_update = time() * 1000
+
+            else:
+                # não há sessão gravada (nada a ser sobrescrito).
+                print(f"{self.bot.user} - Player session not found when restoring from hibernation: "
+                      f"{self.guild.name} [{self.guild.id}]")
+
+            self.hibernating = False
+            self.saved_version = self.state_version
+            self.setup_hints()
+
+            if self.auto_pause:
+                self.start_auto_skip_track()
+                self.schedule_hibernate()
+
+        print(f"{self.bot.user} - Player restored from hibernation: {self.guild.name} [{self.guild.id}]")
+        return True
+
     async def get_autoqueue_tracks(self):
 
         try:
-            return self.queue_autoplay.popleft()
+            return self.pop_playable_track(self.queue_autoplay)
         except:
             pass
 
-        if self.locked:
+        if self.autoplay_prefetch_task:
+            # as músicas recomendadas já estão sendo obtidas em segundo plano.
+            try:
+                await asyncio.shield(self.autoplay_prefetch_task)
+            except Exception:
+                traceback.print_exc()
+            try:
+                return self.pop_playable_track(self.queue_autoplay)
+            except IndexError:
+                pass
+
+        has_seeds, exception = await self.fill_autoqueue()
+
+        try:
+            return self.queue_autoplay.popleft()
+        except IndexError:
+            pass
+
+        if not has_seeds:
             return
 
+        if exception:
+            if isinstance(exception, wavelink.TrackLoadError):
+                error_msg = f"**Cause:** ```java\n{exception.cause}```\n" \
+                            f"**Message:** `\n{exception.message}`\n" \
+                            f"**Severity:** `{exception.severity}`\n" \
+                            f"**Music Server:** `{self.node.identifier}`"
+            else:
+                error_msg = f"**Details:** ```py\n{repr(exception)}```"
+        else:
+            error_msg = "No results related to the played songs were found..."
+
+        try:
+            embed = disnake.Embed(
+                description=f"**Failed to retrieve autoplay data:**\n"
+                            f"{error_msg}",
+                color=disnake.Colour.red())
+            await self.text_channel.send(embed=embed, delete_after=10)
+        except:
+            traceback.print_exc()
+        await asyncio.sleep(7)
+
+    def schedule_autoplay_prefetch(self):
+
+        if not (self.autoplay or self.keep_connected) or self.autoplay_prefetch_task or self.queue_autoplay or \
+                len(self.queue) >= self.bot.config["AUTOPLAY_PREFETCH_THRESHOLD"]:
+            return
+
+        self.autoplay_prefetch_task = self.bot.loop.create_task(self.prefetch_autoplay())
+
+    async def prefetch_autoplay(self):
+        try:
+            await self.fill_autoqueue(background=True)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            self.autoplay_prefetch_task = None
+
+    async def get_spotify_recommendations(self, track_ids: list) -> list:
+
+        cache_key = "spotify:" + ",".join(sorted(track_ids))
+
+        if (tracks := self.bot.pool.recommendations_cache.get(cache_key)) is None:
+            result = await self.bot.loop.run_in_executor(None, lambda: self.bot.spotify.recommendations(seed_tracks=track_ids))
+            tracks = result["tracks"]
+            self.bot.pool.recommendations_cache.set(cache_key, tracks)
+
+        return tracks
+
+    async def get_lavalink_recommendations(self, query: str) -> List[LavalinkTrack]:
+
+        cache_key = f"lavalink:{query}"
+
+        if (tracks := self.bot.pool.recommendations_cache.get(cache_key)) is None:
+
+            result = await self.node.get_tracks(query, track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist)
+
+            try:
+                result = result.tracks
+            except AttributeError:
+                pass
+
+            tracks = []
+
+            for t in result:
+                info = t.info
+                del info["extra"]
+                tracks.append((t.id, info))
+
+            self.bot.pool.recommendations_cache.set(cache_key, tracks)
+
+        return [LavalinkTrack(id_=id_, info=info, autoplay=True, requester=self.bot.user.id, lazy=True)
+                for id_, info in tracks]
+
+    async def fill_autoqueue(self, background: bool = False) -> tuple[bool, Optional[Exception]]:
+
         tracks_search = []
 
-        for t in self.played + self.queue_autoplay:
+        seeds = [*self.played, *self.queue_autoplay]
+
+        if background and self.current and not self.current.autoplay and self.current not in seeds:
+            seeds.insert(0, self.current)
+
+        for t in seeds:
 
             if len(tracks_search) > 4:
                 break
@@ -1266,141 +1780,108 @@ class LavalinkPlayer(wavelink.Player):
 
             tracks_search.append(t)
 
+        if not tracks_search:
+            return False, None
+
         track = None
         tracks = []
         tracks_ytsearch = []
 
         exception = None
 
-        if tracks_search:
-
-            tracks_search.reverse()
+        tracks_search.reverse()
 
-            self.locked = True
+        for track_data in tracks_search:
 
-            for track_data in tracks_search:
+            if track_data.source_name == "spotify" and self.bot.spotify:
+                track_ids = list(set(t.original_id for t in tracks_search if t.source_name == "spotify"))[:5]
 
-                if track_data.info["sourceName"] == "spotify" and self.bot.spotify:
-                    track_ids = list(set(t.original_id for t in tracks_search if t.info["sourceName"] == "spotify"))[:5]
+                result = None
 
-                    result = None
-
-                    for i in range(3):
-                        try:
-                            result = await self.bot.loop.run_in_executor(None, lambda: self.bot.spotify.recommendations(seed_tracks=track_ids))
-                            break
-                        except Exception as e:
+                for i in range(3):
+                    try:
+                        result = await self.get_spotify_recommendations(track_ids)
+                        break
+                    except Exception as e:
+                        if not background:
                             self.set_command_log(emoji="⚠️", text=f"Failed to retrieve recommended songs from Spotify, attempt {i+1} of 3.")
                             self.update = True
-                            traceback.print_exc()
-                            exception = e
-                            await asyncio.sleep(5)
-
-                    if result:
-
-                        tracks = []
-
-                        for t in result["tracks"]:
-
-                            try:
-                                thumb = t["album"]["images"][0]["url"]
-                            except (IndexError,KeyError):
-                                thumb = ""
-
-                            partial_track = PartialTrack(
-                                    uri=t["external_urls"]["spotify"],
-                                    author=t["artists"][0]["name"] or "Unknown Artist",
-                                    title=t["name"],
-                                    thumb=thumb,
-                                    duration=t["duration_ms"],
-                                    source_name="spotify",
-                                    original_id=t["id"],
-                                    requester=self.bot.user.id,
-                                    autoplay=True,
-                                )
+                        traceback.print_exc()
+                        exception = e
+                        await asyncio.sleep(5)
 
-                            partial_track.info["extra"]["authors"] = [fix_characters(i['name']) for i in t['artists'] if
-                                                          f"feat. {i['name'].lower()}"
-                                                          not in t['name'].lower()]
+                if result:
 
-                            partial_track.info["extra"]["authors_md"] = ", ".join(
-                                f"[`{a['name']}`]({a['external_urls']['spotify']})" for a in t["artists"])
+                    tracks = []
 
-                            try:
-                                if t["album"]["name"] != t["name"]:
-                                    partial_track.info["extra"]["album"] = {
-                                        "name": t["album"]["name"],
-                                        "url": t["album"]["external_urls"]["spotify"]
-                                    }
-                            except (AttributeError, KeyError):
-                                pass
+                    for t in result:
 
-                            tracks.append(partial_track)
+                        try:
+                            thumb = t["album"]["images"][0]["url"]
+                        except (IndexError,KeyError):
+                            thumb = ""
+
+                        partial_track = PartialTrack(
+                                uri=t["external_urls"]["spotify"],
+                                author=t["artists"][0]["name"] or "Unknown Artist",
+                                title=t["name"],
+                                thumb=thumb,
+                                duration=t["duration_ms"],
+                                source_name="spotify",
+                                original_id=t["id"],
+                                requester=self.bot.user.id,
+                                autoplay=True,
+                            )
 
-                if not tracks:
-                    if track_data.info["sourceName"] == "youtube":
-                        query = f"https://music.youtube.com/watch?v={track_data.ytid}&list=RD{track_data.ytid}"
-                    else:
-                        query = f"ytmsearch:{track_data.author}"
+                        partial_track.extra["authors"] = [fix_characters(i['name']) for i in t['artists'] if
+                                                      f"feat. {i['name'].lower()}"
+                                                      not in t['name'].lower()]
 
-                    try:
-                        tracks = await self.node.get_tracks(
-                            query, track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist, autoplay=True,
-                            requester=self.bot.user.id
-                        )
-                    except Exception as e:
-                        if [err for err in ("Could not find tracks from mix", "Could not read mix page") if err in str(e)]:
-                            try:
-                                tracks_ytsearch = await self.node.get_tracks(
-                                    f"ytsearch:\"{track_data.author}\"",
-                                    track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist, autoplay=True,
-                                    requester=self.bot.user.id)
-                                track = track_data
-                            except Exception as e:
-                                exception = e
-                                continue
-                        else:
-                            print(traceback.format_exc())
-                            exception = e
-                            await asyncio.sleep(1.5)
-                            continue
+                        partial_track.extra["authors_md"] = ", ".join(
+                            f"[`{a['name']}`]({a['external_urls']['spotify']})" for a in t["artists"])
 
-                track = track_data
-                break
+                        try:
+                            if t["album"]["name"] != t["name"]:
+                                partial_track.extra["album"] = {
+                                    "name": t["album"]["name"],
+                                    "url": t["album"]["external_urls"]["spotify"]
+                                }
+                        except (AttributeError, KeyError):
+                            pass
 
-            if not tracks:
-                tracks = tracks_ytsearch
-                tracks.reverse()
+                        tracks.append(partial_track)
 
             if not tracks:
-                self.locked = False
-
-                if exception:
-                    if isinstance(exception, wavelink.TrackLoadError):
-                        error_msg = f"**Cause:** ```java\n{exception.cause}```\n" \
-                                    f"**Message:** `\n{exception.message}`\n" \
-                                    f"**Severity:** `{exception.severity}`\n" \
-                                    f"**Music Server:** `{self.node.identifier}`"
-                    else:
-                        error_msg = f"**Details:** ```py\n{repr(exception)}```"
+                if track_data.source_name == "youtube":
+                    query = f"https://music.youtube.com/watch?v={track_data.ytid}&list=RD{track_data.ytid}"
                 else:
-                    error_msg = "No results related to the played songs were found..."
+                    query = f"ytmsearch:{track_data.author}"
 
                 try:
-                    embed = disnake.Embed(
-                        description=f"**Failed to retrieve autoplay data:**\n"
-                                    f"{error_msg}",
-                        color=disnake.Colour.red())
-                    await self.text_channel.send(embed=embed, delete_after=10)
-                except:
-                    traceback.print_exc()
-                await asyncio.sleep(7)
-                return
+                    tracks = await self.get_lavalink_recommendations(query)
+                except Exception as e:
+                    if [err for err in ("Could not find tracks from mix", "Could not read mix page") if err in str(e)]:
+                        try:
+                            tracks_ytsearch = await self.get_lavalink_recommendations(f"ytsearch:\"{track_data.author}\"")
+                            track = track_data
+                        except Exception as e:
+                            exception = e
+                            continue
+                    else:
+                        print(traceback.format_exc())
+                        exception = e
+                        await asyncio.sleep(1.5)
+                        continue
 
-        try:
-            tracks = tracks.tracks
-        except AttributeError:
-            pass
+            track = track_data
+            break
+
+        if not tracks:
+            tracks = tracks_ytsearch
+            tracks.reverse()
+
+        if not tracks:
+            return True, exception
 
         try:
             tracks = [t for t in tracks if not [u for u in tracks_search if t.uri.startswith(u.uri)]]
@@ -1427,26 +1908,38 @@ class LavalinkPlayer(wavelink.Player):
                 if track.ytid and track.ytid == t.ytid:
                     continue
 
-                if not isinstance(t, PartialTrack):
-                    t = LavalinkTrack(id_=t.id, info=t.info, autoplay=True, requester=self.bot.user.id)
+                if self.track_failure(t):
+                    continue
 
-                t.info["extra"]["related"] = info
+                t.extra["related"] = info
                 tracks_final.append(t)
 
             tracks.clear()
             self.queue_autoplay.extend(tracks_final)
 
-        self.locked = False
+        return True, exception
 
-        try:
-            return self.queue_autoplay.popleft()
-        except:
-            return None
+    @property
+    def locked(self) -> bool:
+        return self.waiting_node or self.mailbox.busy
 
     async def process_next(self, start_position: Union[int, float] = 0, inter: disnake.MessageInteraction = None,
                            force_np=False, clear_autoqueue = True):
 
-        if self.locked or self.is_closing:
+        if self.is_closing:
+            return
+
+        await self.mailbox.submit(PlayNext(start_position=start_position, inter=inter, force_np=force_np,
+                                           clear_autoqueue=clear_autoqueue))
+
+    async def retry_autoqueue(self):
+        if not self.is_closing and not self.current and (self.autoplay or self.keep_connected):
+            await self.process_next()
+
+    async def play_next_track(self, start_position: Union[int, float] = 0, inter: disnake.MessageInteraction = None,
+                              force_np=False, clear_autoqueue = True):
+
+        if self.is_closing:
             return
 
         if not self.node or not self.node.is_available:
@@ -1475,7 +1968,7 @@ class LavalinkPlayer(wavelink.Player):
             pass
 
         try:
-            track = self.queue.popleft()
+            track = self.pop_playable_track(self.queue)
 
         except:
 
@@ -1489,17 +1982,15 @@ class LavalinkPlayer(wavelink.Player):
                         clear_autoqueue = False
                     except:
                         traceback.print_exc()
-                        self.locked = False
-                        await asyncio.sleep(60)
-                        if not self.current and (self.autoplay or self.keep_connected):
-                            await self.process_next()
+                        # nova tentativa fora da fila de comandos (pra não deixar o player ocupado por 1 minuto).
+                        self.bot.pool.timers.schedule(60, self.retry_autoqueue, name="autoqueue_retry")
                         return
 
                 if not track:
                     await self.stop()
                     self.idle_endtime = disnake.utils.utcnow() + datetime.timedelta(seconds=self.bot.config["IDLE_TIMEOUT"])
                     self.last_track = None
-                    self.idle_task = self.bot.loop.create_task(self.idling_mode())
+                    self.idle_task = self.bot.pool.timers.schedule(0, self.idling_mode, name="idle")
                     return
 
             except Exception:
@@ -1511,12 +2002,11 @@ class LavalinkPlayer(wavelink.Player):
             await self.process_next()
             return
 
-        self.locked = True
-
         if isinstance(track, PartialTrack):
 
             if not track.id:
                 try:
+                    await self.prefetcher.wait(track)
                     await self.resolve_track(track)
                 except Exception as e:
                     try:
@@ -1530,12 +2020,11 @@ class LavalinkPlayer(wavelink.Player):
                     except:
                         traceback.print_exc()
 
-                    self.locked = False
-
                     await self.process_next()
                     return
 
             if not track.id:
+                self.mark_track_failed(track, "No results found")
                 try:
                     await self.text_channel.send(
                         embed=disnake.Embed(
@@ -1549,8 +2038,6 @@ class LavalinkPlayer(wavelink.Player):
 
                 await asyncio.sleep(10)
 
-                self.locked = False
-
                 await self.process_next()
                 return
 
@@ -1579,7 +2066,6 @@ class LavalinkPlayer(wavelink.Player):
                     color=disnake.Colour.red())
                 await self.report_error(embed, track)
                 await asyncio.sleep(7)
-                self.locked = False
                 await self.process_next()
                 return
 
@@ -1589,6 +2075,7 @@ class LavalinkPlayer(wavelink.Player):
                 pass
 
             if not t:
+                self.mark_track_failed(track, "No results found")
                 try:
                     await self.text_channel.send(
                         embed=disnake.Embed(
@@ -1602,8 +2089,6 @@ class LavalinkPlayer(wavelink.Player):
 
                 await asyncio.sleep(10)
 
-                self.locked = False
-
                 await self.process_next()
                 return
 
@@ -1613,11 +2098,11 @@ class LavalinkPlayer(wavelink.Player):
             self.queue_autoplay.clear()
 
         self.last_track = track
+        self.mailbox.next_generation()
+        self.mark_dirty()
 
         self.is_previows_music = False
 
-        self.locked = False
-
         if track.is_stream:
             start_position = 0
 
@@ -1629,6 +2114,10 @@ class LavalinkPlayer(wavelink.Player):
 
         self.process_hint()
 
+        self.prefetcher.schedule()
+        self.schedule_queue_spill()
+        self.schedule_autoplay_prefetch()
+
         if self.auto_pause:
             self.last_update = time() * 1000
         else:
@@ -1737,6 +2226,8 @@ class LavalinkPlayer(wavelink.Player):
         except:
             pass
 
+        self.sent_payload = None
+
         try:
             if self.has_thread or self.static or self.text_channel.last_message_id == self.message.id:
                 try:
@@ -1783,7 +2274,9 @@ class LavalinkPlayer(wavelink.Player):
         if self.keep_connected:
             return
 
-        await asyncio.sleep(self.bot.config["IDLE_TIMEOUT"])
+        self.idle_task = self.bot.pool.timers.schedule(self.bot.config["IDLE_TIMEOUT"], self.idle_timeout, name="idle")
+
+    async def idle_timeout(self):
 
         msg = "💤 **⠂The player was disconnected due to inactivity...**"
 
@@ -1843,7 +2336,7 @@ class LavalinkPlayer(wavelink.Player):
                 .replace("{track.author}", self.current.authors_string) \
                 .replace("{track.duration}",
                          time_format(self.current.duration) if not self.current.is_stream else "Livestream") \
-                .replace("{track.source}", self.current.info.get("sourceName", "unknown")) \
+                .replace("{track.source}", self.current.source_name or "unknown") \
                 .replace("{track.playlist}", self.current.playlist_name or "No playlist") \
                 .replace("{requester.name}", requester_name) \
                 .replace("{requester.id}", str(self.current.requester)) \
@@ -1876,7 +2369,7 @@ class LavalinkPlayer(wavelink.Player):
 
             if msg is not None:
 
-                msg = msg.replace("{track.emoji}", music_source_emoji(self.current.info["sourceName"]))
+                msg = msg.replace("{track.emoji}", music_source_emoji(self.current.source_name))
 
                 if len(msg) > 496:
                     msg = msg[:496] + "..."
@@ -1895,12 +2388,108 @@ class LavalinkPlayer(wavelink.Player):
 
         self.last_stage_title = msg
 
-    def start_message_updater_task(self):
+    @property
+    def update(self) -> bool:
+        return self.bot.pool.controller_updater.is_pending(self)
+
+    @update.setter
+    def update(self, value: bool):
+        if value:
+            self.bot.pool.controller_updater.mark_dirty(self)
+        else:
+            self.bot.pool.controller_updater.discard(self)
+
+    # skin padrão em uso (None para skins personalizadas).
+    def render_skin(self):
+        skin = self.skin_static if self.static else self.skin
+        if skin.startswith("> custom_skin: "):
+            return
+        return (self.bot.player_static_skins if self.static else self.bot.player_skins).get(skin)
+
+    # chave com o estado usado pelas skins para montar o player controller: estados iguais reaproveitam a mensagem
+    # renderizada (inclusive entre players diferentes usando a mesma skin).
+    def render_key(self) -> Optional[tuple]:
+
+        skin = self.skin_static if self.static else self.skin
+
+        try:
+            track = self.current
+            if track.is_stream:
+                ends = None
+            elif self.paused:
+                ends = track.duration - self.position
+            else:
+                # horário de término (agrupado a cada 5 segundos) exibido como timestamp relativo em algumas skins.
+                ends = int(time() + (track.duration - self.position) / 1000) // 5
+            key = (
+                skin, self.static, track.id, track.uri, track.title, track.requester, track.autoplay, track.track_loops,
+                track.playlist_url, ends, self.paused, self.loop, self.volume, self.queue.version if self.queue else 0,
+                self.queue_autoplay.version if self.queue_autoplay else 0, self.current_hint, self.command_log,
+                self.command_log_emoji, self.nightcore, self.autoplay, self.restrict_mode, self.keep_connected,
+                self.mini_queue_feature, self.mini_queue_enabled, self.controller_mode, self.stage_title_event,
+                self.has_thread, isinstance(self.last_channel, disnake.VoiceChannel), self.node.identifier,
+                self.node.lyric_support, self.bot.get_color(self.guild.me).value,
+            )
+        except Exception:
+            traceback.print_exc()
+            return
+
+        try:
+            related = self.current.info["extra"]["related"]["uri"]
+        except (KeyError, TypeError):
+            related = None
+
+        key += (related,)
+
+        skin_data = self.render_skin()
+
+        # skins personalizadas usam dados do servidor/membro e algumas skins exibem a menção do canal de voz: as
+        # demais ficam sem dados do servidor na chave para o cache ser compartilhado entre servidores.
+        if skin_data is None or getattr(skin_data, "voice_channel_render", False):
+
+            try:
+                vc_id = self.guild.me.voice.channel.id
+            except AttributeError:
+                vc_id = None
+
+            key += (vc_id,) if skin_data is not None else (self.bot.user.id, self.guild.id, vc_id)
+
+        if self.auto_update:
+            key += (int(self.position // 1000),)
+
+        return key
+
+    # compara a mensagem com o último envio: somente as partes alteradas são enviadas na edição.
+    def controller_payload(self, data: dict, message: Optional[disnake.Message] = None) -> tuple[dict, dict]:
+
+        fingerprint = payload_fingerprint(data)
+
+        try:
+            message_id, last = self.sent_payload
+            if message_id != (message or self.message).id:
+                last = None
+        except (TypeError, AttributeError):
+            last = None
+
+        payload = diff_payload(last, fingerprint, data)
+
+        stats = self.bot.pool.controller_updater.stats
+        size = payload_size(fingerprint)
+        sent = payload_size({k: v for k, v in fingerprint.items() if k in payload})
+        stats["bytes_sent"] += sent
+        stats["bytes_saved"] += size - sent
+        if not payload:
+            stats["skipped"] += 1
+
+        return payload, fingerprint
+
+    def schedule_auto_update(self):
         try:
-            self.message_updater_task.cancel()
+            if self.auto_update and not self.current.is_stream:
+                self.bot.pool.controller_updater.mark_dirty(
+                    self, delay=self.auto_update, priority=self.bot.pool.controller_updater.PRIORITY_LOW)
         except AttributeError:
             pass
-        self.message_updater_task = self.bot.loop.create_task(self.message_updater())
 
     async def invoke_np(self, force=False, interaction=None, rpc_update=False):
 
@@ -1942,22 +2531,47 @@ class LavalinkPlayer(wavelink.Player):
             self.setup_hints()
             self.retry_setup_hints = False
 
-        try:
-            if self.static:
-                if self.skin_static.startswith("> custom_skin: "):
-                    data = skin_converter(self.custom_skin_static_data[self.skin_static[15:]], player=self)
-                else:
-                    data = self.bot.player_static_skins[self.skin_static].load(self)
+        # skins leves renderizam mais rápido do que a chave é montada: ficam sem cache (a mensagem repetida ainda é
+        # descartada pela comparação com last_data).
+        render_key = self.render_key() if getattr(self.render_skin(), "render_cache", True) else None
 
-            else:
-                if self.skin.startswith("> custom_skin: "):
-                    data = skin_converter(self.custom_skin_data[self.skin[15:]], player=self)
-                else:
-                    data = self.bot.player_skins[self.skin].load(self)
-        except OverflowError:
-            await self.process_next()
+        if not force and self.message and render_key is not None and render_key == self.last_render_key:
+
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.defer()
+            except:
+                pass
             return
 
+        if render_key is None or (data := self.bot.pool.skin_render_cache.get(render_key)) is None:
+
+            try:
+                if self.static:
+                    if self.skin_static.startswith("> custom_skin: "):
+                        data = skin_converter(self.custom_skin_static_data[self.skin_static[15:]], player=self)
+                    else:
+                        data = self.bot.player_static_skins[self.skin_static].load(self)
+
+                else:
+                    if self.skin.startswith("> custom_skin: "):
+                        data = skin_converter(self.custom_skin_data[self.skin[15:]], player=self)
+                    else:
+                        data = self.bot.player_skins[self.skin].load(self)
+            except OverflowError:
+                await self.process_next()
+                return
+
+            if render_key is not None:
+                self.bot.pool.skin_render_cache.set(render_key, data)
+
+        # o resultado em cache é compartilhado, as alterações abaixo são feitas em uma cópia.
+        data = dict(data)
+        if data.get("embeds") is not None:
+            data["embeds"] = list(data["embeds"])
+
+        self.last_render_key = render_key
+
         if data == self.last_data:
 
             try:
@@ -1991,20 +2605,22 @@ class LavalinkPlayer(wavelink.Player):
                         self.text_channel = None
                         self.message = None
                     else:
+                        payload, fingerprint = self.controller_payload(data)
                         try:
-                            await self.message.edit(allowed_mentions=self.allowed_mentions, **data)
+                            if payload:
+                                await self.message.edit(allowed_mentions=self.allowed_mentions, **payload)
+                            self.sent_payload = (self.message.id, fingerprint)
                         except disnake.Forbidden:
                             self.message = None
                             self.text_channel = None
                         except:
                             self.message = await self.text_channel.send(allowed_mentions=self.allowed_mentions, **data)
+                            self.sent_payload = (self.message.id, fingerprint)
 
             else:
-                try:
-                    self.message_updater_task.cancel()
-                except:
-                    pass
+                self.bot.pool.controller_updater.discard(self)
                 self.message = await self.text_channel.send(allowed_mentions=self.allowed_mentions, **data)
+                self.sent_payload = (self.message.id, payload_fingerprint(data))
 
             self.updating = False
 
@@ -2135,16 +2751,25 @@ class LavalinkPlayer(wavelink.Player):
             self.updating = True
 
             if interaction:
+                if message := getattr(interaction, "message", None):
+                    payload, fingerprint = self.controller_payload(data, message)
+                else:
+                    payload, fingerprint = data, None
                 try:
                     if interaction.response.is_done():
-                        await interaction.message.edit(allowed_mentions=self.allowed_mentions, **data)
-                    else:
+                        if payload:
+                            await interaction.message.edit(allowed_mentions=self.allowed_mentions, **payload)
+                    elif payload:
                         await interaction.response.edit_message(allowed_mentions=self.allowed_mentions,
-                                                                **data)
+                                                                **payload)
+                    else:
+                        await interaction.response.defer()
+                    if fingerprint:
+                        self.sent_payload = (message.id, fingerprint)
                 except:
                     traceback.print_exc()
                 self.updating = False
-                self.start_message_updater_task()
+                self.schedule_auto_update()
                 return
 
             else:
@@ -2156,9 +2781,14 @@ class LavalinkPlayer(wavelink.Player):
 
                     try:
 
+                        payload, fingerprint = self.controller_payload(data)
+
                         try:
-                            await self.message.edit(allowed_mentions=self.allowed_mentions, **data)
+                            if payload:
+                                await self.message.edit(allowed_mentions=self.allowed_mentions, **payload)
+                            self.sent_payload = (self.message.id, fingerprint)
                         except:
+                            self.sent_payload = None
                             self.text_channel = self.bot.get_channel(self.text_channel.id)
 
                             if not self.text_channel:
@@ -2198,7 +2828,7 @@ class LavalinkPlayer(wavelink.Player):
                                     self.guild.me).read_messages:
                                 return
 
-                        self.start_message_updater_task()
+                        self.schedule_auto_update()
                         self.updating = False
                         return
                     except Exception as e:
@@ -2217,22 +2847,27 @@ class LavalinkPlayer(wavelink.Player):
                 try:
                     self.message = await self.text_channel.send(allowed_mentions=self.allowed_mentions,
                                                                 **data)
+                    self.sent_payload = (self.message.id, payload_fingerprint(data))
                 except:
                     traceback.print_exc()
 
-            self.start_message_updater_task()
+            self.schedule_auto_update()
 
         self.updating = False
 
     async def set_pause(self, pause: bool) -> None:
         await super().set_pause(pause)
+        self.mark_dirty()
+
+    async def set_volume(self, vol: int) -> None:
+        await super().set_volume(vol)
+        self.mark_dirty()
 
     async def destroy_message(self):
 
-        try:
-            self.message_updater_task.cancel()
-        except:
-            pass
+        self.bot.pool.controller_updater.discard(self)
+        self.last_render_key = None
+        self.sent_payload = None
 
         if self.static:
             return
@@ -2252,36 +2887,12 @@ class LavalinkPlayer(wavelink.Player):
         except AttributeError:
             return
 
-    async def message_updater(self):
-
-        while True:
-
-            if not self.text_channel or not self.controller_mode:
-                pass
-
-            elif self.auto_update and not self.current.is_stream:
-
-                await asyncio.sleep(self.auto_update)
-
-                try:
-                    await self.invoke_np()
-                except:
-                    traceback.print_exc()
-
-                continue
-
-            elif self.update:
-
-                try:
-                    await self.invoke_np()
-                except:
-                    traceback.print_exc()
+    async def process_controller_update(self):
 
-                self.update = False
-
-                await asyncio.sleep(5)
+        if not self.text_channel or not self.controller_mode or not self.current or self.is_closing:
+            return
 
-            await asyncio.sleep(10)
+        await self.invoke_np()
 
     async def update_message(self, interaction: disnake.Interaction = None, force=False, rpc_update=False):
 
@@ -2297,9 +2908,24 @@ class LavalinkPlayer(wavelink.Player):
 
     async def cleanup(self, inter: disnake.MessageInteraction = None):
 
+        self.mailbox.close()
+        self.prefetcher.cancel()
         self.queue.clear()
+
+        if self.autoplay_prefetch_task:
+            self.autoplay_prefetch_task.cancel()
+            self.autoplay_prefetch_task = None
         self.played.clear()
 
+        if self.queue_spill_task:
+            self.queue_spill_task.cancel()
+            self.queue_spill_task = None
+
+        try:
+            self.queue.set_spill_store(None)
+        except Exception:
+            traceback.print_exc()
+
         try:
             self.members_timeout_task.cancel()
         except:
@@ -2311,10 +2937,12 @@ class LavalinkPlayer(wavelink.Player):
             pass
 
         try:
-            self._queue_updater_task.cancel()
-        except:
+            self.hibernate_task.cancel()
+        except AttributeError:
             pass
 
+        self.bot.pool.session_saver.discard(self)
+
         try:
             vc = self.guild.voice_client.channel
         except:
@@ -2342,6 +2970,8 @@ class LavalinkPlayer(wavelink.Player):
 
             else:
 
+                self.sent_payload = None
+
                 try:
                     if self.has_thread:
 
@@ -2405,11 +3035,7 @@ class LavalinkPlayer(wavelink.Player):
                 except Exception:
                     traceback.print_exc()
 
-        try:
-            self.message_updater_task.cancel()
-        except:
-            pass
-        self.message_updater_task = None
+        self.bot.pool.controller_updater.discard(self)
 
         try:
             self._new_node_task.cancel()
@@ -2423,74 +3049,129 @@ class LavalinkPlayer(wavelink.Player):
             pass
         self.idle_task = None
 
+        try:
+            self.reconnect_voice_channel_task.cancel()
+        except:
+            pass
+        self.reconnect_voice_channel_task = None
+
+    def start_auto_skip_track(self):
+        try:
+            self.auto_skip_track_task.cancel()
+        except AttributeError:
+            pass
+        self.auto_skip_track_task = self.bot.pool.timers.schedule(0, self.auto_skip_track, name="auto_skip")
+
     async def auto_skip_track(self):
 
         if not self.controller_mode or not self.current:
             return
 
-        while True:
+        await self.schedule_auto_skip()
 
-            try:
+    async def schedule_auto_skip(self):
 
-                try:
-                    await self.process_save_queue()
-                except:
-                    traceback.print_exc()
+        try:
+            await self.process_save_queue()
+        except:
+            traceback.print_exc()
 
-                try:
-                    if self.current.is_stream:
-                        return
-                except AttributeError:
-                    pass
+        try:
+            if self.current.is_stream:
+                return
+            delay = (self.current.duration - self.position) / 1000
+        except AttributeError:
+            return
 
-                try:
-                    await asyncio.sleep((self.current.duration - self.position) / 1000)
-                except AttributeError:
-                    return
+        self.auto_skip_track_task = self.bot.pool.timers.schedule(delay, self.auto_skip_track_expired, name="auto_skip")
 
-                self.set_command_log()
+    async def auto_skip_track_expired(self):
 
-                try:
-                    await self.track_end()
-                except Exception:
-                    traceback.print_exc()
+        self.set_command_log()
 
-                try:
-                    await self.process_next()
-                except:
-                    print(traceback.format_exc())
+        try:
+            await self.track_end()
+        except Exception:
+            traceback.print_exc()
 
-                try:
-                    await self.invoke_np(force=True)
-                except:
-                    traceback.print_exc()
+        try:
+            await self.process_next()
+        except:
+            print(traceback.format_exc())
 
-                try:
-                    await self.update_stage_topic()
-                except Exception:
-                    traceback.print_exc()
+        try:
+            await self.invoke_np(force=True)
+        except:
+            traceback.print_exc()
 
-            except asyncio.CancelledError:
-                return
+        try:
+            await self.update_stage_topic()
+        except Exception:
+            traceback.print_exc()
 
-            except Exception:
-                traceback.print_exc()
-                return
+        await self.schedule_auto_skip()
+
+    def partial_track_key(self, track: PartialTrack) -> str:
+        return f"{self.bot.config['PARTIALTRACK_SEARCH_PROVIDER']}:" + (track.get_info("search_uri") or track.uri or f"{track.title} - {track.authors_string}")
+
+    def failed_track_key(self, track: Union[LavalinkTrack, PartialTrack]) -> str:
+        if isinstance(track, PartialTrack):
+            return self.partial_track_key(track)
+        return track.uri or track.id
+
+    # músicas que falharam recentemente (em qualquer player da pool) são puladas sem novas tentativas (apenas as
+    # recomendadas: as músicas pedidas pelos membros sempre são tocadas). Falhas ao tocar no lavalink (ex: bloqueio
+    # do ip/região do servidor) valem apenas pro node em que ocorreram.
+    def track_failure(self, track: Union[LavalinkTrack, PartialTrack]) -> Optional[str]:
+        try:
+            key = self.failed_track_key(track)
+            return self.bot.pool.failed_track_cache.get(key) or \
+                self.bot.pool.failed_track_cache.get(f"{self.node.identifier}|{key}")
+        except Exception:
+            return
+
+    def mark_track_failed(self, track: Union[LavalinkTrack, PartialTrack], reason: str, node_failure: bool = False):
+        if self.bot.pool.failed_track_cache.ttl:
+            key = self.failed_track_key(track)
+            if node_failure:
+                key = f"{self.node.identifier}|{key}"
+            self.bot.pool.failed_track_cache.set(key, reason or "Unknown error")
+
+    def pop_playable_track(self, queue: PlayerQueue) -> Union[LavalinkTrack, PartialTrack]:
+
+        while True:
+
+            track = queue.popleft()
+
+            if not track.autoplay or not (reason := self.track_failure(track)):
+                return track
+
+            self.set_command_log(
+                text=f"The song [`{fix_characters(track.title, 25)}`]({track.uri or track.search_uri}) was skipped "
+                     f"(recently failed: `{reason[:50]}`).", emoji="⚠️")
 
-    async def resolve_track(self, track: PartialTrack):
+    async def resolve_track(self, track: PartialTrack, report: bool = True):
 
         if track.id:
             return
 
+        cache_key = self.partial_track_key(track)
+
+        if cached := self.bot.pool.partial_track_cache.get(cache_key):
+            track.id, track.duration = cached
+            return
+
+        if track.autoplay and self.track_failure(track):
+            return
+
         try:
 
             exceptions = []
 
-            try:
-                to_search = track.info["search_uri"]
+            if to_search := track.get_info("search_uri"):
                 check_duration = False
-            except KeyError:
-                to_search = f"{self.bot.config['PARTIALTRACK_SEARCH_PROVIDER']}:" + (f"\"{track.info['isrc']}\"" if track.info.get("isrc") else f"{track.single_title.replace(' - ', ' ')} - {track.authors_string}")
+            else:
+                to_search = f"{self.bot.config['PARTIALTRACK_SEARCH_PROVIDER']}:" + (f"\"{track.isrc}\"" if track.isrc else f"{track.single_title.replace(' - ', ' ')} - {track.authors_string}")
                 check_duration = True
 
             try:
@@ -2501,9 +3182,9 @@ class LavalinkPlayer(wavelink.Player):
 
             if not tracks and self.bot.config['PARTIALTRACK_SEARCH_PROVIDER'] not in ("ytsearch", "ytmsearch", "scsearch"):
 
-                if track.info.get("isrc"):
+                if track.isrc:
                     try:
-                        tracks = await self.node.get_tracks(f"ytsearch:\"{track.info['isrc']}\"",track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist)
+                        tracks = await self.node.get_tracks(f"ytsearch:\"{track.isrc}\"",track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist)
                     except Exception as e:
                         exceptions.append(e)
 
@@ -2522,6 +3203,8 @@ class LavalinkPlayer(wavelink.Player):
             if not tracks:
                 if exceptions:
                     print("Failure to resolve PartialTrack:\n" + "\n".join(repr(e) for e in exceptions))
+                if all(isinstance(e, wavelink.TrackNotFound) for e in exceptions):
+                    self.mark_track_failed(track, "No results found")
                 return
 
             selected_track = None
@@ -2542,9 +3225,16 @@ class LavalinkPlayer(wavelink.Player):
                 selected_track = tracks[0]
 
             track.id = selected_track.id
-            track.info["length"] = selected_track.duration
+            track.duration = selected_track.duration
+
+            self.bot.pool.partial_track_cache.set(cache_key, (track.id, track.duration))
 
         except Exception as e:
+            # falhas na busca antecipada (prefetch) são apenas registradas no log: a música é buscada novamente ao
+            # ser reproduzida e o erro só é reportado caso falhe nesse momento.
+            if not report:
+                print(f"Failed to prefetch PartialTrack [{track.title}] ({self.node.identifier}): {repr(e)}")
+                return
             traceback.print_exc()
             embed = disnake.Embed(
                 description=f"**Failed to retrieve PartialTrack information:\n[{track.title}]({track.uri or track.search_uri})** ```py\n{repr(e)}```\n"
@@ -2557,7 +3247,7 @@ class LavalinkPlayer(wavelink.Player):
 
     async def _wait_for_new_node(self, txt: str = None, ignore_node=None):
 
-        self.locked = True
+        self.waiting_node = True
 
         try:
             self.auto_skip_track_task.cancel()
@@ -2577,6 +3267,7 @@ class LavalinkPlayer(wavelink.Player):
 
             if self.node.is_available:
                 self._new_node_task = None
+                self.waiting_node = False
                 return
 
             nodes = sorted([n for n in self.bot.music.nodes.values() if n.is_available and n.identifier != ignore_node],
@@ -2589,7 +3280,7 @@ class LavalinkPlayer(wavelink.Player):
 
             try:
                 await self.change_node(node.identifier)
-                self.locked = False
+                self.waiting_node = False
             except:
                 traceback.print_exc()
                 await asyncio.sleep(5)
@@ -2608,7 +3299,7 @@ class LavalinkPlayer(wavelink.Player):
 
             try:
                 if self.auto_pause:
-                    self.auto_skip_track_task = self.bot.loop.create_task(self.auto_skip_track())
+                    self.start_auto_skip_track()
                 else:
                     await self.invoke_np(force=True)
             except:
@@ -2729,7 +3420,7 @@ class LavalinkPlayer(wavelink.Player):
                 track: Union[LavalinkTrack, PartialTrack] = self.current
 
                 stats["track"] = {
-                    "source": track.info["sourceName"],
+                    "source": track.source_name,
                     "thumb": track.thumb if len(track.thumb) < 257 else "",
                     "title": track.single_title,
                     "url": track.uri,
@@ -2779,36 +3470,44 @@ class LavalinkPlayer(wavelink.Player):
         except Exception:
             traceback.print_exc()
 
-    async def process_save_queue(self, create_task=True):
+    @property
+    def session_save_interval(self) -> int:
+        if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
+            return self.bot.config["PLAYER_INFO_BACKUP_INTERVAL_MONGO"]
+        return self.bot.config["PLAYER_INFO_BACKUP_INTERVAL"]
 
-        if self._session_resuming:
-            await asyncio.sleep(10)
-            self._session_resuming = False
-            return
+    # a sessão é gravada pelo bot.pool.session_saver alguns segundos após a última alteração.
+    def mark_dirty(self, delay: float = None):
+
+        self.state_version += 1
 
-        if self._queue_updater_task and self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
+        if self.is_closing or self.hibernating:
             return
 
-        cog = self.bot.get_cog("PlayerSession")
+        if self._session_resuming:
+            delay = 10
 
-        if not cog:
-            return
+        elif delay is None and self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
+            delay = 30
 
-        try:
-            self._queue_updater_task.cancel()
-        except:
-            pass
+        self.bot.pool.session_saver.mark_dirty(self, delay=delay)
+
+    async def process_save_queue(self):
 
-        await cog.save_info(self)
+        if self._session_resuming:
+            await asyncio.sleep(10)
+            self._session_resuming = False
 
-        if create_task:
-            self._queue_updater_task = self.bot.loop.create_task(cog.queue_updater_task(self))
+        self.mark_dirty(delay=1)
 
     async def track_end(self):
+        await self.mailbox.submit(EndTrack())
 
-        self.votes.clear()
+    async def finish_track(self):
 
-        self.locked = True
+        self.votes.clear()
+        self.mailbox.track_ended()
+        self.mark_dirty()
 
         await asyncio.sleep(0.5)
 
@@ -2823,7 +3522,7 @@ class LavalinkPlayer(wavelink.Player):
                 self.queue.insert(1, self.last_track)
                 self.is_previows_music = False
             elif self.last_track.track_loops:
-                self.last_track.info["extra"]["track_loops"] -= 1
+                self.last_track.track_loops -= 1
                 self.queue.insert(0, self.last_track)
             elif self.loop == "queue": # or self.keep_connected:
                 if self.is_previows_music:
@@ -2837,8 +3536,6 @@ class LavalinkPlayer(wavelink.Player):
         elif self.is_previows_music:
             self.is_previows_music = False
 
-        self.locked = False
-
     async def destroy(self, *, force: bool = False, inter: disnake.MessageInteraction = None):
         self.bot.loop.create_task(self.process_destroy(force=force, inter=inter))
 
@@ -2894,6 +3591,7 @@ class LavalinkPlayer(wavelink.Player):
         await self.update_filters()
 
     async def set_timescale(self, speed: float = 1.0, pitch: float = 1.0, rate: float = 1.0, enabled: bool = True):
+        self.mark_dirty()
         if enabled:
             return await self.set_filter(AudioFilter.timescale(speed=speed, pitch=pitch, rate=rate))
 
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from time import monotonic
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from utils.music.models import LavalinkPlayer
+
+
+class PlayerCommand:
+
+    name = "command"
+
+    __slots__ = ("future", "posted", "generation")
+
+    def __init__(self):
+        self.future: Optional[asyncio.Future] = None
+        self.posted = monotonic()
+        self.generation = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>"
+
+    def is_stale(self, player: LavalinkPlayer, mailbox: PlayerMailbox) -> bool:
+        return False
+
+    async def run(self, player: LavalinkPlayer):
+        raise NotImplementedError
+
+
+class PlayNext(PlayerCommand):
+
+    name = "play_next"
+
+    __slots__ = ("kwargs",)
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.kwargs = kwargs
+
+    # outra música começou a tocar enquanto o comando aguardava na fila (antes isso era ignorado pelo locked).
+    def is_stale(self, player: LavalinkPlayer, mailbox: PlayerMailbox) -> bool:
+        return self.generation != mailbox.generation and player.current is not None
+
+    async def run(self, player: LavalinkPlayer):
+        await player.play_next_track(**self.kwargs)
+
+
+class EndTrack(PlayerCommand):
+
+    name = "end_track"
+
+    async def run(self, player: LavalinkPlayer):
+        await player.finish_track()
+
+
+class TrackEvent(PlayerCommand):
+
+    __slots__ = ("event",)
+
+    def __init__(self, event):
+        super().__init__()
+        self.event = event
+
+    @property
+    def track_id(self) -> Optional[str]:
+        track = self.event.track
+        if isinstance(track, dict):
+            return track.get("encoded")
+        return track
+
+    # evento de uma música que não é mais a atual do player (ex: recebido durante o processamento da próxima música).
+    def is_stale(self, player: LavalinkPlayer, mailbox: PlayerMailbox) -> bool:
+        if self.generation == mailbox.generation:
+            return False
+        try:
+            return self.track_id is not None and player.last_track.id != self.track_id
+        except AttributeError:
+            return True
+
+
+class HandleTrackEnd(TrackEvent):
+
+    name = "track_end"
+
+    # a música atual já foi finalizada por outro comando (ex: skip) enquanto o evento aguardava na fila.
+    def is_stale(self, player: LavalinkPlayer, mailbox: PlayerMailbox) -> bool:
+        return mailbox.ended_generation == mailbox.generation or super().is_stale(player, mailbox)
+
+    async def run(self, player: LavalinkPlayer):
+        await player.on_track_end(self.event)
+
+
+class HandleTrackException(TrackEvent):
+
+    name = "track_exception"
+
+    def is_stale(self, player: LavalinkPlayer, mailbox: PlayerMailbox) -> bool:
+        return False
+
+    async def run(self, player: LavalinkPlayer):
+        # erros de músicas anteriores são apenas reportados.
+        await player.on_track_exception(self.event, stale=TrackEvent.is_stale(self, player, player.mailbox))
+
+
+class HandleTrackStuck(HandleTrackEnd):
+
+    name = "track_stuck"
+
+    async def run(self, player: LavalinkPlayer):
+        await player.on_track_stuck(self.event)
+
+
+class CommandStats:
+
+    __slots__ = ("count", "errors", "stale", "wait_total", "wait_max", "run_total", "run_max")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.stale = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "stale": self.stale,
+            "wait_avg": self.wait_total / self.count if self.count else 0,
+            "wait_max": self.wait_max,
+            "run_avg": self.run_total / self.count if self.count else 0,
+            "run_max": self.run_max,
+        }
+
+
+# Fila de comandos do player (modelo de ator): as transições de estado (próxima música, fim de música, erros do
+# lavalink etc) são executadas uma de cada vez por uma única task, na ordem em que chegaram, ao invés de serem
+# descartadas enquanto o player estava "locked". Comandos enviados de dentro da própria task do player são
+# executados diretamente (ex: process_next chamado durante o tratamento de um erro).
+class PlayerMailbox:
+
+    def __init__(self, player: LavalinkPlayer):
+        self.player = player
+        self.commands: deque[PlayerCommand] = deque()
+        self.current: Optional[PlayerCommand] = None
+        self.task: Optional[asyncio.Task] = None
+        self.generation = 0
+        self.ended_generation = -1
+        self.max_depth = 0
+        self.closed = False
+        self.metrics: dict[str, CommandStats] = {}
+
+    def __len__(self):
+        return self.depth
+
+    @property
+    def depth(self) -> int:
+        return len(self.commands) + (self.current is not None)
+
+    @property
+    def busy(self) -> bool:
+        return self.current is not None or bool(self.commands)
+
+    def in_actor(self) -> bool:
+        return self.task is not None and asyncio.current_task() is self.task
+
+    # chamado pelo player sempre que uma nova música é definida (comandos enviados antes disso ficam obsoletos).
+    def next_generation(self):
+        self.generation += 1
+
+    def track_ended(self):
+        self.ended_generation = self.generation
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "commands": {name: s.to_dict() for name, s in self.metrics.items()},
+        }
+
+    async def submit(self, command: PlayerCommand):
+
+        if self.closed:
+            return
+
+        if self.in_actor():
+            return await self.execute(command, inline=True)
+
+        return await self.post(command)
+
+    def post(self, command: PlayerCommand) -> asyncio.Future:
+
+        loop = asyncio.get_event_loop()
+
+        command.future = loop.create_future()
+        command.generation = self.generation
+
+        if self.closed:
+            command.future.set_result(None)
+            return command.future
+
+        self.commands.append(command)
+        self.max_depth = max(self.max_depth, self.depth)
+
+        if not self.task or self.task.done():
+            self.task = loop.create_task(self.run())
+
+        return command.future
+
+    async def execute(self, command: PlayerCommand, inline: bool = False):
+
+        try:
+            stats = self.metrics[command.name]
+        except KeyError:
+            stats = self.metrics[command.name] = CommandStats()
+
+        if not inline and command.is_stale(self.player, self):
+            stats.stale += 1
+            return
+
+        start = monotonic()
+        wait = start - command.posted
+
+        stats.count += 1
+        stats.wait_total += wait
+        stats.wait_max = max(stats.wait_max, wait)
+
+        try:
+            return await command.run(self.player)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = monotonic() - start
+            stats.run_total += elapsed
+            stats.run_max = max(stats.run_max, elapsed)
+
+    async def run(self):
+
+        while self.commands and not self.closed:
+
+            command = self.commands.popleft()
+            self.current = command
+
+            try:
+                result = await self.execute(command)
+            except asyncio.CancelledError:
+                if not command.future.done():
+                    command.future.cancel()
+                raise
+            except Exception as e:
+                if not command.future.done():
+                    command.future.set_exception(e)
+            else:
+                if not command.future.done():
+                    command.future.set_result(result)
+            finally:
+                self.current = None
+
+    # o comando em execução termina normalmente (os métodos do player já verificam o is_closing), os que ainda
+    # estavam na fila são descartados.
+    def close(self):
+
+        self.closed = True
+
+        while self.commands:
+            command = self.commands.popleft()
+            if not command.future.done():
+                command.future.set_result(None)
@@ -0,0 +1,1033 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import copyreg
+import io
+import os
+import pickle
+import random
+import sqlite3
+import traceback
+import zlib
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain, count, islice
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+
+# contador compartilhado por todas as filas: a mesma versão nunca se repete entre filas diferentes.
+queue_versions = count(1)
+
+
+# Fila compatível com deque: os itens ficam divididos em blocos e uma árvore de fenwick guarda o tamanho
+# acumulado dos blocos (inserir/remover/acessar qualquer posição custa O(log n) + tamanho do bloco).
+# O unique_id das músicas também é indexado para localizar/remover uma música sem percorrer a fila inteira.
+# Com um spill store configurado os blocos após a janela inicial podem ser movidos pro disco (ver spill()): o bloco
+# fica preenchido com None e é carregado novamente ao ser alterado/acessado por índice. Ao percorrer a fila os blocos
+# que estão no disco são apenas lidos (os itens retornados desses blocos são cópias).
+class PlayerQueue:
+
+    __slots__ = ('_chunks', '_tree', '_positions', '_len', '_maxlen', '_load', '_ids', '_chunk_of', '_listeners',
+                 '_muted', '_store', '_spilled', '_version')
+
+    def __init__(self, iterable: Iterable = (), maxlen: Optional[int] = None, load: int = 256):
+        self._chunks: list[list] = []
+        self._tree: Optional[list[int]] = None
+        self._positions: dict[int, int] = {}
+        self._len = 0
+        self._maxlen = maxlen
+        self._load = load
+        self._ids: Counter = Counter()
+        self._chunk_of: dict[str, list] = {}
+        self._listeners: list[Callable[[str, list], None]] = []
+        self._muted = False
+        self._store: Optional[QueueSpillStore] = None
+        self._spilled: dict[int, tuple[int, tuple]] = {}
+        self._version = 0
+        if iterable:
+            self.extend(iterable)
+
+    def __repr__(self):
+        return f"PlayerQueue({list(self)!r}" + (f", maxlen={self._maxlen})" if self._maxlen is not None else ")")
+
+    @property
+    def maxlen(self) -> Optional[int]:
+        return self._maxlen
+
+    # muda sempre que a fila é alterada (0 = fila vazia sem alterações).
+    @property
+    def version(self) -> int:
+        return self._version
+
+    # callback(event, items) com os eventos: "add", "remove" e "reorder" (a fila foi reordenada sem adicionar/remover itens).
+    def add_listener(self, callback: Callable[[str, list], None]):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, list], None]):
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def _notify(self, event: str, items: list):
+        if self._muted:
+            return
+        for callback in self._listeners:
+            try:
+                callback(event, items)
+            except Exception:
+                traceback.print_exc()
+
+    ##########################
+    ##### Spill (disco) ######
+    ##########################
+
+    @property
+    def spilled(self) -> int:
+        return sum(len(uids) for key, uids in self._spilled.values())
+
+    def set_spill_store(self, store: Optional[QueueSpillStore]):
+        if store is self._store:
+            return
+        for chunk in self._chunks:
+            self._page_in(chunk)
+        if self._store:
+            self._store.close()
+        self._store = store
+
+    def _page_in(self, chunk: list) -> list:
+        if self._spilled:
+            try:
+                key, uids = self._spilled.pop(id(chunk))
+            except KeyError:
+                return chunk
+            chunk[:] = self._store.get(key)
+        return chunk
+
+    def spill(self, window: int, limit: Optional[int] = None) -> int:
+
+        if not self._store or self._len <= window + self._load:
+            return 0
+
+        chunks = []
+        offset = 0
+
+        # o último bloco é mantido na memória (é onde as próximas músicas serão adicionadas).
+        for chunk in islice(self._chunks, len(self._chunks) - 1):
+            if offset >= window and id(chunk) not in self._spilled:
+                chunks.append(chunk)
+                if limit and len(chunks) >= limit:
+                    break
+            offset += len(chunk)
+
+        if not chunks:
+            return 0
+
+        if self._listeners:
+            self._notify("spill", list(chain.from_iterable(chunks)))
+
+        amount = 0
+
+        for chunk in chunks:
+            uids = tuple(getattr(t, "unique_id", None) for t in chunk)
+            self._spilled[id(chunk)] = (self._store.put(chunk), uids)
+            amount += len(chunk)
+            chunk[:] = [None] * len(chunk)
+
+        return amount
+
+    # Somente leitura: os blocos que estão no disco são lidos sem serem carregados novamente na fila
+    # (os itens retornados desses blocos são cópias, ex: pra salvar a sessão do player).
+    def _read_chunk(self, chunk: list) -> list:
+        if self._spilled:
+            try:
+                key, uids = self._spilled[id(chunk)]
+            except KeyError:
+                return chunk
+            return self._store.peek(key)
+        return chunk
+
+    def iter_snapshot(self) -> Iterator:
+        return chain.from_iterable(map(self._read_chunk, self._chunks))
+
+    ##########################
+    #### Índices internos ####
+    ##########################
+
+    def _build_tree(self):
+        size = len(self._chunks)
+        tree = [0] * (size + 1)
+        for i, chunk in enumerate(self._chunks, start=1):
+            tree[i] += len(chunk)
+            if (j := i + (i & -i)) <= size:
+                tree[j] += tree[i]
+        self._tree = tree
+        self._positions = {id(c): i for i, c in enumerate(self._chunks)}
+
+    def _tree_update(self, chunk_index: int, delta: int):
+        if self._tree is None:
+            return
+        i = chunk_index + 1
+        size = len(self._tree) - 1
+        while i <= size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _chunk_offset(self, chunk_index: int) -> int:
+        if self._tree is None:
+            self._build_tree()
+        total = 0
+        i = chunk_index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        if self._tree is None:
+            self._build_tree()
+        size = len(self._tree) - 1
+        pos = 0
+        bit = 1 << (size.bit_length() - 1) if size else 0
+        while bit:
+            nxt = pos + bit
+            if nxt <= size and self._tree[nxt] <= index:
+                pos = nxt
+                index -= self._tree[nxt]
+            bit >>= 1
+        return pos, index
+
+    def _normalize_index(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("queue index out of range")
+        return index
+
+    def _added(self, items: Union[list, tuple], chunk: list):
+        self._version = next(queue_versions)
+        for t in items:
+            uid = getattr(t, "unique_id", None)
+            if uid is None:
+                continue
+            self._ids[uid] += 1
+            self._chunk_of[uid] = chunk
+        if self._listeners:
+            self._notify("add", list(items))
+
+    def _removed(self, items: Union[list, tuple]):
+        self._version = next(queue_versions)
+        for t in items:
+            uid = getattr(t, "unique_id", None)
+            if uid is None:
+                continue
+            if self._ids[uid] > 1:
+                self._ids[uid] -= 1
+            else:
+                del self._ids[uid]
+                self._chunk_of.pop(uid, None)
+        if self._listeners:
+            self._notify("remove", list(items))
+
+    def _reordered(self):
+        self._muted = False
+        self._version = next(queue_versions)
+        if self._listeners:
+            self._notify("reorder", [])
+
+    def _split(self, chunk_index: int):
+        chunk = self._chunks[chunk_index]
+        if len(chunk) <= self._load * 2:
+            return
+        half = chunk[self._load:]
+        del chunk[self._load:]
+        self._chunks.insert(chunk_index + 1, half)
+        for t in half:
+            try:
+                self._chunk_of[t.unique_id] = half
+            except AttributeError:
+                continue
+        self._tree = None
+
+    def _drop_if_empty(self, chunk_index: int):
+        if not self._chunks[chunk_index]:
+            del self._chunks[chunk_index]
+            self._tree = None
+
+    def _find_chunk(self, uid: str) -> Optional[tuple[int, int]]:
+        chunk = self._chunk_of.get(uid)
+
+        if chunk is not None:
+            if self._tree is None:
+                self._build_tree()
+            chunk_index = self._positions.get(id(chunk))
+            if chunk_index is not None and self._chunks[chunk_index] is chunk:
+                if (offset := self._offset_of(chunk, uid)) is not None:
+                    return chunk_index, offset
+
+        # índice desatualizado (ex: itens duplicados na fila), procurando manualmente.
+        for chunk_index, c in enumerate(self._chunks):
+            if (offset := self._offset_of(c, uid)) is not None:
+                self._chunk_of[uid] = c
+                return chunk_index, offset
+
+    def _offset_of(self, chunk: list, uid: str) -> Optional[int]:
+        try:
+            uids = self._spilled[id(chunk)][1]
+        except KeyError:
+            for offset, t in enumerate(chunk):
+                if getattr(t, "unique_id", None) == uid:
+                    return offset
+        else:
+            try:
+                return uids.index(uid)
+            except ValueError:
+                pass
+
+    def _trim(self, left: bool):
+        if self._maxlen is None:
+            return
+        while self._len > self._maxlen:
+            if left:
+                self.popleft()
+            else:
+                self.pop()
+
+    ##########################
+    ### Interface do deque ###
+    ##########################
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self) -> Iterator:
+        return self.iter_snapshot()
+
+    def __reversed__(self) -> Iterator:
+        return chain.from_iterable(reversed(self._read_chunk(c)) for c in reversed(self._chunks))
+
+    def iter_from(self, index: int) -> Iterator:
+        if index >= self._len:
+            return iter(())
+        chunk_index, offset = self._locate(max(0, index))
+        return chain(islice(self._read_chunk(self._chunks[chunk_index]), offset, None),
+                     chain.from_iterable(map(self._read_chunk, islice(self._chunks, chunk_index + 1, None))))
+
+    def __contains__(self, item) -> bool:
+
+        uid = getattr(item, "unique_id", None)
+
+        if uid is not None:
+            if not self._ids.get(uid):
+                return False
+            if (chunk := self._chunk_of.get(uid)) is not None and any(t is item for t in chunk):
+                return True
+
+        return any(t is item or t == item for t in self)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __add__(self, other) -> list:
+        return [*self, *other]
+
+    def __radd__(self, other) -> list:
+        return [*other, *self]
+
+    def __getitem__(self, index: Union[int, slice]):
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                return list(islice(self.iter_from(start), max(0, stop - start)))
+            return list(self)[index]
+
+        chunk_index, offset = self._locate(self._normalize_index(index))
+        return self._page_in(self._chunks[chunk_index])[offset]
+
+    def __setitem__(self, index: int, value):
+        chunk_index, offset = self._locate(self._normalize_index(index))
+        chunk = self._page_in(self._chunks[chunk_index])
+        self._removed((chunk[offset],))
+        chunk[offset] = value
+        self._added((value,), chunk)
+
+    def __delitem__(self, index: Union[int, slice]):
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                items = list(self)
+                del items[index]
+                self.clear()
+                self.extend(items)
+                return
+            self.pop_slice(start, stop)
+            return
+
+        self.pop(index)
+
+    def append(self, item):
+        if not self._chunks:
+            self._chunks.append([])
+            self._tree = None
+        chunk = self._page_in(self._chunks[-1])
+        chunk.append(item)
+        self._len += 1
+        self._tree_update(len(self._chunks) - 1, 1)
+        self._added((item,), chunk)
+        self._split(len(self._chunks) - 1)
+        self._trim(left=True)
+
+    def appendleft(self, item):
+        if not self._len:
+            self.append(item)
+            return
+        self._insert(0, item)
+        self._trim(left=False)
+
+    def extend(self, iterable: Iterable):
+        items = list(iterable)
+        if not items:
+            return
+        if self._chunks and len(self._chunks[-1]) < self._load:
+            chunk = self._page_in(self._chunks[-1])
+            free = self._load - len(chunk)
+            head, items = items[:free], items[free:]
+            chunk.extend(head)
+            self._len += len(head)
+            self._tree_update(len(self._chunks) - 1, len(head))
+            self._added(head, chunk)
+        for i in range(0, len(items), self._load):
+            chunk = items[i:i + self._load]
+            self._chunks.append(chunk)
+            self._len += len(chunk)
+            self._added(chunk, chunk)
+            self._tree = None
+        self._trim(left=True)
+
+    def extendleft(self, iterable: Iterable):
+        self.insert_many(0, reversed(list(iterable)))
+
+    def insert(self, index: int, item):
+
+        if index < 0:
+            index = max(0, index + self._len)
+
+        if self._maxlen is not None and self._len >= self._maxlen:
+            raise IndexError("deque already at its maximum size")
+
+        if index >= self._len:
+            self.append(item)
+            return
+
+        self._insert(index, item)
+
+    def _insert(self, index: int, item):
+        chunk_index, offset = self._locate(index)
+        chunk = self._page_in(self._chunks[chunk_index])
+        chunk.insert(offset, item)
+        self._len += 1
+        self._tree_update(chunk_index, 1)
+        self._added((item,), chunk)
+        self._split(chunk_index)
+
+    def insert_many(self, index: int, iterable: Iterable):
+
+        items = list(iterable)
+
+        if not items:
+            return
+
+        if index < 0:
+            index = max(0, index + self._len)
+
+        if index >= self._len:
+            self.extend(items)
+            return
+
+        chunk_index, offset = self._locate(index)
+        chunk = self._page_in(self._chunks[chunk_index])
+        tail = chunk[offset:]
+        del chunk[offset:]
+        new_chunks = [items[i:i + self._load] for i in range(0, len(items), self._load)]
+        if tail:
+            new_chunks.append(tail)
+        self._chunks[chunk_index + 1:chunk_index + 1] = new_chunks
+        self._len += len(items)
+        self._drop_if_empty(chunk_index)
+        self._tree = None
+        # os índices já estão atualizados ao notificar os listeners (ex: posição dos itens adicionados).
+        for c in new_chunks:
+            if c is not tail:
+                self._added(c, c)
+                continue
+            for t in tail:
+                try:
+                    self._chunk_of[t.unique_id] = tail
+                except AttributeError:
+                    continue
+        self._trim(left=False)
+
+    def pop(self, index: int = -1):
+        chunk_index, offset = self._locate(self._normalize_index(index))
+        chunk = self._page_in(self._chunks[chunk_index])
+        item = chunk.pop(offset)
+        self._len -= 1
+        self._tree_update(chunk_index, -1)
+        self._drop_if_empty(chunk_index)
+        self._removed((item,))
+        return item
+
+    def popleft(self):
+        if not self._len:
+            raise IndexError("pop from an empty deque")
+        return self.pop(0)
+
+    def pop_slice(self, start: int, stop: int) -> list:
+
+        start = max(0, start)
+        stop = min(self._len, stop)
+
+        if start >= stop:
+            return []
+
+        items = self[start:stop]
+
+        first_chunk, first_offset = self._locate(start)
+        remaining = stop - start
+        chunk_index = first_chunk
+        offset = first_offset
+
+        while remaining:
+            chunk = self._page_in(self._chunks[chunk_index])
+            taken = min(len(chunk) - offset, remaining)
+            del chunk[offset:offset + taken]
+            remaining -= taken
+            chunk_index += 1
+            offset = 0
+
+        self._chunks = [c for c in self._chunks if c]
+        self._tree = None
+        self._len -= len(items)
+        self._removed(items)
+        return items
+
+    def remove(self, item):
+
+        try:
+            uid = item.unique_id
+        except AttributeError:
+            uid = None
+
+        if uid is not None and (found := self._find_chunk(uid)):
+            chunk_index, offset = found
+            chunk = self._page_in(self._chunks[chunk_index])
+            if chunk[offset] is not item and self._ids[uid] > 1:
+                # outro item com o mesmo unique_id, procurando pelo objeto correto (caso não seja encontrado o item
+                # da fila é uma cópia carregada do disco e o primeiro com o mesmo unique_id será removido).
+                for n, c in enumerate(self._chunks):
+                    if id(c) in self._spilled:
+                        continue
+                    try:
+                        offset = next(i for i, t in enumerate(c) if t is item)
+                    except StopIteration:
+                        continue
+                    chunk_index, chunk = n, c
+                    break
+            item = chunk[offset]
+            del chunk[offset]
+            self._len -= 1
+            self._tree_update(chunk_index, -1)
+            self._drop_if_empty(chunk_index)
+            self._removed((item,))
+            return
+
+        del self[self.index(item)]
+
+    def remove_by_id(self, unique_id: str):
+        if not (found := self._find_chunk(unique_id)):
+            raise KeyError(unique_id)
+        chunk_index, offset = found
+        return self.pop(self._chunk_offset(chunk_index) + offset)
+
+    def get_by_id(self, unique_id: str):
+        if not self._ids.get(unique_id):
+            return
+        if found := self._find_chunk(unique_id):
+            chunk_index, offset = found
+            return self._page_in(self._chunks[chunk_index])[offset]
+
+    def index_by_id(self, unique_id: str) -> int:
+        if not self._ids.get(unique_id) or not (found := self._find_chunk(unique_id)):
+            raise ValueError(f"{unique_id} is not in queue")
+        chunk_index, offset = found
+        return self._chunk_offset(chunk_index) + offset
+
+    def index(self, item, start: int = 0, stop: Optional[int] = None) -> int:
+
+        try:
+            index = self.index_by_id(item.unique_id)
+        except (AttributeError, ValueError):
+            pass
+        else:
+            if self[index] is item and start <= index < (self._len if stop is None else stop):
+                return index
+
+        for n, t in enumerate(islice(self.iter_from(start), None if stop is None else max(0, stop - start)), start=start):
+            if t is item or t == item:
+                return n
+
+        raise ValueError(f"{item!r} is not in queue")
+
+    def count(self, item) -> int:
+        return sum(1 for t in self if t is item or t == item)
+
+    def move(self, index: int, new_index: int):
+        self._muted = True
+        try:
+            item = self.pop(index)
+            self.insert(new_index, item)
+        finally:
+            self._reordered()
+        return item
+
+    def rotate(self, n: int = 1):
+
+        if not self._len:
+            return
+
+        n %= self._len
+
+        if not n:
+            return
+
+        self._muted = True
+
+        try:
+            if n > self._len // 2:
+                self.extend(self.pop_slice(0, self._len - n))
+            else:
+                self.insert_many(0, self.pop_slice(self._len - n, self._len))
+        finally:
+            self._reordered()
+
+    def _replace_items(self, items: list):
+        self._muted = True
+        try:
+            self.clear()
+            self.extend(items)
+        finally:
+            self._reordered()
+
+    def reverse(self):
+        items = list(self)
+        items.reverse()
+        self._replace_items(items)
+
+    def shuffle(self):
+        items = list(self)
+        random.shuffle(items)
+        self._replace_items(items)
+
+    def clear(self):
+        self._version = next(queue_versions) if self._len else self._version
+        if self._listeners and not self._muted and self._len:
+            self._notify("remove", list(self.iter_snapshot()))
+        if self._spilled:
+            self._spilled.clear()
+            self._store.clear()
+        self._chunks.clear()
+        self._tree = None
+        self._len = 0
+        self._ids.clear()
+        self._chunk_of.clear()
+
+    def copy(self) -> PlayerQueue:
+        return PlayerQueue(self, maxlen=self._maxlen, load=self._load)
+
+
+# Armazenamento em disco (sqlite) dos blocos da fila que foram movidos pelo PlayerQueue.spill().
+# Objetos dos tipos em shared_types (ex: playlists) não são copiados pro disco, apenas referenciados.
+class QueueSpillStore:
+
+    stores: dict[int, QueueSpillStore] = {}
+
+    def __init__(self, path: str, shared_types: tuple = ()):
+        self.path = path
+        self.shared: dict[int, object] = {}
+        self.dispatch_table = copyreg.dispatch_table.copy()
+        for cls in shared_types:
+            self.dispatch_table[cls] = self.reduce_shared
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def connect(self) -> sqlite3.Connection:
+        if not self.conn:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.conn = sqlite3.connect(self.path, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=OFF")
+            self.conn.execute("PRAGMA synchronous=OFF")
+            self.conn.execute("DROP TABLE IF EXISTS chunks")
+            self.conn.execute("CREATE TABLE chunks (id INTEGER PRIMARY KEY AUTOINCREMENT, data BLOB NOT NULL)")
+            self.stores[id(self)] = self
+        return self.conn
+
+    def reduce_shared(self, obj):
+        self.shared[id(obj)] = obj
+        return load_shared, (id(self), id(obj))
+
+    def dumps(self, items: list) -> bytes:
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.dispatch_table = self.dispatch_table
+        pickler.dump(items)
+        return zlib.compress(buffer.getvalue(), 1)
+
+    def loads(self, data: bytes) -> list:
+        return pickle.loads(zlib.decompress(data))
+
+    def put(self, items: list) -> int:
+        return self.connect().execute("INSERT INTO chunks (data) VALUES (?)", (self.dumps(items),)).lastrowid
+
+    def peek(self, key: int) -> list:
+        return self.loads(self.connect().execute("SELECT data FROM chunks WHERE id = ?", (key,)).fetchone()[0])
+
+    def get(self, key: int) -> list:
+        items = self.peek(key)
+        self.conn.execute("DELETE FROM chunks WHERE id = ?", (key,))
+        return items
+
+    def clear(self):
+        self.shared.clear()
+        if self.conn:
+            self.conn.execute("DELETE FROM chunks")
+
+    def close(self):
+        self.shared.clear()
+        if not self.conn:
+            return
+        self.stores.pop(id(self), None)
+        self.conn.close()
+        self.conn = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def load_shared(store_id: int, obj_id: int):
+    return QueueSpillStore.stores[store_id].shared[obj_id]
+
+
+def tokenize_title(text: str) -> list[str]:
+    return text.replace("️", "").lower().split()
+
+
+# Totais da fila (duração, lives, músicas por membro e por playlist) atualizados a cada alteração da fila,
+# evitando percorrer a fila inteira nos comandos e skins.
+# A duração somada de cada música é guardada pelo unique_id (a duração das PartialTracks pode mudar ao serem
+# processadas enquanto estão na fila).
+class QueueStats:
+
+    def __init__(self, queue: PlayerQueue):
+        self.queue = queue
+        self.duration = 0
+        self.streams = 0
+        self.requesters: Counter = Counter()
+        self.playlists: Counter = Counter()
+        self.durations: dict[str, list[int]] = {}
+        queue.add_listener(self.queue_event)
+        if queue:
+            self.queue_event("add", list(queue))
+
+    def queue_event(self, event: str, items: list):
+
+        if event == "add":
+            for t in items:
+                self.add(t)
+
+        elif event == "remove":
+            for t in items:
+                self.remove(t)
+
+    def add(self, track):
+
+        if track.is_stream:
+            self.streams += 1
+        else:
+            try:
+                self.durations[track.unique_id][1] += 1
+                self.duration += self.durations[track.unique_id][0]
+            except KeyError:
+                duration = track.duration or 0
+                self.durations[track.unique_id] = [duration, 1]
+                self.duration += duration
+
+        self.requesters[track.requester] += 1
+
+        if url := track.playlist_url:
+            self.playlists[url] += 1
+
+    def remove(self, track):
+
+        if track.is_stream:
+            self.streams -= 1
+        else:
+            try:
+                entry = self.durations[track.unique_id]
+            except KeyError:
+                pass
+            else:
+                self.duration -= entry[0]
+                if entry[1] > 1:
+                    entry[1] -= 1
+                else:
+                    del self.durations[track.unique_id]
+
+        if self.requesters[track.requester] > 1:
+            self.requesters[track.requester] -= 1
+        else:
+            self.requesters.pop(track.requester, None)
+
+        if url := track.playlist_url:
+            if self.playlists[url] > 1:
+                self.playlists[url] -= 1
+            else:
+                self.playlists.pop(url, None)
+
+
+# Índice invertido (palavra -> unique_ids) mantido a cada alteração da fila, usado no autocomplete e na busca
+# de músicas por nome (evitando percorrer/copiar a fila inteira a cada tecla digitada).
+# As músicas adicionadas só são indexadas na próxima busca (evitando processar playlists grandes ao adicioná-las).
+class QueueSearchIndex:
+
+    def __init__(self, queue: PlayerQueue):
+        self.queue = queue
+        self.postings: dict[str, set[str]] = {}
+        self.track_tokens: dict[str, tuple[str, ...]] = {}
+        self.refs: Counter = Counter()
+        self.authors: Counter = Counter()
+        self.playlists: Counter = Counter()
+        self._sorted_tokens: Optional[list[str]] = None
+        self.pending: dict[int, list] = {}
+        queue.add_listener(self.queue_event)
+        if queue:
+            self.queue_event("add", list(queue))
+
+    def queue_event(self, event: str, items: list):
+
+        if event == "add":
+            for t in items:
+                try:
+                    self.pending[id(t)][1] += 1
+                except KeyError:
+                    self.pending[id(t)] = [t, 1]
+
+        elif event == "spill":
+            # as músicas que vão pro disco precisam ser indexadas agora (a referência pendente impediria liberá-las).
+            for t in items:
+                try:
+                    track, amount = self.pending.pop(id(t))
+                except KeyError:
+                    continue
+                for _ in range(amount):
+                    self.add(track)
+
+        elif event == "remove":
+            for t in items:
+                try:
+                    pending = self.pending[id(t)]
+                except KeyError:
+                    self.remove(t)
+                    continue
+                if pending[1] > 1:
+                    pending[1] -= 1
+                else:
+                    del self.pending[id(t)]
+
+    def flush(self):
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        for t, amount in pending.values():
+            for _ in range(amount):
+                self.add(t)
+
+    def add(self, track):
+
+        uid = track.unique_id
+
+        self.refs[uid] += 1
+
+        if self.refs[uid] == 1:
+
+            tokens = tuple(set(tokenize_title(track.title)))
+            self.track_tokens[uid] = tokens
+
+            for token in tokens:
+                try:
+                    self.postings[token].add(uid)
+                except KeyError:
+                    self.postings[token] = {uid}
+                    self._sorted_tokens = None
+
+        if track.authors_string:
+            self.authors[track.authors_string] += 1
+
+        if track.playlist_name:
+            self.playlists[track.playlist_name] += 1
+
+    def remove(self, track):
+
+        uid = track.unique_id
+
+        if self.refs[uid] > 1:
+            self.refs[uid] -= 1
+
+        else:
+
+            self.refs.pop(uid, None)
+
+            for token in self.track_tokens.pop(uid, ()):
+                try:
+                    uids = self.postings[token]
+                except KeyError:
+                    continue
+                uids.discard(uid)
+                if not uids:
+                    del self.postings[token]
+                    self._sorted_tokens = None
+
+        for counter, key in ((self.authors, track.authors_string), (self.playlists, track.playlist_name)):
+            if not key:
+                continue
+            if counter[key] > 1:
+                counter[key] -= 1
+            else:
+                counter.pop(key, None)
+
+    @property
+    def sorted_tokens(self) -> list[str]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.postings)
+        return self._sorted_tokens
+
+    def prefix_matches(self, word: str) -> set[str]:
+
+        tokens = self.sorted_tokens
+        uids = set()
+
+        for i in range(bisect_left(tokens, word), len(tokens)):
+            if not tokens[i].startswith(word):
+                break
+            uids.update(self.postings[tokens[i]])
+
+        return uids
+
+    def substring_matches(self, word: str) -> set[str]:
+        uids = set()
+        for token, token_uids in self.postings.items():
+            if word in token:
+                uids.update(token_uids)
+        return uids
+
+    def candidates(self, words: list[str], exact: bool = False, substring: bool = False) -> set[str]:
+
+        self.flush()
+
+        result = None
+
+        for word in sorted(set(words), key=len, reverse=True):
+
+            if exact:
+                uids = self.postings.get(word, set())
+            elif substring:
+                uids = self.substring_matches(word)
+            else:
+                uids = self.prefix_matches(word)
+
+            result = set(uids) if result is None else result & uids
+
+            if not result:
+                return set()
+
+        return result or set()
+
+    def ordered(self, uids: set[str], limit: Optional[int] = None, check: Callable = None) -> list[tuple[int, object]]:
+
+        if not uids:
+            return []
+
+        results = []
+
+        # poucos resultados: localizar cada um pelo índice de unique_id, senão é mais barato percorrer a fila.
+        if len(uids) * 64 < len(self.queue):
+            for uid in uids:
+                try:
+                    index = self.queue.index_by_id(uid)
+                except ValueError:
+                    continue
+                track = self.queue[index]
+                if not check or check(track):
+                    results.append((index, track))
+            results.sort(key=lambda r: r[0])
+            return results[:limit] if limit else results
+
+        for index, track in enumerate(self.queue):
+            if track.unique_id in uids and (not check or check(track)):
+                results.append((index, track))
+                if limit and len(results) >= limit:
+                    break
+
+        return results
+
+    def search(self, query: str, limit: Optional[int] = None, exact: bool = False) -> list[tuple[int, object]]:
+
+        words = tokenize_title(query)
+
+        if not words:
+            return list(enumerate(islice(self.queue, limit)))
+
+        if exact:
+            return self.ordered(self.candidates(words, exact=True), limit,
+                                check=lambda t: tokenize_title(t.title)[:len(words)] == words)
+
+        results = self.ordered(self.candidates(words), limit, check=lambda t: match_words(t.title, words, prefix=True))
+
+        # os resultados por prefixo vêm primeiro e as buscas no meio das palavras só completam o limite.
+        if not limit or len(results) < limit:
+            found = {r[1].unique_id for r in results}
+            if extra := self.candidates(words, substring=True) - found:
+                results.extend(self.ordered(extra, limit - len(results) if limit else None,
+                                            check=lambda t: match_words(t.title, words)))
+
+        return results
+
+    def search_authors(self, query: str = "", limit: int = 20) -> list[str]:
+        self.flush()
+        query = query.lower()
+        return list(islice((a for a in self.authors if query in a.lower()), limit))
+
+    def search_playlists(self, query: str = "", limit: int = 20) -> list[str]:
+        self.flush()
+        query = query.lower()
+        return list(islice((p for p in self.playlists if query in p.lower()), limit))
+
+
+def match_words(title: str, words: list[str], prefix: bool = False) -> bool:
+
+    title_words = tokenize_title(title)
+
+    for word in words:
+        for title_word in title_words:
+            if (title_word.startswith(word) if prefix else word in title_word):
+                title_words.remove(title_word)
+                break
+        else:
+            return False
+
+    return True
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import traceback
+from collections import Counter
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+    from wavelink import Node
+
+
+class ResumeJob:
+
+    __slots__ = ("guild_id", "data", "shard_id", "priority", "gateway")
+
+    def __init__(self, guild_id: int, data: dict, shard_id: int, priority: tuple, gateway: bool):
+        self.guild_id = guild_id
+        self.data = data
+        self.shard_id = shard_id
+        self.priority = priority
+        self.gateway = gateway
+
+
+class ShardBucket:
+
+    __slots__ = ("rate", "capacity", "tokens", "last_refill")
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_refill = monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def wait_time(self) -> float:
+        return max((1 - self.tokens) / self.rate, 0)
+
+
+# Restaura as sessões dos players ao iniciar o bot com várias restaurações em paralelo (ao invés de uma por segundo).
+# As conexões nos canais de voz respeitam um limite por shard (os voice state updates contam no limite de comandos
+# do gateway do discord: 120 a cada 60 segundos por shard) e cada node recebe um número limitado de restaurações
+# simultâneas (as novas vão pro node com menos players + restaurações em andamento).
+# Servidores com membros no canal de voz são restaurados primeiro e os que não precisam conectar no canal de voz
+# (ex: servidor/canal não existe mais) não consomem o limite do gateway.
+# As sessões podem ser adicionadas enquanto as restaurações estão em andamento (ex: conforme são carregadas do
+# banco de dados) até o close() ser chamado.
+class PlayerResumeScheduler:
+
+    def __init__(self, bot: BotCore, resume: Callable[[dict, Optional[Node]], Awaitable[bool]], concurrency: int = 10,
+                 node_concurrency: int = 4, voice_rate: int = 90, progress_interval: float = 10):
+        self.bot = bot
+        self.resume = resume
+        self.concurrency = max(concurrency, 1)
+        self.node_concurrency = max(node_concurrency, 1)
+        self.voice_rate = max(voice_rate, 1) / 60
+        self.voice_burst = max(min(voice_rate // 6, 20), 1)
+        self.progress_interval = progress_interval
+        self.jobs: dict[int, list[tuple[tuple, int, ResumeJob]]] = {}
+        self.counter = count()
+        self.feeding = True
+        self.buckets: dict[int, ShardBucket] = {}
+        self.running: dict[int, asyncio.Task] = {}
+        self.node_running: Counter = Counter()
+        self.wakeup = asyncio.Event()
+        self.total = 0
+        self.counts: Counter = Counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.last_progress = 0.0
+
+    def listeners(self, data: dict) -> int:
+        try:
+            channel = self.bot.get_channel(data["voice_channel"])
+            return sum(1 for m in channel.members if not m.bot and not (m.voice.deaf or m.voice.self_deaf))
+        except AttributeError:
+            return 0
+
+    def create_job(self, data: dict) -> ResumeJob:
+
+        guild_id = int(data["_id"])
+        guild = self.bot.get_guild(guild_id)
+
+        if not guild or not self.bot.get_channel(data["voice_channel"]):
+            return ResumeJob(guild_id, data, 0, (0,), gateway=False)
+
+        listeners = self.listeners(data)
+
+        try:
+            time = -data["time"].timestamp()
+        except (KeyError, AttributeError):
+            time = 0
+
+        return ResumeJob(guild_id, data, guild.shard_id, (1 if listeners else 2, -listeners, time), gateway=True)
+
+    def add(self, sessions: list[dict]):
+
+        for d in sessions:
+            job = self.create_job(d)
+            heappush(self.jobs.setdefault(job.shard_id if job.gateway else -1, []),
+                     (job.priority, next(self.counter), job))
+            self.total += 1
+
+        self.wakeup.set()
+
+    def close(self):
+        self.feeding = False
+        self.wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        return sum(len(j) for j in self.jobs.values())
+
+    def stats(self) -> dict:
+        elapsed = ((self.finished_at or monotonic()) - self.started_at) if self.started_at else 0
+        done = self.counts["resumed"] + self.counts["skipped"] + self.counts["failed"]
+        return {
+            "total": self.total,
+            "pending": self.pending,
+            "running": len(self.running),
+            "resumed": self.counts["resumed"],
+            "skipped": self.counts["skipped"],
+            "failed": self.counts["failed"],
+            "elapsed": elapsed,
+            "per_minute": done / elapsed * 60 if elapsed else 0,
+            "nodes": dict(self.node_running),
+        }
+
+    def print_progress(self, force: bool = False):
+        now = monotonic()
+        if not force and now - self.last_progress < self.progress_interval:
+            return
+        self.last_progress = now
+        s = self.stats()
+        print(f"{self.bot.user} - Resuming players: {s['resumed'] + s['skipped'] + s['failed']}/{s['total']} "
+              f"(resumed: {s['resumed']} | skipped: {s['skipped']} | failed: {s['failed']} | running: {s['running']}) "
+              f"- {s['elapsed']:.0f}s ({s['per_minute']:.1f}/min)")
+
+    def bucket(self, shard_id: int) -> ShardBucket:
+        try:
+            return self.buckets[shard_id]
+        except KeyError:
+            bucket = self.buckets[shard_id] = ShardBucket(self.voice_rate, self.voice_burst)
+            return bucket
+
+    def available_nodes(self) -> list:
+        return [n for n in self.bot.music.nodes.values() if n.available and n.is_available]
+
+    def select_node(self, nodes: list) -> Optional[Node]:
+        nodes = [n for n in nodes if self.node_running[n.identifier] < self.node_concurrency]
+        if not nodes:
+            return
+        return min(nodes, key=lambda n: len(n.players) + self.node_running[n.identifier])
+
+    # próximo servidor a ser restaurado (o de maior prioridade entre os shards que ainda podem conectar).
+    def next_job(self, now: float) -> tuple[Optional[ResumeJob], Optional[float]]:
+
+        best = None
+        wait = None
+
+        for shard_id, jobs in self.jobs.items():
+
+            if not jobs:
+                continue
+
+            job = jobs[0][2]
+
+            if job.gateway:
+                bucket = self.bucket(shard_id)
+                bucket.refill(now)
+                if bucket.tokens < 1:
+                    shard_wait = bucket.wait_time()
+                    wait = shard_wait if wait is None else min(wait, shard_wait)
+                    continue
+
+            if not best or job.priority < best.priority:
+                best = job
+
+        return best, wait
+
+    def start(self, job: ResumeJob, node: Optional[Node]):
+
+        heappop(self.jobs[job.shard_id if job.gateway else -1])
+
+        if job.gateway:
+            self.bucket(job.shard_id).tokens -= 1
+
+        node_id = node.identifier if node else None
+
+        if node_id:
+            self.node_running[node_id] += 1
+
+        task = self.running[job.guild_id] = self.bot.loop.create_task(self.resume(job.data, node))
+        task.add_done_callback(lambda t: self.finish(job, node_id, t))
+
+        try:
+            self.bot.players_resumed[job.guild_id] = task
+        except AttributeError:
+            pass
+
+    def finish(self, job: ResumeJob, node_id: Optional[str], task: asyncio.Task):
+
+        self.running.pop(job.guild_id, None)
+
+        if node_id:
+            self.node_running[node_id] -= 1
+            if not self.node_running[node_id]:
+                del self.node_running[node_id]
+
+        if task.cancelled():
+            self.counts["failed"] += 1
+        elif task.exception():
+            self.counts["failed"] += 1
+            traceback.print_exception(type(task.exception()), task.exception(), task.exception().__traceback__)
+        elif task.result():
+            self.counts["resumed"] += 1
+        else:
+            self.counts["skipped"] += 1
+
+        self.wakeup.set()
+
+    async def run(self):
+
+        self.started_at = monotonic()
+        self.last_progress = self.started_at
+
+        try:
+
+            while self.pending or self.running or self.feeding:
+
+                self.print_progress()
+
+                timeout = None
+
+                while self.pending and len(self.running) < self.concurrency:
+
+                    job, wait = self.next_job(monotonic())
+
+                    if not job:
+                        timeout = wait
+                        break
+
+                    node = None
+
+                    if job.gateway:
+
+                        if not (nodes := self.available_nodes()):
+                            # aguarda algum node ficar disponível.
+                            timeout = 5
+                            break
+
+                        if not (node := self.select_node(nodes)):
+                            break
+
+                    self.start(job, node)
+
+                if self.progress_interval:
+                    timeout = min(timeout, self.progress_interval) if timeout is not None else self.progress_interval
+
+                self.wakeup.clear()
+
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+        except asyncio.CancelledError:
+            for task in list(self.running.values()):
+                task.cancel()
+            raise
+
+        finally:
+            self.finished_at = monotonic()
+            self.print_progress(force=True)
@@ -0,0 +1,1066 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import binascii
+import datetime
+import io
+import pickle
+import struct
+import sys
+import zlib
+from array import array
+from functools import partial
+from itertools import accumulate, repeat
+from operator import eq, itemgetter, not_
+from typing import Callable, Iterable, Iterator, Optional
+
+# Formato binário das sessões dos players (substitui o pickle dos dicts das sessões).
+#
+# header: MAGIC + versão (1 byte) seguido de um único valor (o dict da sessão).
+# valores: 1 byte de tipo + dados. Inteiros e tamanhos são varints (ints com sinal em zigzag) e as strings são
+# gravadas uma única vez: a primeira ocorrência vai pra tabela de strings (na ordem em que aparecem) e as
+# seguintes são gravadas apenas com o índice (ex: autor, requester, nome/url da playlist repetidos na fila).
+# As músicas (dicts gerados pelo track.to_dict()) são gravadas num registro próprio com os campos fixos do
+# TRACK_INFO_FIELDS/TRACK_EXTRA_FIELDS (o id da track do lavalink é gravado em binário ao invés de base64), sem os
+# dados que são recalculados ao carregar a música (isSeekable, thumb dos vídeos do youtube).
+# Outros dados que não fazem parte do schema são mantidos nos campos extras do registro.
+#
+# Versão 2: as listas de músicas (ex: fila) são gravadas em blocos com os campos em colunas (T_TRACKS): as flags de
+# cada música num array de uint32 e cada coluna com os valores dos campos das músicas que possuem o campo (strings
+# juntas num único texto, com uma tabela dos valores repetidos, números/bools em arrays e os ids em binário). Assim
+# cada coluna é lida de uma vez só (ao invés de um valor por vez) e os campos parecidos ficam juntos (melhor
+# compressão). Os dicts das músicas são montados por uma função gerada pra cada combinação de flags.
+# Os registros de músicas da versão 1 (T_TRACK) continuam sendo lidos.
+#
+# Os dados gravados (comprimidos com zlib) começam com CHECKSUM_MAGIC + crc32 + tamanho dos dados: uma sessão
+# corrompida/incompleta é detectada antes de ser carregada (ao invés de gerar um player com dados inválidos).
+
+MAGIC = b"MBSS"
+VERSION = 2
+
+CHECKSUM_MAGIC = b"MBSC"
+checksum_header = struct.Struct(">4sII")
+
+T_NONE = 0
+T_FALSE = 1
+T_TRUE = 2
+T_INT = 3
+T_FLOAT = 4
+T_STR = 5
+T_STR_REF = 6
+T_BYTES = 7
+T_LIST = 8
+T_DICT = 9
+T_TUPLE = 10
+T_SET = 11
+T_DATETIME = 12
+T_TRACK = 13
+T_TRACKS = 14
+
+TRACK_INFO_FIELDS = ("id", "identifier", "title", "author", "uri", "length", "isStream", "sourceName", "artworkUrl")
+TRACK_EXTRA_FIELDS = ("requester", "track_loops", "autoplay", "thumb", "original_id")
+
+F_SEEKABLE = 1 << (len(TRACK_INFO_FIELDS) + len(TRACK_EXTRA_FIELDS))
+F_YOUTUBE_THUMB = F_SEEKABLE << 1
+F_PLAYLIST = F_SEEKABLE << 2
+F_INFO_REST = F_SEEKABLE << 3
+F_EXTRA_REST = F_SEEKABLE << 4
+F_ID_BYTES = F_SEEKABLE << 5
+
+track_skip_keys = frozenset(TRACK_INFO_FIELDS + ("isSeekable", "playlist", "extra"))
+track_extra_skip_keys = frozenset(TRACK_EXTRA_FIELDS)
+
+# colunas dos blocos de músicas (T_TRACKS): a flag de cada coluna indica se a música possui o campo.
+TRACK_INFO_COLUMNS = ("id", "identifier", "title", "author", "uri", "length", "isStream", "sourceName", "artworkUrl",
+                      "playlist")
+TRACK_EXTRA_COLUMNS = TRACK_EXTRA_FIELDS
+
+C_PLAYLIST_NAME = len(TRACK_INFO_COLUMNS) + len(TRACK_EXTRA_COLUMNS)
+C_PLAYLIST_URL = C_PLAYLIST_NAME + 1
+C_INFO_REST = C_PLAYLIST_NAME + 2
+C_EXTRA_REST = C_PLAYLIST_NAME + 3
+track_columns = C_PLAYLIST_NAME + 4
+
+identifier_column = TRACK_INFO_COLUMNS.index("identifier")
+stream_column = TRACK_INFO_COLUMNS.index("isStream")
+playlist_column = TRACK_INFO_COLUMNS.index("playlist")
+thumb_column = len(TRACK_INFO_COLUMNS) + TRACK_EXTRA_COLUMNS.index("thumb")
+
+CF_PLAYLIST = 1 << C_PLAYLIST_NAME
+CF_INFO_REST = 1 << C_INFO_REST
+CF_EXTRA_REST = 1 << C_EXTRA_REST
+CF_SEEKABLE = 1 << track_columns
+CF_YOUTUBE_THUMB = CF_SEEKABLE << 1
+
+column_skip_keys = frozenset(TRACK_INFO_COLUMNS + ("isSeekable", "extra"))
+
+K_ANY = 0
+K_STR = 1
+K_STR_TABLE = 2
+K_INT = 3
+K_BOOL = 4
+K_BASE64 = 5
+
+tracks_block_size = 1024
+
+# arrays gravados em little-endian.
+uint32_code = "I" if array("I").itemsize == 4 else "L"
+swap_bytes = sys.byteorder == "big"
+
+# tipos que não são seguidos por um varint.
+no_varint_tags = frozenset((T_NONE, T_FALSE, T_TRUE, T_FLOAT, T_DATETIME))
+
+# funções que montam as músicas dos blocos (T_TRACKS) pela combinação de flags.
+track_builders: dict[int, tuple] = {}
+
+b64encode = partial(binascii.b2a_base64, newline=False)
+
+# campos gravados em cada registro de música (pela combinação de flags) pra não checar bit a bit ao ler cada música.
+track_fields: dict[int, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+track_fields_mask = F_SEEKABLE - 1
+
+float_struct = struct.Struct(">d")
+
+epoch = datetime.datetime(1970, 1, 1)
+epoch_utc = epoch.replace(tzinfo=datetime.timezone.utc)
+
+chunk_size = 65536
+
+
+class SessionFormatError(Exception):
+    pass
+
+
+class SessionChecksumError(SessionFormatError):
+    pass
+
+
+def youtube_thumb(identifier: str) -> str:
+    return f"https://img.youtube.com/vi/{identifier}/mqdefault.jpg"
+
+
+def is_track_info(value: dict) -> bool:
+    return "sourceName" in value and isinstance(value.get("extra"), dict)
+
+
+def is_track_list(values: list) -> bool:
+    return bool(values) and all(type(v) is dict and is_track_info(v) for v in values)
+
+
+def read_uint32(data: bytes) -> array:
+    values = array(uint32_code)
+    values.frombytes(data)
+    if swap_bytes:
+        values.byteswap()
+    return values
+
+
+def base64_column(values: list) -> Optional[bytes]:
+
+    lengths = array(uint32_code)
+    data = bytearray()
+
+    for value in values:
+        try:
+            raw = binascii.a2b_base64(value)
+        except (binascii.Error, ValueError):
+            return
+        if binascii.b2a_base64(raw, newline=False).decode() != value:
+            return
+        lengths.append(len(raw))
+        data += raw
+
+    if swap_bytes:
+        lengths.byteswap()
+
+    return lengths.tobytes() + data
+
+
+def split_track_columns(tracks: list) -> tuple[array, list]:
+
+    columns = [[] for _ in range(track_columns)]
+    track_flags = array(uint32_code)
+
+    info_columns = [(k, 1 << n, columns[n]) for n, k in enumerate(TRACK_INFO_COLUMNS) if k != "playlist"]
+    extra_columns = [(k, 1 << n, columns[n]) for n, k in enumerate(TRACK_EXTRA_COLUMNS, len(TRACK_INFO_COLUMNS))
+                     if k != "thumb"]
+
+    for info in tracks:
+
+        extra = info["extra"]
+        flags = 0
+
+        for key, bit, column in info_columns:
+            if key in info:
+                column.append(info[key])
+                flags |= bit
+
+        for key, bit, column in extra_columns:
+            if key in extra:
+                column.append(extra[key])
+                flags |= bit
+
+        if "thumb" in extra:
+            if extra["thumb"] == youtube_thumb(info.get("identifier")):
+                flags |= CF_YOUTUBE_THUMB
+            else:
+                columns[thumb_column].append(extra["thumb"])
+                flags |= 1 << thumb_column
+
+        if "playlist" in info:
+            playlist = info["playlist"]
+            if type(playlist) is dict and playlist.keys() == {"name", "url"}:
+                columns[C_PLAYLIST_NAME].append(playlist["name"])
+                columns[C_PLAYLIST_URL].append(playlist["url"])
+                flags |= CF_PLAYLIST
+            else:
+                columns[playlist_column].append(playlist)
+                flags |= 1 << playlist_column
+
+        info_rest = None
+
+        if "isSeekable" in info:
+            if info["isSeekable"] == (not info.get("isStream")):
+                flags |= CF_SEEKABLE
+            else:
+                info_rest = {"isSeekable": info["isSeekable"]}
+
+        if keys := info.keys() - column_skip_keys:
+            info_rest = {**(info_rest or {}), **{k: info[k] for k in info if k in keys}}
+
+        if info_rest:
+            columns[C_INFO_REST].append(info_rest)
+            flags |= CF_INFO_REST
+
+        if keys := extra.keys() - track_extra_skip_keys:
+            columns[C_EXTRA_REST].append({k: extra[k] for k in extra if k in keys})
+            flags |= CF_EXTRA_REST
+
+        track_flags.append(flags)
+
+    return track_flags, columns
+
+
+# músicas com os mesmos campos (o mais comum): cada coluna é montada de uma vez (sem verificar música por música).
+def uniform_track_columns(tracks: list) -> Optional[tuple[array, list]]:
+
+    extras = list(map(itemgetter("extra"), tracks))
+
+    if len(set(map(frozenset, tracks))) != 1 or len(set(map(frozenset, extras))) != 1:
+        return
+
+    info_keys = tracks[0].keys()
+    extra_keys = extras[0].keys()
+
+    if info_keys - column_skip_keys or extra_keys - track_extra_skip_keys:
+        return
+
+    columns = [[] for _ in range(track_columns)]
+    flags = 0
+
+    for n, key in enumerate(TRACK_INFO_COLUMNS):
+        if key in info_keys and n != playlist_column:
+            columns[n] = list(map(itemgetter(key), tracks))
+            flags |= 1 << n
+
+    for n, key in enumerate(TRACK_EXTRA_COLUMNS, len(TRACK_INFO_COLUMNS)):
+        if key in extra_keys and n != thumb_column:
+            columns[n] = list(map(itemgetter(key), extras))
+            flags |= 1 << n
+
+    if "thumb" in extra_keys:
+        thumbs = list(map(itemgetter("thumb"), extras))
+        identifiers = columns[identifier_column] if "identifier" in info_keys else repeat(None, len(tracks))
+        if thumbs == list(map(youtube_thumb, identifiers)):
+            flags |= CF_YOUTUBE_THUMB
+        else:
+            columns[thumb_column] = thumbs
+            flags |= 1 << thumb_column
+
+    if "playlist" in info_keys:
+        playlists = list(map(itemgetter("playlist"), tracks))
+        names = [type(p) is dict and p.keys() == {"name", "url"} for p in playlists]
+        if all(names):
+            columns[C_PLAYLIST_NAME] = list(map(itemgetter("name"), playlists))
+            columns[C_PLAYLIST_URL] = list(map(itemgetter("url"), playlists))
+            flags |= CF_PLAYLIST
+        elif not any(names):
+            columns[playlist_column] = playlists
+            flags |= 1 << playlist_column
+        else:
+            return
+
+    if "isSeekable" in info_keys:
+        streams = columns[stream_column] if "isStream" in info_keys else repeat(None, len(tracks))
+        if not all(map(eq, map(itemgetter("isSeekable"), tracks), map(not_, streams))):
+            return
+        flags |= CF_SEEKABLE
+
+    return array(uint32_code, [flags]) * len(tracks), columns
+
+
+# gera (e guarda) a função que monta o dict de uma música do bloco a partir dos valores das colunas usadas pela
+# combinação de flags (o dict é montado de uma vez, igual ao dict gerado pelo track.to_dict()).
+def track_builder(flags: int) -> tuple[Callable, tuple[int, ...]]:
+
+    try:
+        return track_builders[flags]
+    except KeyError:
+        pass
+
+    columns = {n: k for n, k in enumerate(TRACK_INFO_COLUMNS + TRACK_EXTRA_COLUMNS) if flags & (1 << n)}
+
+    if not columns:
+        raise SessionFormatError(f"Invalid track flags: {flags}")
+
+    used = sorted(columns)
+    info = [f"{k!r}: c{n}" for n, k in columns.items() if n < len(TRACK_INFO_COLUMNS)]
+    extra = [f"{k!r}: c{n}" for n, k in columns.items() if n >= len(TRACK_INFO_COLUMNS)]
+    names = {k: f"c{n}" for n, k in columns.items()}
+
+    if flags & CF_SEEKABLE:
+        info.append(f"'isSeekable': not {names['isStream']}" if "isStream" in names else "'isSeekable': True")
+
+    if flags & CF_PLAYLIST:
+        used += [C_PLAYLIST_NAME, C_PLAYLIST_URL]
+        info.append(f"'playlist': {{'name': c{C_PLAYLIST_NAME}, 'url': c{C_PLAYLIST_URL}}}")
+
+    if flags & CF_INFO_REST:
+        used.append(C_INFO_REST)
+        info.append(f"**c{C_INFO_REST}")
+
+    if flags & CF_YOUTUBE_THUMB:
+        if "identifier" in names:
+            extra.append(f"'thumb': f{youtube_thumb('{' + names['identifier'] + '}')!r}")
+        else:
+            extra.append(f"'thumb': {youtube_thumb(None)!r}")
+
+    if flags & CF_EXTRA_REST:
+        used.append(C_EXTRA_REST)
+        extra.append(f"**c{C_EXTRA_REST}")
+
+    info.append(f"'extra': {{{', '.join(extra)}}}")
+
+    builder = eval(f"lambda {', '.join(f'c{n}' for n in used)}: {{{', '.join(info)}}}", {})
+
+    track_builders[flags] = builder, tuple(used)
+    return builder, tuple(used)
+
+
+class SessionEncoder:
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.strings: dict[str, int] = {}
+
+    def take(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+    def header(self):
+        self.buffer += MAGIC
+        self.buffer.append(VERSION)
+
+    def varint(self, value: int):
+        buffer = self.buffer
+        while value > 0x7f:
+            buffer.append((value & 0x7f) | 0x80)
+            value >>= 7
+        buffer.append(value)
+
+    def string(self, value: str):
+        try:
+            index = self.strings[value]
+        except KeyError:
+            self.strings[value] = len(self.strings)
+            data = value.encode("utf-8", "surrogatepass")
+            self.buffer.append(T_STR)
+            self.varint(len(data))
+            self.buffer += data
+        else:
+            self.buffer.append(T_STR_REF)
+            self.varint(index)
+
+    def container(self, tag: int, size: int):
+        self.buffer.append(tag)
+        self.varint(size)
+
+    def encode(self, value):
+
+        if type(value) is str:
+            self.string(value)
+
+        elif value is None:
+            self.buffer.append(T_NONE)
+
+        elif value is True:
+            self.buffer.append(T_TRUE)
+
+        elif value is False:
+            self.buffer.append(T_FALSE)
+
+        elif isinstance(value, str):
+            self.string(value)
+
+        elif isinstance(value, int):
+            self.buffer.append(T_INT)
+            self.varint(value << 1 if value >= 0 else (-value << 1) - 1)
+
+        elif isinstance(value, float):
+            self.buffer.append(T_FLOAT)
+            self.buffer += float_struct.pack(value)
+
+        elif isinstance(value, dict):
+            if is_track_info(value):
+                self.track(value)
+                return
+            self.container(T_DICT, len(value))
+            for k, v in value.items():
+                self.encode(k)
+                self.encode(v)
+
+        elif isinstance(value, list):
+            if is_track_list(value):
+                self.tracks(value)
+                return
+            self.container(T_LIST, len(value))
+            for v in value:
+                self.encode(v)
+
+        elif isinstance(value, tuple):
+            self.container(T_TUPLE, len(value))
+            for v in value:
+                self.encode(v)
+
+        elif isinstance(value, (set, frozenset)):
+            self.container(T_SET, len(value))
+            for v in value:
+                self.encode(v)
+
+        elif isinstance(value, datetime.datetime):
+            if value.tzinfo is None:
+                self.buffer.append(T_DATETIME)
+                self.buffer.append(0)
+                delta = value - epoch
+            else:
+                self.buffer.append(T_DATETIME)
+                self.buffer.append(1)
+                delta = value - epoch_utc
+            micro = (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+            self.varint(micro << 1 if micro >= 0 else (-micro << 1) - 1)
+
+        elif isinstance(value, (bytes, bytearray)):
+            self.container(T_BYTES, len(value))
+            self.buffer += value
+
+        else:
+            raise SessionFormatError(f"Unsupported type: {type(value).__name__}")
+
+    def track(self, info: dict):
+
+        extra = info["extra"]
+        flags = 0
+        values = []
+        bit = 1
+
+        for key in TRACK_INFO_FIELDS:
+            try:
+                value = info[key]
+            except KeyError:
+                pass
+            else:
+                if key == "id" and value:
+                    try:
+                        raw = binascii.a2b_base64(value)
+                    except (binascii.Error, TypeError, ValueError):
+                        pass
+                    else:
+                        if binascii.b2a_base64(raw, newline=False).decode() == value:
+                            flags |= F_ID_BYTES
+                            value = raw
+                values.append(value)
+                flags |= bit
+            bit <<= 1
+
+        for key in TRACK_EXTRA_FIELDS:
+            try:
+                value = extra[key]
+            except KeyError:
+                pass
+            else:
+                if key == "thumb" and value == youtube_thumb(info.get("identifier")):
+                    flags |= F_YOUTUBE_THUMB
+                else:
+                    values.append(value)
+                    flags |= bit
+            bit <<= 1
+
+        info_rest = {k: v for k, v in info.items() if k not in track_skip_keys}
+
+        try:
+            seekable = info["isSeekable"]
+        except KeyError:
+            pass
+        else:
+            if seekable == (not info.get("isStream")):
+                flags |= F_SEEKABLE
+            else:
+                info_rest["isSeekable"] = seekable
+
+        playlist = info.get("playlist")
+
+        if isinstance(playlist, dict) and playlist.keys() == {"name", "url"}:
+            flags |= F_PLAYLIST
+            values.append(playlist["name"])
+            values.append(playlist["url"])
+        elif "playlist" in info:
+            info_rest["playlist"] = playlist
+
+        if info_rest:
+            flags |= F_INFO_REST
+            values.append(info_rest)
+
+        if extra_rest := {k: v for k, v in extra.items() if k not in track_extra_skip_keys}:
+            flags |= F_EXTRA_REST
+            values.append(extra_rest)
+
+        self.buffer.append(T_TRACK)
+        self.varint(flags)
+
+        for value in values:
+            self.encode(value)
+
+    def tracks(self, tracks: list):
+        self.container(T_TRACKS, len(tracks))
+        for pos in range(0, len(tracks), tracks_block_size):
+            self.tracks_block(tracks[pos:pos + tracks_block_size])
+
+    def tracks_block(self, tracks: list):
+
+        track_flags, columns = uniform_track_columns(tracks) or split_track_columns(tracks)
+
+        if swap_bytes:
+            track_flags.byteswap()
+
+        self.varint(len(tracks))
+        self.buffer += track_flags.tobytes()
+
+        for n, column in enumerate(columns):
+            self.column(column, base64=n == 0)
+
+    def blob(self, text: str):
+        data = text.encode("utf-8", "surrogatepass")
+        self.varint(len(data))
+        self.buffer += data
+
+    def column(self, values: list, base64: bool = False):
+
+        self.varint(len(values))
+
+        if not values:
+            return
+
+        types = set(map(type, values))
+
+        # ids das músicas do lavalink: gravados em binário (menor e mais rápido de comprimir do que o base64).
+        if base64 and types == {str} and (data := base64_column(values)):
+            self.buffer.append(K_BASE64)
+            self.buffer += data
+            return
+
+        if types == {str}:
+
+            table = dict.fromkeys(values)
+
+            if len(table) * 2 <= len(values):
+                text = "\0".join(table)
+                if text.count("\0") == len(table) - 1:
+                    self.buffer.append(K_STR_TABLE)
+                    self.blob(text)
+                    index = {v: n for n, v in enumerate(table)}
+                    indexes = array(uint32_code, map(index.__getitem__, values))
+                    if swap_bytes:
+                        indexes.byteswap()
+                    self.buffer += indexes.tobytes()
+                    return
+
+            else:
+                text = "\0".join(values)
+                if text.count("\0") == len(values) - 1:
+                    self.buffer.append(K_STR)
+                    self.blob(text)
+                    return
+
+        elif types == {int}:
+            try:
+                numbers = array("q", values)
+            except OverflowError:
+                pass
+            else:
+                if swap_bytes:
+                    numbers.byteswap()
+                self.buffer.append(K_INT)
+                self.buffer += numbers.tobytes()
+                return
+
+        elif types == {bool}:
+            self.buffer.append(K_BOOL)
+            self.buffer += bytes(values)
+            return
+
+        self.buffer.append(K_ANY)
+        for value in values:
+            self.encode(value)
+
+    # gera o conteúdo em partes (as listas grandes, ex: fila, são divididas entre as partes).
+    def iter_encode(self, data: dict, size: int = chunk_size) -> Iterator[bytes]:
+
+        self.header()
+        self.container(T_DICT, len(data))
+
+        for key, value in data.items():
+
+            self.encode(key)
+
+            if not isinstance(value, list):
+                self.encode(value)
+                continue
+
+            if is_track_list(value):
+                self.container(T_TRACKS, len(value))
+                for pos in range(0, len(value), tracks_block_size):
+                    self.tracks_block(value[pos:pos + tracks_block_size])
+                    if len(self.buffer) >= size:
+                        yield self.take()
+                continue
+
+            self.container(T_LIST, len(value))
+
+            for v in value:
+                self.encode(v)
+                if len(self.buffer) >= size:
+                    yield self.take()
+
+            if len(self.buffer) >= size:
+                yield self.take()
+
+        if self.buffer:
+            yield self.take()
+
+
+class SessionDecoder:
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.buffer = b""
+        self.pos = 0
+        self.strings: list[str] = []
+
+    def fill(self, size: int):
+        data = [self.buffer[self.pos:]]
+        available = len(data[0])
+        while available < size:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                raise SessionFormatError("Truncated session data")
+            data.append(chunk)
+            available += len(chunk)
+        self.buffer = b"".join(data)
+        self.pos = 0
+
+    def read(self, size: int) -> bytes:
+        pos = self.pos
+        end = pos + size
+        if end > len(self.buffer):
+            self.fill(size)
+            pos = 0
+            end = size
+        self.pos = end
+        return self.buffer[pos:end]
+
+    def byte(self) -> int:
+        if self.pos >= len(self.buffer):
+            self.fill(1)
+        value = self.buffer[self.pos]
+        self.pos += 1
+        return value
+
+    # os varints são lidos direto do buffer (só usa o byte() quando o valor continua na próxima parte dos dados).
+    def varint(self) -> int:
+        buffer = self.buffer
+        pos = self.pos
+        try:
+            b = buffer[pos]
+            if b < 0x80:
+                self.pos = pos + 1
+                return b
+            value = b & 0x7f
+            shift = 7
+            while True:
+                pos += 1
+                b = buffer[pos]
+                value |= (b & 0x7f) << shift
+                if b < 0x80:
+                    self.pos = pos + 1
+                    return value
+                shift += 7
+        except IndexError:
+            pass
+        value = 0
+        shift = 0
+        while True:
+            b = self.byte()
+            value |= (b & 0x7f) << shift
+            if b < 0x80:
+                return value
+            shift += 7
+
+    def signed(self) -> int:
+        value = self.varint()
+        return -((value + 1) >> 1) if value & 1 else value >> 1
+
+    def header(self):
+        if self.read(len(MAGIC)) != MAGIC:
+            raise SessionFormatError("Invalid session data")
+        if (version := self.byte()) > VERSION:
+            raise SessionFormatError(f"Unsupported session format version: {version}")
+
+    def decode(self):
+
+        buffer = self.buffer
+        pos = self.pos
+
+        # o tag e o varint seguinte (tamanho/valor) são lidos direto do buffer, sem chamar o byte()/varint() a cada
+        # byte. Os valores que continuam na próxima parte dos dados são lidos pelo decode_value().
+        try:
+            tag = buffer[pos]
+
+            if tag in no_varint_tags:
+                if tag == T_NONE:
+                    self.pos = pos + 1
+                    return None
+                if tag == T_FALSE:
+                    self.pos = pos + 1
+                    return False
+                if tag == T_TRUE:
+                    self.pos = pos + 1
+                    return True
+                return self.decode_value(self.byte())
+
+            b = buffer[pos + 1]
+            pos += 2
+            if b < 0x80:
+                value = b
+            else:
+                value = b & 0x7f
+                shift = 7
+                while True:
+                    b = buffer[pos]
+                    pos += 1
+                    value |= (b & 0x7f) << shift
+                    if b < 0x80:
+                        break
+                    shift += 7
+        except IndexError:
+            return self.decode_value(self.byte())
+
+        if tag == T_STR_REF:
+            self.pos = pos
+            return self.strings[value]
+
+        if tag == T_STR:
+            if (end := pos + value) > len(buffer):
+                return self.decode_value(self.byte())
+            self.pos = end
+            value = buffer[pos:end].decode("utf-8", "surrogatepass")
+            self.strings.append(value)
+            return value
+
+        if tag == T_INT:
+            self.pos = pos
+            return -((value + 1) >> 1) if value & 1 else value >> 1
+
+        if tag == T_TRACK:
+            self.pos = pos
+            return self.track(value)
+
+        if tag == T_BYTES:
+            if (end := pos + value) > len(buffer):
+                return self.decode_value(self.byte())
+            self.pos = end
+            return buffer[pos:end]
+
+        self.pos = pos
+        return self.container(tag, value)
+
+    def container(self, tag: int, size: int):
+
+        if tag == T_TRACKS:
+            return self.tracks(size)
+
+        decode = self.decode
+
+        if tag == T_DICT:
+            return {decode(): decode() for _ in range(size)}
+
+        if tag == T_LIST:
+            return [decode() for _ in range(size)]
+
+        if tag == T_TUPLE:
+            return tuple(decode() for _ in range(size))
+
+        if tag == T_SET:
+            return {decode() for _ in range(size)}
+
+        raise SessionFormatError(f"Invalid value type: {tag}")
+
+    def decode_value(self, tag: int):
+
+        if tag == T_STR_REF:
+            return self.strings[self.varint()]
+
+        if tag == T_STR:
+            value = self.read(self.varint()).decode("utf-8", "surrogatepass")
+            self.strings.append(value)
+            return value
+
+        if tag == T_INT:
+            return self.signed()
+
+        if tag == T_TRACK:
+            return self.track(self.varint())
+
+        if tag == T_NONE:
+            return None
+
+        if tag == T_TRUE:
+            return True
+
+        if tag == T_FALSE:
+            return False
+
+        if tag in (T_DICT, T_LIST, T_TUPLE, T_SET, T_TRACKS):
+            return self.container(tag, self.varint())
+
+        if tag == T_FLOAT:
+            return float_struct.unpack(self.read(8))[0]
+
+        if tag == T_DATETIME:
+            aware = self.byte()
+            return (epoch_utc if aware else epoch) + datetime.timedelta(microseconds=self.signed())
+
+        if tag == T_BYTES:
+            return self.read(self.varint())
+
+        raise SessionFormatError(f"Invalid value type: {tag}")
+
+    def track(self, flags: int) -> dict:
+
+        decode = self.decode
+
+        try:
+            info_fields, extra_fields = track_fields[flags & track_fields_mask]
+        except KeyError:
+            info_fields, extra_fields = track_fields[flags & track_fields_mask] = (
+                tuple(k for n, k in enumerate(TRACK_INFO_FIELDS) if flags & (1 << n)),
+                tuple(k for n, k in enumerate(TRACK_EXTRA_FIELDS, len(TRACK_INFO_FIELDS)) if flags & (1 << n)),
+            )
+
+        info = {key: decode() for key in info_fields}
+
+        if flags & F_ID_BYTES:
+            info["id"] = binascii.b2a_base64(info["id"], newline=False).decode()
+
+        extra = {key: decode() for key in extra_fields}
+
+        if flags & F_YOUTUBE_THUMB:
+            extra["thumb"] = youtube_thumb(info.get("identifier"))
+
+        if flags & F_SEEKABLE:
+            info["isSeekable"] = not info.get("isStream")
+
+        if flags & F_PLAYLIST:
+            info["playlist"] = {"name": self.decode(), "url": self.decode()}
+
+        if flags & F_INFO_REST:
+            info.update(self.decode())
+
+        if flags & F_EXTRA_REST:
+            extra.update(self.decode())
+
+        info["extra"] = extra
+
+        return info
+
+    def tracks(self, size: int) -> list:
+        tracks = []
+        while len(tracks) < size:
+            self.tracks_block(tracks)
+        if len(tracks) != size:
+            raise SessionFormatError("Invalid track list size")
+        return tracks
+
+    def tracks_block(self, tracks: list):
+
+        if not (size := self.varint()):
+            raise SessionFormatError("Empty track block")
+
+        track_flags = read_uint32(self.read(size * 4))
+        columns = [self.column() for _ in range(track_columns)]
+
+        # todas as músicas do bloco com os mesmos campos (o mais comum): as músicas são montadas direto das colunas.
+        if len(flags := set(track_flags)) == 1:
+            builder, used = track_builder(flags.pop())
+            tracks.extend(map(builder, *(columns[n] for n in used)))
+            return
+
+        columns = [iter(c) for c in columns]
+        builders = {}
+        append = tracks.append
+
+        for flags in track_flags:
+            try:
+                builder, values = builders[flags]
+            except KeyError:
+                builder, used = track_builder(flags)
+                builder, values = builders[flags] = builder, tuple(columns[n] for n in used)
+            append(builder(*map(next, values)))
+
+    def column(self):
+
+        if not (size := self.varint()):
+            return ()
+
+        kind = self.byte()
+
+        if kind == K_STR:
+            values = self.read(self.varint()).decode("utf-8", "surrogatepass").split("\0")
+            if len(values) != size:
+                raise SessionFormatError("Invalid string column size")
+            return values
+
+        if kind == K_STR_TABLE:
+            table = self.read(self.varint()).decode("utf-8", "surrogatepass").split("\0")
+            indexes = read_uint32(self.read(size * 4))
+            if max(indexes) >= len(table):
+                raise SessionFormatError("Invalid string table index")
+            return list(map(table.__getitem__, indexes))
+
+        if kind == K_INT:
+            values = array("q")
+            values.frombytes(self.read(size * 8))
+            if swap_bytes:
+                values.byteswap()
+            return values.tolist()
+
+        if kind == K_BOOL:
+            return list(map(bool, self.read(size)))
+
+        if kind == K_BASE64:
+            ends = list(accumulate(read_uint32(self.read(size * 4))))
+            data = self.read(ends[-1])
+            return list(map(bytes.decode, map(b64encode, map(data.__getitem__, map(slice, [0] + ends, ends)))))
+
+        if kind == K_ANY:
+            return [self.decode() for _ in range(size)]
+
+        raise SessionFormatError(f"Invalid column type: {kind}")
+
+    def load(self):
+        self.header()
+        return self.decode()
+
+
+def iter_encode_session(data: dict, size: int = chunk_size) -> Iterator[bytes]:
+    compressor = zlib.compressobj()
+    for chunk in SessionEncoder().iter_encode(data, size):
+        if chunk := compressor.compress(chunk):
+            yield chunk
+    yield compressor.flush()
+
+
+def encode_session(data: dict) -> bytes:
+    data = b"".join(iter_encode_session(data))
+    return checksum_header.pack(CHECKSUM_MAGIC, zlib.crc32(data), len(data)) + data
+
+
+def verify_session(data: bytes) -> bytes:
+
+    if data[:len(CHECKSUM_MAGIC)] != CHECKSUM_MAGIC:
+        return data
+
+    if len(data) < checksum_header.size:
+        raise SessionChecksumError("Truncated session header")
+
+    _, checksum, size = checksum_header.unpack_from(data)
+    data = data[checksum_header.size:]
+
+    if len(data) != size:
+        raise SessionChecksumError(f"Session size mismatch: {len(data)} (expected: {size})")
+
+    if zlib.crc32(data) != checksum:
+        raise SessionChecksumError("Session checksum mismatch")
+
+    return data
+
+
+def iter_decompress(data: bytes, size: int = chunk_size) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj()
+    view = memoryview(data)
+    for pos in range(0, len(data), size):
+        if chunk := decompressor.decompress(view[pos:pos + size]):
+            yield chunk
+    if chunk := decompressor.flush():
+        yield chunk
+
+
+def is_session_format(data: bytes) -> bool:
+    return data[:len(MAGIC)] == MAGIC
+
+
+# apenas os tipos usados nas sessões antigas (os arquivos .pkl não podem criar outros objetos ao serem carregados).
+class LegacySessionUnpickler(pickle.Unpickler):
+
+    allowed = {
+        ("datetime", "datetime"), ("datetime", "timezone"), ("datetime", "timedelta"), ("datetime", "date"),
+        ("builtins", "set"), ("builtins", "frozenset"),
+    }
+
+    def find_class(self, module: str, name: str):
+        if (module, name) not in self.allowed:
+            raise pickle.UnpicklingError(f"Unsupported type in legacy session: {module}.{name}")
+        return super().find_class(module, name)
+
+
+def load_legacy_session(data: bytes):
+    try:
+        data = zlib.decompress(data)
+    except zlib.error:
+        pass
+    return LegacySessionUnpickler(io.BytesIO(data)).load()
+
+
+def decode_session(data: bytes, loader: Callable[[bytes], object] = load_legacy_session):
+
+    data = verify_session(data)
+
+    if is_session_format(data):
+        return SessionDecoder([data]).load()
+
+    try:
+        decoder = SessionDecoder(iter_decompress(data))
+        if is_session_format(decoder.read(len(MAGIC))):
+            decoder.pos = 0
+            return decoder.load()
+    except (zlib.error, SessionFormatError):
+        pass
+
+    # sessões salvas com pickle (antes do formato atual).
+    return loader(data)
+
+
+# converte os dados de uma sessão salva com pickle (ex: arquivos .pkl) pro formato atual.
+def convert_pickle(data: bytes) -> bytes:
+    return encode_session(load_legacy_session(data))
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import os
+import struct
+import traceback
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from utils.music.session_codec import decode_session, encode_session
+
+if TYPE_CHECKING:
+    from utils.music.models import LavalinkPlayer
+
+
+journal_lists = ("played", "queue_autoplay", "failed_tracks")
+
+# dados da sessão que não fazem parte do estado salvo no journal.
+journal_ignored_keys = ("queue", "queue_uids", "time", "journal_id", "journal_seq", "session_tables") + journal_lists
+
+session_track_lists = ("queue",) + journal_lists
+
+frame_header = struct.Struct(">I")
+
+missing = object()
+
+
+# Registro (somente adições) das alterações de um player desde o último snapshot da sessão: as alterações da fila
+# (músicas adicionadas com a posição, unique_ids removidos) e os valores da sessão que mudaram (volume, posição,
+# música atual etc). Cada salvamento grava apenas as alterações desde o salvamento anterior e o snapshot completo
+# só é gravado novamente a cada max_entries registros (ou quando a fila é reordenada/alterada demais).
+class SessionJournal:
+
+    def __init__(self, player: LavalinkPlayer, max_entries: int = 50, max_items: int = 500):
+        self.queue = player.queue
+        self.max_entries = max_entries
+        self.max_items = max_items
+        self.id = os.urandom(6).hex()
+        self.seq = 0
+        self.entries = 0
+        self.ops: list[tuple] = []
+        self.op_items = 0
+        self.snapshot_needed = True
+        self.state: dict = {}
+        self.lists: dict[str, tuple] = {}
+        self.current_uid: Optional[str] = None
+        self.queue.add_listener(self.queue_event)
+
+    def close(self):
+        self.queue.remove_listener(self.queue_event)
+        self.ops.clear()
+
+    @property
+    def snapshot_due(self) -> bool:
+        return self.snapshot_needed or self.entries >= self.max_entries
+
+    def request_snapshot(self):
+        self.snapshot_needed = True
+        self.ops.clear()
+        self.op_items = 0
+
+    def queue_event(self, event: str, items: list):
+
+        if self.snapshot_needed:
+            return
+
+        if event == "add":
+            try:
+                index = self.queue.index_by_id(items[0].unique_id)
+            except (AttributeError, ValueError):
+                self.request_snapshot()
+                return
+            self.ops.append(("add", index, list(items)))
+
+        elif event == "remove":
+            self.ops.append(("remove", [t.unique_id for t in items]))
+
+        elif event == "reorder":
+            self.request_snapshot()
+            return
+
+        else:
+            return
+
+        self.op_items += len(items)
+
+        if self.op_items > self.max_items:
+            self.request_snapshot()
+
+    def list_signatures(self, player: LavalinkPlayer) -> dict[str, tuple]:
+        return {key: tuple(t.unique_id for t in getattr(player, key)) for key in journal_lists}
+
+    # chamado ao gravar o snapshot completo da sessão (os registros anteriores ficam obsoletos).
+    def snapshot(self, player: LavalinkPlayer, data: dict):
+        self.seq += 1
+        self.entries = 0
+        self.ops.clear()
+        self.op_items = 0
+        self.snapshot_needed = False
+        data["journal_id"] = self.id
+        data["journal_seq"] = self.seq
+        self.state = {k: v for k, v in data.items() if k not in journal_ignored_keys}
+        self.lists = self.list_signatures(player)
+        self.current_uid = player.current.unique_id if player.current else None
+
+    def entry(self, player: LavalinkPlayer, state: dict) -> Optional[dict]:
+
+        changes = {k: v for k, v in state.items() if k not in journal_ignored_keys and self.state.get(k, missing) != v}
+
+        for key, signature in self.list_signatures(player).items():
+            if signature != self.lists.get(key):
+                changes[key] = [t.to_dict() for t in getattr(player, key)]
+                self.lists[key] = signature
+
+        current_uid = player.current.unique_id if player.current else None
+
+        if current_uid != self.current_uid:
+            changes["current"] = (current_uid, player.current.to_dict()) if player.current else None
+            self.current_uid = current_uid
+
+        ops = [
+            ("add", op[1], [(t.unique_id, t.to_dict()) for t in op[2]]) if op[0] == "add" else op for op in self.ops
+        ]
+
+        if not changes and not ops:
+            return
+
+        self.ops.clear()
+        self.op_items = 0
+        self.state.update((k, v) for k, v in changes.items() if k not in journal_lists and k != "current")
+        self.seq += 1
+        self.entries += 1
+
+        if "time" in state:
+            changes["time"] = state["time"]
+
+        return {"id": self.id, "seq": self.seq, "state": changes, "ops": ops}
+
+
+# Tabelas do snapshot da sessão com as playlists, requesters e fontes das músicas: cada valor é gravado uma única
+# vez e as músicas guardam apenas o índice na tabela. Os dicts das músicas são criados a partir do track.info
+# (que gera um novo dict a cada acesso), sem alterar as tracks.
+class SessionTables:
+
+    def __init__(self):
+        self.playlists: list[dict] = []
+        self.requesters: list = []
+        self.sources: list[str] = []
+        self.playlist_index: dict[int, int] = {}
+        self.requester_index: dict = {}
+        self.source_index: dict[str, int] = {}
+
+    def playlist(self, playlist) -> int:
+        try:
+            return self.playlist_index[id(playlist)]
+        except KeyError:
+            index = self.playlist_index[id(playlist)] = len(self.playlists)
+            self.playlists.append({"name": playlist.name[:97] if playlist.name else "", "url": playlist.url})
+            return index
+
+    @staticmethod
+    def value_index(value, values: list, indexes: dict) -> int:
+        try:
+            return indexes[value]
+        except KeyError:
+            index = indexes[value] = len(values)
+            values.append(value)
+            return index
+
+    def track_info(self, track) -> dict:
+
+        info = track.info
+        info["id"] = track.id
+        info["sourceName"] = self.value_index(info["sourceName"], self.sources, self.source_index)
+        info["extra"]["requester"] = self.value_index(info["extra"]["requester"], self.requesters, self.requester_index)
+
+        if track.playlist:
+            info["playlist"] = self.playlist(track.playlist)
+
+        return info
+
+    def to_dict(self) -> dict:
+        return {"playlists": self.playlists, "requesters": self.requesters, "sources": self.sources}
+
+
+# restaura os valores das músicas que estão nas tabelas do snapshot (antes de aplicar os registros do journal).
+def expand_session_tables(data: dict) -> dict:
+
+    if not (tables := data.pop("session_tables", None)):
+        return data
+
+    playlists = tables["playlists"]
+    requesters = tables["requesters"]
+    sources = tables["sources"]
+
+    for key in session_track_lists:
+        for info in data.get(key) or []:
+            info["sourceName"] = sources[info["sourceName"]]
+            info["extra"]["requester"] = requesters[info["extra"]["requester"]]
+            if (playlist := info.get("playlist")) is not None:
+                info["playlist"] = playlists[playlist]
+
+    return data
+
+
+def encode_entry(entry: dict) -> bytes:
+    return encode_session(entry)
+
+
+def decode_entry(data: bytes) -> dict:
+    return decode_session(data)
+
+
+# registros gravados em sequência nos arquivos .journal (antes do banco de dados das sessões). Um registro incompleto
+# no final do arquivo (ex: o bot foi finalizado durante a gravação) é ignorado.
+def iter_frames(data: bytes) -> Iterator[dict]:
+
+    pos = 0
+
+    while pos + frame_header.size <= len(data):
+        size, = frame_header.unpack_from(data, pos)
+        pos += frame_header.size
+        if pos + size > len(data):
+            return
+        try:
+            yield decode_entry(data[pos:pos + size])
+        except Exception:
+            return
+        pos += size
+
+
+# aplica os registros do journal gravados após o snapshot (data) retornando os dados atualizados da sessão.
+def apply_journal(data: dict, entries: list[dict]) -> dict:
+
+    entries = sorted(
+        (e for e in entries if e.get("id") == data.get("journal_id") and e["seq"] > data.get("journal_seq", 0)),
+        key=lambda e: e["seq"]
+    )
+
+    if not entries or (uids := data.get("queue_uids")) is None:
+        return data
+
+    queue = data["queue"]
+
+    current = (None, queue[0]) if len(queue) > len(uids) else None
+
+    items = list(zip(uids, queue[1:] if current else queue))
+
+    for e in entries:
+
+        for op in e["ops"]:
+
+            if op[0] == "add":
+                items[op[1]:op[1]] = op[2]
+
+            elif op[0] == "remove":
+                removed = {}
+                for uid in op[1]:
+                    removed[uid] = removed.get(uid, 0) + 1
+                new_items = []
+                for item in items:
+                    if removed.get(item[0]):
+                        removed[item[0]] -= 1
+                        continue
+                    new_items.append(item)
+                items = new_items
+
+        state = dict(e["state"])
+
+        try:
+            current = state.pop("current")
+        except KeyError:
+            pass
+
+        data.update(state)
+        data["journal_seq"] = e["seq"]
+
+    data["queue"] = ([current[1]] if current else []) + [i[1] for i in items]
+    data["queue_uids"] = [i[0] for i in items]
+
+    return data
+
+
+def load_session(data: bytes, journal: list[bytes]) -> dict:
+
+    data = expand_session_tables(decode_session(data))
+
+    entries = []
+
+    for entry in journal:
+        try:
+            entries.append(decode_entry(entry))
+        except Exception:
+            traceback.print_exc()
+
+    return apply_journal(data, entries)
+
+
+# sessão anterior (previous) caso a atual esteja corrompida: as alterações gravadas no journal depois dela são
+# perdidas. Retorna a sessão e o erro ao carregar a sessão atual (caso a anterior tenha sido usada).
+# (executado também nos processos usados pra carregar as sessões ao iniciar o bot)
+def load_stored_session(data: bytes, previous: Optional[bytes], journal: list[bytes]) -> tuple[dict, Optional[str]]:
+
+    try:
+        return load_session(data, journal), None
+    except Exception:
+        if not previous:
+            raise
+        error = traceback.format_exc()
+
+    return load_session(previous, []), error
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import random
+import traceback
+from contextlib import asynccontextmanager
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from utils.music.models import LavalinkPlayer
+
+
+# Gravação das sessões dos players (compartilhada por todos os players da pool, substitui a task de cada player).
+# Cada alteração do player incrementa o player.state_version e marca o player como pendente: várias alterações
+# seguidas dentro do intervalo de agrupamento viram uma única gravação e players sem alterações desde a última
+# gravação são ignorados. Players tocando também são gravados periodicamente (posição da música) num intervalo
+# com variação aleatória, e as gravações respeitam um limite por segundo pra não concentrar as gravações de
+# milhares de players no mesmo momento.
+class PlayerSessionSaver:
+
+    def __init__(self, rate: float = 20, delay: float = 5, interval: float = 45, concurrency: int = 5):
+        self.rate = rate
+        self.delay = delay
+        self.interval = interval
+        self.concurrency = concurrency
+        self.scheduled: list[tuple] = []
+        self.pending: dict[int, tuple] = {}
+        self.running: dict[int, asyncio.Future] = {}
+        self.tokens = rate
+        self.last_refill = monotonic()
+        self.counter = count()
+        self.wakeup: Optional[asyncio.Event] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {"saves": 0, "coalesced": 0, "skipped": 0, "refreshes": 0, "errors": 0}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def is_pending(self, player: LavalinkPlayer) -> bool:
+        return id(player) in self.pending
+
+    def mark_dirty(self, player: LavalinkPlayer, delay: Optional[float] = None):
+        self.schedule(player, monotonic() + (self.delay if delay is None else delay), refresh=False)
+
+    # gravação periódica de um player que continua tocando (mesmo sem alterações marcadas).
+    def schedule_refresh(self, player: LavalinkPlayer, interval: Optional[float] = None):
+        interval = self.interval if interval is None else interval
+        self.schedule(player, monotonic() + interval * random.uniform(0.75, 1.25), refresh=True)
+
+    def schedule(self, player: LavalinkPlayer, due: float, refresh: bool):
+
+        if entry := self.pending.get(id(player)):
+            if entry[0] <= due:
+                if not refresh:
+                    self.stats["coalesced"] += 1
+                return
+            # uma gravação periódica antecipada por uma alteração continua sendo periódica.
+            refresh = refresh or entry[3]
+
+        entry = (due, next(self.counter), player, refresh)
+        self.pending[id(player)] = entry
+        heappush(self.scheduled, entry)
+        self.start()
+        self.wakeup.set()
+
+    def discard(self, player: LavalinkPlayer):
+        # as entradas antigas na fila são ignoradas ao serem processadas.
+        self.pending.pop(id(player), None)
+
+    # aguarda a gravação do player que estiver em andamento.
+    async def wait(self, player: LavalinkPlayer):
+        while future := self.running.get(id(player)):
+            try:
+                await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+    # gravação feita fora do saver (ex: desligamento, hibernação): cancela a gravação pendente, aguarda a que estiver
+    # em andamento e impede o saver de iniciar outra gravação do player até o bloco terminar.
+    @asynccontextmanager
+    async def exclusive(self, player: LavalinkPlayer):
+
+        self.discard(player)
+        await self.wait(player)
+
+        future = asyncio.get_event_loop().create_future()
+        self.running[id(player)] = future
+
+        try:
+            yield
+        finally:
+            if self.running.get(id(player)) is future:
+                del self.running[id(player)]
+            future.set_result(None)
+
+    def start(self):
+        if self.task and not self.task.done():
+            return
+        self.wakeup = asyncio.Event()
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.task = asyncio.get_event_loop().create_task(self.run())
+
+    def _refill(self, now: float):
+        self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    async def run(self):
+
+        while True:
+
+            timeout = None
+            now = monotonic()
+
+            while self.scheduled and self.scheduled[0][0] <= now:
+
+                entry = self.scheduled[0]
+                player = entry[2]
+
+                if self.pending.get(id(player)) is not entry:
+                    heappop(self.scheduled)
+                    continue
+
+                if id(player) in self.running:
+                    # a gravação anterior ainda não terminou.
+                    heappop(self.scheduled)
+                    del self.pending[id(player)]
+                    self.schedule(player, now + 1, entry[3])
+                    continue
+
+                self._refill(now)
+
+                if self.tokens < 1:
+                    timeout = (1 - self.tokens) / self.rate
+                    break
+
+                heappop(self.scheduled)
+                del self.pending[id(player)]
+                self.tokens -= 1
+                self.running[id(player)] = asyncio.create_task(self.save(player, refresh=entry[3]))
+
+            if timeout is None and self.scheduled:
+                timeout = max(self.scheduled[0][0] - monotonic(), 0)
+
+            self.wakeup.clear()
+
+            if timeout is None:
+                await self.wakeup.wait()
+                continue
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def save(self, player: LavalinkPlayer, refresh: bool = False):
+
+        try:
+
+            if player.is_closing:
+                return
+
+            version = player.state_version
+            dirty = version != player.saved_version
+
+            if not dirty and not refresh:
+                self.stats["skipped"] += 1
+                return
+
+            if not (cog := player.bot.get_cog("PlayerSession")):
+                return
+
+            async with self.semaphore:
+                saved = await cog.save_info(player)
+
+            if saved is False:
+                # a gravação falhou: o player continua pendente e é gravado novamente.
+                self.stats["errors"] += 1
+                self.mark_dirty(player, delay=self.delay * 2)
+                return
+
+            player.saved_version = version
+            self.stats["saves" if dirty else "refreshes"] += 1
+
+        except Exception:
+            self.stats["errors"] += 1
+            traceback.print_exc()
+            self.mark_dirty(player, delay=self.delay * 2)
+            return
+
+        finally:
+            if self.running.get(id(player)) is asyncio.current_task():
+                del self.running[id(player)]
+
+        if player.current and not player.current.is_stream and not player.paused and not player.is_closing and \
+                not self.is_pending(player):
+            self.schedule_refresh(player, interval=player.session_save_interval)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import time
+from typing import Optional
+
+
+# Banco de dados (sqlite em modo WAL) com as sessões de todos os players de um bot: substitui os arquivos
+# .pkl/.bak/.journal de cada servidor. Cada sessão é gravada numa única transação (a sessão anterior continua
+# válida caso a gravação falhe) e as operações são executadas em sequência numa thread própria.
+# A sessão anterior também é mantida (coluna previous) pra ser usada caso a atual esteja corrompida.
+class SessionStore:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn: Optional[sqlite3.Connection] = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session_store")
+
+    def connect(self) -> sqlite3.Connection:
+        if not self.conn:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.conn = sqlite3.connect(self.path, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "guild_id INTEGER PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL, previous BLOB)"
+            )
+            if "previous" not in {r[1] for r in self.conn.execute("PRAGMA table_info(sessions)")}:
+                self.conn.execute("ALTER TABLE sessions ADD COLUMN previous BLOB")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS journal ("
+                "guild_id INTEGER NOT NULL, seq INTEGER NOT NULL, data BLOB NOT NULL, PRIMARY KEY (guild_id, seq)"
+                ") WITHOUT ROWID"
+            )
+        return self.conn
+
+    async def run(self, func, *args):
+        return await asyncio.get_event_loop().run_in_executor(self.executor, partial(func, *args))
+
+    def transaction(self, *statements: tuple):
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                conn.execute(sql, params)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # os registros do journal (anteriores à sessão gravada) são removidos na mesma transação.
+    def save_sync(self, guild_id: int, data: bytes):
+        self.transaction(
+            ("INSERT INTO sessions (guild_id, data, updated_at) VALUES (?, ?, ?) "
+             "ON CONFLICT (guild_id) DO UPDATE SET previous = sessions.data, data = excluded.data, "
+             "updated_at = excluded.updated_at",
+             (guild_id, data, time())),
+            ("DELETE FROM journal WHERE guild_id = ?", (guild_id,)),
+        )
+
+    def append_sync(self, guild_id: int, seq: int, data: bytes):
+        self.connect().execute("INSERT OR REPLACE INTO journal (guild_id, seq, data) VALUES (?, ?, ?)",
+                               (guild_id, seq, data))
+
+    def delete_sync(self, guild_id: int):
+        self.transaction(
+            ("DELETE FROM sessions WHERE guild_id = ?", (guild_id,)),
+            ("DELETE FROM journal WHERE guild_id = ?", (guild_id,)),
+        )
+
+    # todas as sessões (com os registros do journal de cada uma) numa única consulta.
+    def load_all_sync(self) -> list[tuple[int, bytes, Optional[bytes], list[bytes]]]:
+
+        sessions = []
+
+        for guild_id, data, previous, entry in self.connect().execute(
+                "SELECT s.guild_id, s.data, s.previous, j.data FROM sessions s "
+                "LEFT JOIN journal j ON j.guild_id = s.guild_id ORDER BY s.guild_id, j.seq"
+        ):
+            if not sessions or sessions[-1][0] != guild_id:
+                sessions.append((guild_id, data, previous, []))
+            if entry is not None:
+                sessions[-1][3].append(entry)
+
+        return sessions
+
+    def load_sync(self, guild_id: int) -> Optional[tuple[bytes, Optional[bytes], list[bytes]]]:
+
+        conn = self.connect()
+
+        if not (row := conn.execute("SELECT data, previous FROM sessions WHERE guild_id = ?", (guild_id,)).fetchone()):
+            return
+
+        return row[0], row[1], [r[0] for r in conn.execute(
+            "SELECT data FROM journal WHERE guild_id = ? ORDER BY seq", (guild_id,)
+        )]
+
+    def close_sync(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    async def save(self, guild_id: int, data: bytes):
+        await self.run(self.save_sync, guild_id, data)
+
+    async def append(self, guild_id: int, seq: int, data: bytes):
+        await self.run(self.append_sync, guild_id, seq, data)
+
+    async def delete(self, guild_id: int):
+        await self.run(self.delete_sync, guild_id)
+
+    async def load_all(self) -> list[tuple[int, bytes, Optional[bytes], list[bytes]]]:
+        return await self.run(self.load_all_sync)
+
+    async def load(self, guild_id: int) -> Optional[tuple[bytes, Optional[bytes], list[bytes]]]:
+        return await self.run(self.load_sync, guild_id)
+
+    def close(self):
+        self.executor.submit(self.close_sync)
+        self.executor.shutdown(wait=False)
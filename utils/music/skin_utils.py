@@ -3,228 +3,355 @@ from __future__ import annotations
 
 import itertools
 import random
+import re
 from copy import deepcopy
 from typing import Optional, TYPE_CHECKING, Union
 
 import disnake
 
 from utils.music.converters import fix_characters, time_format
+from utils.others import TTLCache
 
 if TYPE_CHECKING:
     from utils.others import CustomContext
     from utils.music.models import LavalinkPlayer
 
-def track_title_format(
-        track_title: str,
-        track_author: str,
-        track_url: str,
-        track_duration: Union[int, float],
-        data: str,
-        track_number: int = 0
-):
 
-    return data. \
-        replace('{track.title_25}', fix_characters(track_title, 25)). \
-        replace('{track.title_42}', fix_characters(track_title, 42)). \
-        replace('{track.title_58}', fix_characters(track_title, 58)). \
-        replace('{track.title}', track_title). \
-        replace('{track.url}', track_url). \
-        replace('{track.author}', track_author). \
-        replace('{track.duration}', time_format(track_duration) if track_duration else "🔴 Live"). \
-        replace('{track.number}', str(track_number))
+track_placeholders = (
+    "track.title_25", "track.title_42", "track.title_58", "track.title", "track.url", "track.author",
+    "track.duration", "track.number",
+)
 
+skin_placeholders = track_placeholders + (
+    "track.thumb", "playlist.name", "playlist.url", "player.loop.mode", "player.queue.size", "player.queue.duration",
+    "player.volume",
+    "player.autoplay", "player.nightcore", "player.hint", "player.log.text", "player.log.emoji",
+    "requester.global_name", "requester.display_name", "requester.mention", "requester.avatar", "guild.color",
+    "guild.icon", "guild.name", "guild.id", "queue_format",
+)
 
-def replaces(
-    txt: str, info: dict, ctx: disnake.MessageInteraction, player: LavalinkPlayer, queue_text: str, track: dict
-):
+requester_placeholders = {"requester.global_name", "requester.display_name", "requester.mention", "requester.avatar"}
 
-    if player:
+sample_track = {
+    'title': 'Sekai - Burn Me Down [NCS Release]',
+    'author': "NoCopyrightSounds",
+    'url': "https://www.youtube.com/watch?v=2vFA0HL9kTk",
+    'duration': 215000
+}
 
-        try:
-            if not player.current.autoplay:
-                requester = player.guild.get_member(player.current.requester)
-                requester_global_name = requester.global_name
-                requester_display_name = requester.display_name
-                requester_mention = requester.mention
-                requester_avatar = requester.display_avatar.replace(static_format="png", size=512).url
-            else:
-                requester_global_name = "Recommendation"
-                requester_display_name = "Recommendation"
-                requester_mention = "Recommendation"
-                requester_avatar = player.guild.me.display_avatar.replace(static_format="png", size=512).url
-        except:
-            requester_global_name = "Unknown..."
-            requester_display_name = "Unknown..."
-            requester_mention = f"<@{player.current.requester}>"
-            requester_avatar = "https://i.ibb.co/LNpG5TM/unknown.png"
-
-        txt = track_title_format(
-            track_title=player.current.title,
-            track_author=player.current.author,
-            track_url=player.current.uri,
-            track_duration=player.current.duration if not player.current.is_stream else 0,
-            data=txt
-        ). \
-            replace('{track.thumb}', player.current.thumb). \
-            replace('{playlist.name}', player.current.playlist_name or "Sem playlist"). \
-            replace('{playlist.url}', player.current.playlist_url or player.controller_link). \
-            replace('{player.loop.mode}', 'Disabled' if not player.loop else 'Current music' if player.loop == "current" else "Queue"). \
-            replace('{player.queue.size}', str(len(player.queue or player.queue_autoplay))). \
-            replace('{player.volume}', str(player.volume)). \
-            replace('{player.autoplay}', "Enabled" if player.autoplay else "Disabled"). \
-            replace('{player.nightcore}', "Enabled" if player.nightcore else "Disabled"). \
-            replace('{player.hint}', player.current_hint). \
-            replace('{player.log.text}', player.command_log or "No record."). \
-            replace('{player.log.emoji}', player.command_log_emoji or ""). \
-            replace('{requester.global_name}', requester_global_name). \
-            replace('{requester.display_name}', requester_display_name). \
-            replace('{requester.mention}', requester_mention). \
-            replace('{requester.avatar}', requester_avatar). \
-            replace('{guild.color}', hex(player.guild.me.color.value)[2:]). \
-            replace('{guild.icon}', player.guild.icon.with_static_format("png").url if player.guild.icon else ""). \
-            replace('{guild.name}', player.guild.name). \
-            replace('{guild.id}', str(player.guild.id)). \
-            replace('{queue_format}', queue_text or "Empty queue...")
 
-    else:
+def placeholder_regex(names: tuple):
+    return re.compile("|".join(re.escape("{" + n + "}") for n in sorted(names, key=len, reverse=True)))
 
-        queue_max_entries = info.pop("queue_max_entries", 3) or 3
-
-        txt = track_title_format(
-            track_title=track['title'],
-            track_author=track['author'],
-            track_url=track['url'],
-            track_duration=track['duration'],
-            data=txt
-        ). \
-            replace('{track.thumb}', "https://img.youtube.com/vi/2vFA0HL9kTk/mqdefault.jpg"). \
-            replace('{playlist.name}', "🎵 DV 🎶"). \
-            replace('{playlist.url}', "https://www.youtube.com/playlist?list=PLKlXSJdWVVAD3iztmL2vFVrwA81sRkV7n"). \
-            replace('{player.loop.mode}', "Current Music"). \
-            replace('{player.queue.size}', f"{queue_max_entries}"). \
-            replace('{player.volume}', "100"). \
-            replace('{player.autoplay}', "Enabled"). \
-            replace('{player.nightcore}', "Enabled"). \
-            replace('{player.log.emoji}', "⏭️"). \
-            replace('{player.log.text}', f"{random.choice(ctx.guild.members)} skipped the song."). \
-            replace('{requester.global_name}', ctx.author.global_name). \
-            replace('{requester.display_name}', ctx.author.display_name). \
-            replace('{requester.mention}', ctx.author.mention). \
-            replace('{requester.avatar}', ctx.author.display_avatar.with_static_format("png").url). \
-            replace('{guild.color}', hex(ctx.bot.get_color(ctx.guild.me).value)[2:]). \
-            replace('{guild.icon}', ctx.guild.icon.with_static_format("png").url if ctx.guild.icon else ""). \
-            replace('{guild.name}', ctx.guild.name). \
-            replace('{guild.id}', str(ctx.guild.id)). \
-            replace('{queue_format}', queue_text or "(No songs).")
-
-    return txt
-
-
-def skin_converter(info: dict, ctx: Union[CustomContext, disnake.ModalInteraction] = None, player: Optional[LavalinkPlayer] = None) -> dict:
-
-    info = deepcopy(info)
 
-    try:
-        if len(str(info["queue_max_entries"])) > 2:
-            info["queue_max_entries"] = 7
-    except:
-        pass
+track_placeholder_regex = placeholder_regex(track_placeholders)
+skin_placeholder_regex = placeholder_regex(skin_placeholders)
 
-    queue_max_entries = info.pop("queue_max_entries", 7)
-    if len(str(queue_max_entries)) > 2:
-        queue_max_entries = 7
-
-    track = {}
-    queue_format = info.pop("queue_format", "")
-
-    controller_enabled = info.pop("controller_enabled", True)
-
-    if not isinstance(queue_format, str):
-        queue_text = ""
-    elif player:
-        player.controller_mode = controller_enabled
-        queue_text = "\n".join(track_title_format(
-            track_title=t.title,
-            track_author=t.author,
-            track_url=t.uri,
-            track_duration=t.duration,
-            data=queue_format,
-            track_number=n + 1
-        ) for n, t in enumerate(itertools.islice(player.queue or player.queue_autoplay, queue_max_entries)))
-    else:
-        track = {
-            'title': 'Sekai - Burn Me Down [NCS Release]',
-            'author': "NoCopyrightSounds",
-            'url': "https://www.youtube.com/watch?v=2vFA0HL9kTk",
-            'duration': 215000
-        }
-        queue_text = "\n".join(track_title_format(
-            track_title=t['title'],
-            track_author=t['author'],
-            track_url=t['url'],
-            track_duration=t['duration'],
-            data=queue_format,
-            track_number=n + 1
-        ) for n, t in enumerate([track] * queue_max_entries))
 
-    try:
-        if info["content"]:
-            info["content"] = replaces(info["content"], info=info, ctx=ctx, player=player, queue_text=queue_text, track=track)
-    except KeyError:
-        pass
+# Texto de uma skin separado em partes fixas e placeholders (as posições dos placeholders são calculadas apenas
+# uma vez) e montado em uma única passada usando os valores do contexto (placeholders sem valor no contexto são
+# mantidos no texto).
+class TextTemplate:
 
-    if embeds := info.get("embeds"):
+    __slots__ = ("parts", "slots")
 
-        for d in embeds:
-            try:
-                d["description"] = replaces(d["description"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
-            except KeyError:
-                pass
+    def __init__(self, text: str, regex: re.Pattern = skin_placeholder_regex):
+        self.parts: list[str] = []
+        self.slots: list[tuple[int, str]] = []
+        pos = 0
+        for match in regex.finditer(text):
+            if match.start() > pos:
+                self.parts.append(text[pos:match.start()])
+            self.slots.append((len(self.parts), match.group()[1:-1]))
+            self.parts.append(match.group())
+            pos = match.end()
+        if pos < len(text):
+            self.parts.append(text[pos:])
 
-            try:
-                d["footer"]["text"] = replaces(d["footer"]["text"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
-            except KeyError:
-                pass
+    @property
+    def names(self) -> set[str]:
+        return {n for i, n in self.slots}
 
+    def render(self, context: dict) -> str:
+        if not self.slots:
+            return "".join(self.parts)
+        parts = self.parts.copy()
+        for i, name in self.slots:
             try:
-                d["footer"]["icon_url"] = replaces(d["footer"]["icon_url"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
+                parts[i] = context[name]
             except KeyError:
-                pass
+                continue
+        return "".join(parts)
 
-            try:
-                d["author"]["name"] = replaces(d["author"]["name"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
-            except KeyError:
-                pass
 
-            try:
-                d["author"]["url"] = replaces(d["author"]["url"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
-            except KeyError:
-                pass
+def track_context(names: set, title: str, author: str, url: str, duration: Union[int, float], number: int = 0) -> dict:
 
-            try:
-                d["author"]["icon_url"] = replaces(d["author"]["icon_url"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
-            except KeyError:
-                pass
+    context = {}
 
-            try:
-                d["image"]["url"] = replaces(d["image"]["url"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
-            except KeyError:
-                pass
+    for name in names:
+        if name == "track.title":
+            context[name] = title
+        elif name == "track.title_25":
+            context[name] = fix_characters(title, 25)
+        elif name == "track.title_42":
+            context[name] = fix_characters(title, 42)
+        elif name == "track.title_58":
+            context[name] = fix_characters(title, 58)
+        elif name == "track.url":
+            context[name] = url or ""
+        elif name == "track.author":
+            context[name] = author
+        elif name == "track.duration":
+            context[name] = time_format(duration) if duration else "🔴 Live"
+        elif name == "track.number":
+            context[name] = str(number)
 
-            try:
-                d["thumbnail"]["url"] = replaces(d["thumbnail"]["url"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
-            except KeyError:
-                pass
+    return context
+
+
+def requester_context(player: LavalinkPlayer) -> dict:
+
+    try:
+        if not player.current.autoplay:
+            requester = player.guild.get_member(player.current.requester)
+            return {
+                "requester.global_name": requester.global_name,
+                "requester.display_name": requester.display_name,
+                "requester.mention": requester.mention,
+                "requester.avatar": requester.display_avatar.replace(static_format="png", size=512).url,
+            }
+        return {
+            "requester.global_name": "Recommendation",
+            "requester.display_name": "Recommendation",
+            "requester.mention": "Recommendation",
+            "requester.avatar": player.guild.me.display_avatar.replace(static_format="png", size=512).url,
+        }
+    except:
+        return {
+            "requester.global_name": "Unknown...",
+            "requester.display_name": "Unknown...",
+            "requester.mention": f"<@{player.current.requester}>",
+            "requester.avatar": "https://i.ibb.co/LNpG5TM/unknown.png",
+        }
+
+
+player_values = {
+    "track.thumb": lambda p: p.current.thumb,
+    "playlist.name": lambda p: p.current.playlist_name or "Sem playlist",
+    "playlist.url": lambda p: p.current.playlist_url or p.controller_link,
+    "player.loop.mode": lambda p: 'Disabled' if not p.loop else 'Current music' if p.loop == "current" else "Queue",
+    "player.queue.size": lambda p: str(len(p.queue or p.queue_autoplay)),
+    "player.queue.duration": lambda p: time_format(p.queue_stats.duration),
+    "player.volume": lambda p: str(p.volume),
+    "player.autoplay": lambda p: "Enabled" if p.autoplay else "Disabled",
+    "player.nightcore": lambda p: "Enabled" if p.nightcore else "Disabled",
+    "player.hint": lambda p: p.current_hint,
+    "player.log.text": lambda p: p.command_log or "No record.",
+    "player.log.emoji": lambda p: p.command_log_emoji or "",
+    "guild.color": lambda p: hex(p.guild.me.color.value)[2:],
+    "guild.icon": lambda p: p.guild.icon.with_static_format("png").url if p.guild.icon else "",
+    "guild.name": lambda p: p.guild.name,
+    "guild.id": lambda p: str(p.guild.id),
+}
+
+preview_values = {
+    "track.thumb": lambda c: "https://img.youtube.com/vi/2vFA0HL9kTk/mqdefault.jpg",
+    "playlist.name": lambda c: "🎵 DV 🎶",
+    "playlist.url": lambda c: "https://www.youtube.com/playlist?list=PLKlXSJdWVVAD3iztmL2vFVrwA81sRkV7n",
+    "player.loop.mode": lambda c: "Current Music",
+    "player.queue.size": lambda c: "3",
+    "player.queue.duration": lambda c: time_format(sample_track["duration"] * 3),
+    "player.volume": lambda c: "100",
+    "player.autoplay": lambda c: "Enabled",
+    "player.nightcore": lambda c: "Enabled",
+    "player.log.emoji": lambda c: "⏭️",
+    "player.log.text": lambda c: f"{random.choice(c.guild.members)} skipped the song.",
+    "requester.global_name": lambda c: c.author.global_name,
+    "requester.display_name": lambda c: c.author.display_name,
+    "requester.mention": lambda c: c.author.mention,
+    "requester.avatar": lambda c: c.author.display_avatar.with_static_format("png").url,
+    "guild.color": lambda c: hex(c.bot.get_color(c.guild.me).value)[2:],
+    "guild.icon": lambda c: c.guild.icon.with_static_format("png").url if c.guild.icon else "",
+    "guild.name": lambda c: c.guild.name,
+    "guild.id": lambda c: str(c.guild.id),
+}
+
+
+# Skin personalizada pré-processada: os textos das mensagens/embeds viram TextTemplate e a cada renderização
+# apenas os valores dos placeholders usados pela skin são calculados.
+class CompiledSkin:
+
+    embed_fields = (
+        ("description",), ("footer", "text"), ("footer", "icon_url"), ("author", "name"), ("author", "url"),
+        ("author", "icon_url"), ("image", "url"), ("thumbnail", "url"),
+    )
+
+    def __init__(self, info: dict):
+
+        info = deepcopy(info)
+
+        try:
+            if len(str(info["queue_max_entries"])) > 2:
+                info["queue_max_entries"] = 7
+        except:
+            pass
+
+        self.queue_max_entries = info.pop("queue_max_entries", 7)
+        if len(str(self.queue_max_entries)) > 2:
+            self.queue_max_entries = 7
+
+        queue_format = info.pop("queue_format", "")
+        self.queue_template = TextTemplate(queue_format, track_placeholder_regex) if isinstance(queue_format, str) else None
+
+        self.controller_enabled = info.pop("controller_enabled", True)
+
+        self.content = TextTemplate(info["content"]) if isinstance(info.get("content"), str) and info["content"] else None
+
+        self.embeds: list[tuple[dict, list[tuple[tuple, TextTemplate]]]] = []
+
+        for d in info.pop("embeds", None) or []:
+
+            templates = []
+
+            for path in self.embed_fields:
+                try:
+                    value = d[path[0]] if len(path) == 1 else d[path[0]][path[1]]
+                except (KeyError, TypeError):
+                    continue
+                if isinstance(value, str):
+                    templates.append((path, TextTemplate(value)))
 
             for n, f in enumerate(d.get("fields", [])):
-                f["name"] = replaces(f["name"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
-                f["value"] = replaces(f["value"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track)
+                templates.append((("fields", n, "name"), TextTemplate(f["name"])))
+                templates.append((("fields", n, "value"), TextTemplate(f["value"])))
 
-            try:
-                d["color"] = int(replaces(d["color"], info=d, ctx=ctx, player=player, queue_text=queue_text, track=track), 16)
-            except (KeyError, AttributeError):
-                pass
+            if isinstance(d.get("color"), str):
+                templates.append((("color",), TextTemplate(d["color"])))
+
+            self.embeds.append((d, templates))
+
+        self.data = info
+
+        self.names = set()
+        if self.content:
+            self.names.update(self.content.names)
+        for d, templates in self.embeds:
+            for path, template in templates:
+                self.names.update(template.names)
+
+        self.track_names = self.names.intersection(track_placeholders)
+        self.queue_names = self.queue_template.names if self.queue_template else set()
+
+    def queue_text(self, tracks: list[dict]) -> str:
+        return "\n".join(
+            self.queue_template.render(track_context(self.queue_names, number=n + 1, **t)) for n, t in enumerate(tracks)
+        )
+
+    def context(self, ctx: Union[CustomContext, disnake.ModalInteraction] = None,
+                player: Optional[LavalinkPlayer] = None) -> dict:
+
+        if player:
+
+            track = player.current
+
+            context = track_context(self.track_names, title=track.title, author=track.author, url=track.uri,
+                                    duration=track.duration if not track.is_stream else 0)
+
+            if self.queue_template is not None:
+                player.controller_mode = self.controller_enabled
+
+            if "queue_format" in self.names:
+                queue_text = self.queue_text(
+                    [{"title": t.title, "author": t.author, "url": t.uri, "duration": t.duration}
+                     for t in itertools.islice(player.queue or player.queue_autoplay, self.queue_max_entries)]
+                ) if self.queue_template else ""
+                context["queue_format"] = queue_text or "Empty queue..."
+
+            if self.names & requester_placeholders:
+                context.update(requester_context(player))
+
+            for name in self.names:
+                if name in player_values:
+                    context[name] = player_values[name](player)
+
+        else:
+
+            context = track_context(self.track_names, **sample_track)
+
+            if "queue_format" in self.names:
+                queue_text = self.queue_text([sample_track] * self.queue_max_entries) if self.queue_template else ""
+                context["queue_format"] = queue_text or "(No songs)."
+
+            for name in self.names:
+                if name in preview_values:
+                    context[name] = preview_values[name](ctx)
+
+        return context
+
+    def render(self, ctx: Union[CustomContext, disnake.ModalInteraction] = None,
+               player: Optional[LavalinkPlayer] = None) -> dict:
+
+        context = self.context(ctx=ctx, player=player)
+
+        data = dict(self.data)
+
+        if self.content:
+            data["content"] = self.content.render(context)
+
+        if self.embeds:
+
+            embeds = []
+
+            for d, templates in self.embeds:
+
+                # somente as partes alteradas da embed são copiadas (a skin compilada continua sem alterações).
+                e = dict(d)
+                for key in ("footer", "author", "image", "thumbnail"):
+                    if isinstance(e.get(key), dict):
+                        e[key] = dict(e[key])
+                if e.get("fields"):
+                    e["fields"] = [dict(f) for f in e["fields"]]
+
+                for path, template in templates:
+                    if path[0] == "color":
+                        e["color"] = int(template.render(context), 16)
+                    elif path[0] == "fields":
+                        e["fields"][path[1]][path[2]] = template.render(context)
+                    elif len(path) == 1:
+                        e[path[0]] = template.render(context)
+                    else:
+                        e[path[0]][path[1]] = template.render(context)
+
+                embeds.append(disnake.Embed.from_dict(e))
+
+            data["embeds"] = embeds
+
+        return data
+
+
+# skins compiladas pelo objeto da skin: as skins salvas são carregadas em um novo dict (e compiladas novamente) ao
+# serem editadas. O dict fica junto no cache pra que o id não seja reutilizado por outro objeto.
+compiled_skins = TTLCache(maxsize=500, ttl=86400)
+
+
+def compile_skin(info: dict, cache: bool = True) -> CompiledSkin:
+
+    if not cache:
+        return CompiledSkin(info)
+
+    try:
+        cached_info, skin = compiled_skins.get(id(info))
+    except TypeError:
+        pass
+    else:
+        if cached_info is info:
+            return skin
+
+    skin = CompiledSkin(info)
+    compiled_skins.set(id(info), (info, skin))
+    return skin
 
-        info["embeds"] = [disnake.Embed.from_dict(e) for e in embeds]
 
-    return info
+def skin_converter(info: dict, ctx: Union[CustomContext, disnake.ModalInteraction] = None, player: Optional[LavalinkPlayer] = None,
+                   cache: bool = True) -> dict:
+    return compile_skin(info, cache=cache).render(ctx=ctx, player=player)
@@ -121,11 +121,7 @@ class DefaultSkin:
 
                 if not player.loop and not player.keep_connected and not player.paused:
 
-                    queue_duration = 0
-
-                    for t in player.queue:
-                        if not t.is_stream:
-                            queue_duration += t.duration
+                    queue_duration = player.queue_stats.duration
 
                     embed_queue.description += f"\n`[⌛ Songs end` <t:{int((disnake.utils.utcnow() + datetime.timedelta(milliseconds=(queue_duration + (player.current.duration if not player.current.is_stream else 0)) - player.position)).timestamp())}:R> `⌛]`"
 
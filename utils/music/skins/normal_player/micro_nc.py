@@ -10,6 +10,8 @@ from utils.music.models import LavalinkPlayer
 class MicroNC:
 
     __slots__ = ("name", "preview")
+    # renderizar é mais rápido que consultar o cache de renderização.
+    render_cache = False
 
     def __init__(self):
         self.name = basename(__file__)[:-3]
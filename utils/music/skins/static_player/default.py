@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import datetime
+import itertools
 from os.path import basename
 
 import disnake
@@ -11,6 +12,8 @@ from utils.others import PlayerControls
 
 class DefaultStaticSkin:
     __slots__ = ("name", "preview")
+    # exibe a menção do canal de voz (renderização depende do servidor).
+    voice_channel_render = True
 
     def __init__(self):
         self.name = basename(__file__)[:-3] + "_static"
@@ -114,7 +117,7 @@ class DefaultStaticSkin:
 
             queue_duration = 0
 
-            for n, t in enumerate(player.queue):
+            for n, t in enumerate(itertools.islice(player.queue, 8)):
 
                 if t.is_stream:
                     has_stream = True
@@ -122,11 +125,6 @@ class DefaultStaticSkin:
                 elif n != 0:
                     queue_duration += t.duration
 
-                if n > 7:
-                    if has_stream:
-                        break
-                    continue
-
                 if has_stream:
                     duration = time_format(t.duration) if not t.is_stream else '🔴 Ao vivo'
 
@@ -144,7 +142,9 @@ class DefaultStaticSkin:
             embed_queue = disnake.Embed(title=f"Songs in queue: {qlenght}", color=player.bot.get_color(player.guild.me),
                                         description=f"\n{queue_txt}")
 
-            if not has_stream and not player.loop and not player.keep_connected and not player.paused and not player.current.is_stream:
+            if not player.queue_stats.streams and not player.loop and not player.keep_connected and not player.paused and not player.current.is_stream:
+                # duração total da fila pelo queue_stats (sem percorrer a fila), calculada igual ao horário das músicas exibidas.
+                queue_duration = player.queue_stats.duration - player.queue[0].duration
                 embed_queue.description += f"\n`[ ⌛ Songs end` <t:{int((current_time + datetime.timedelta(milliseconds=queue_duration + player.current.duration)).timestamp())}:R> `⌛ ]`"
 
             embed_queue.set_image(url=queue_img)
@@ -159,7 +159,7 @@ class DefaultStaticSkin:
 
             queue_duration = 0
 
-            for n, t in enumerate(player.queue_autoplay):
+            for n, t in enumerate(itertools.islice(player.queue_autoplay, 8)):
 
                 if t.is_stream:
                     has_stream = True
@@ -167,11 +167,6 @@ class DefaultStaticSkin:
                 elif n != 0:
                     queue_duration += t.duration
 
-                if n > 7:
-                    if has_stream:
-                        break
-                    continue
-
                 if has_stream:
                     duration = time_format(t.duration) if not t.is_stream else '🔴 Live'
 
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import datetime
+import itertools
 from os.path import basename
 
 import disnake
@@ -12,6 +13,8 @@ from utils.others import ProgressBar, PlayerControls
 class DefaultProgressbarStaticSkin:
 
     __slots__ = ("name", "preview")
+    # exibe a menção do canal de voz (renderização depende do servidor).
+    voice_channel_render = True
 
     def __init__(self):
         self.name = basename(__file__)[:-3] + "_static"
@@ -124,7 +127,7 @@ class DefaultProgressbarStaticSkin:
 
             queue_duration = 0
 
-            for n, t in enumerate(player.queue):
+            for n, t in enumerate(itertools.islice(player.queue, 8)):
 
                 if t.is_stream:
                     has_stream = True
@@ -132,11 +135,6 @@ class DefaultProgressbarStaticSkin:
                 elif n != 0:
                     queue_duration += t.duration
 
-                if n > 7:
-                    if has_stream:
-                        break
-                    continue
-
                 if has_stream:
                     duration = time_format(t.duration) if not t.is_stream else '🔴 Live'
 
@@ -155,7 +153,9 @@ class DefaultProgressbarStaticSkin:
                                         color=player.bot.get_color(player.guild.me),
                                         description=f"\n{queue_txt}")
 
-            if not has_stream and not player.loop and not player.keep_connected and not player.paused and not player.current.is_stream:
+            if not player.queue_stats.streams and not player.loop and not player.keep_connected and not player.paused and not player.current.is_stream:
+                # duração total da fila pelo queue_stats (sem percorrer a fila), calculada igual ao horário das músicas exibidas.
+                queue_duration = player.queue_stats.duration - player.queue[0].duration
                 embed_queue.description += f"\n`[ ⌛ Songs end` <t:{int((current_time + datetime.timedelta(milliseconds=queue_duration + player.current.duration)).timestamp())}:R> `⌛ ]`"
 
             embed_queue.set_image(url=queue_img)
@@ -170,7 +170,7 @@ class DefaultProgressbarStaticSkin:
 
             queue_duration = 0
 
-            for n, t in enumerate(player.queue_autoplay):
+            for n, t in enumerate(itertools.islice(player.queue_autoplay, 8)):
 
                 if t.is_stream:
                     has_stream = True
@@ -178,11 +178,6 @@ class DefaultProgressbarStaticSkin:
                 elif n != 0:
                     queue_duration += t.duration
 
-                if n > 7:
-                    if has_stream:
-                        break
-                    continue
-
                 if has_stream:
                     duration = time_format(t.duration) if not t.is_stream else '🔴 Live'
 
@@ -13,6 +13,8 @@ from utils.others import PlayerControls
 
 class EmbedLinkStaticSkin:
     __slots__ = ("name", "preview")
+    # exibe a menção do canal de voz (renderização depende do servidor).
+    voice_channel_render = True
 
     def __init__(self):
         self.name = basename(__file__)[:-3] + "_static"
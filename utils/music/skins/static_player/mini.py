@@ -93,7 +93,7 @@ class MiniStaticSkin:
 
             queue_duration = 0
 
-            for n, t in enumerate(player.queue):
+            for n, t in enumerate(itertools.islice(player.queue, 8)):
 
                 if t.is_stream:
                     has_stream = True
@@ -101,11 +101,6 @@ class MiniStaticSkin:
                 elif n != 0:
                     queue_duration += t.duration
 
-                if n > 7:
-                    if has_stream:
-                        break
-                    continue
-
                 if has_stream:
                     duration = time_format(t.duration) if not t.is_stream else '🔴 Live'
 
@@ -124,7 +119,9 @@ class MiniStaticSkin:
                                         color=player.bot.get_color(player.guild.me),
                                         description=f"\n{queue_txt}")
 
-            if not has_stream and not player.loop and not player.keep_connected and not player.paused and not player.current.is_stream:
+            if not player.queue_stats.streams and not player.loop and not player.keep_connected and not player.paused and not player.current.is_stream:
+                # duração total da fila pelo queue_stats (sem percorrer a fila), calculada igual ao horário das músicas exibidas.
+                queue_duration = player.queue_stats.duration - player.queue[0].duration
                 embed_queue.description += f"\n`[ ⌛ Songs end` <t:{int((current_time + datetime.timedelta(milliseconds=queue_duration + player.current.duration)).timestamp())}:R> `⌛ ]`"
 
         elif player.queue_autoplay:
@@ -137,7 +134,7 @@ class MiniStaticSkin:
 
             queue_duration = 0
 
-            for n, t in enumerate(player.queue_autoplay):
+            for n, t in enumerate(itertools.islice(player.queue_autoplay, 8)):
 
                 if t.is_stream:
                     has_stream = True
@@ -145,11 +142,6 @@ class MiniStaticSkin:
                 elif n != 0:
                     queue_duration += t.duration
 
-                if n > 7:
-                    if has_stream:
-                        break
-                    continue
-
                 if has_stream:
                     duration = time_format(t.duration) if not t.is_stream else '🔴 Live'
 
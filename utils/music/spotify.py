@@ -56,14 +56,14 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
             requester=requester
         )
 
-        t.info["extra"]["authors"] = [fix_characters(i['name']) for i in result['artists'] if f"feat. {i['name'].lower()}"
+        t.extra["authors"] = [fix_characters(i['name']) for i in result['artists'] if f"feat. {i['name'].lower()}"
                                       not in result['name'].lower()]
 
-        t.info["extra"]["authors_md"] = ", ".join(f"[`{a['name']}`]({a['external_urls']['spotify']})" for a in result["artists"])
+        t.extra["authors_md"] = ", ".join(f"[`{a['name']}`]({a['external_urls']['spotify']})" for a in result["artists"])
 
         try:
             if result["album"]["name"] != result["name"]:
-                t.info["extra"]["album"] = {
+                t.extra["album"] = {
                     "name": result["album"]["name"],
                     "url": result["album"]["external_urls"]["spotify"]
                 }
@@ -168,12 +168,12 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
         )
 
         try:
-            track.info["isrc"] = t["external_ids"]["isrc"]
+            track.isrc = t["external_ids"]["isrc"]
         except KeyError:
             pass
 
         try:
-            track.info["extra"]["album"] = {
+            track.extra["album"] = {
                 "name": t["album"]["name"],
                 "url": t["album"]["external_urls"]["spotify"]
             }
@@ -181,11 +181,11 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
             pass
 
         if t["artists"][0]["name"]:
-            track.info["extra"]["authors"] = [fix_characters(i['name']) for i in t['artists'] if f"feat. {i['name'].lower()}" not in t['name'].lower()]
-            track.info["extra"]["authors_md"] = ", ".join(f"[`{fix_characters(a['name'])}`](" + a['external_urls'].get('spotify', f'https://www.youtube.com/results?search_query={quote(t["name"])}') + ")" for a in t['artists'])
+            track.extra["authors"] = [fix_characters(i['name']) for i in t['artists'] if f"feat. {i['name'].lower()}" not in t['name'].lower()]
+            track.extra["authors_md"] = ", ".join(f"[`{fix_characters(a['name'])}`](" + a['external_urls'].get('spotify', f'https://www.youtube.com/results?search_query={quote(t["name"])}') + ")" for a in t['artists'])
         else:
-            track.info["extra"]["authors"] = ["Unknown Artist"]
-            track.info["extra"]["authors_md"] = "`Unknown Artist`"
+            track.extra["authors"] = ["Unknown Artist"]
+            track.extra["authors_md"] = "`Unknown Artist`"
 
         playlist.tracks.append(track)
 
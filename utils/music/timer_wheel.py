@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import traceback
+from collections import Counter
+from math import ceil
+from time import monotonic
+from typing import Awaitable, Callable, Optional
+
+
+class Timer:
+
+    __slots__ = ("wheel", "expires", "callback", "name", "task", "slot")
+
+    def __init__(self, wheel: TimerWheel, expires: int, callback: Callable[[], Awaitable], name: str):
+        self.wheel = wheel
+        self.expires = expires
+        self.callback = callback
+        self.name = name
+        self.task: Optional[asyncio.Task] = None
+        self.slot: Optional[dict] = None
+
+    def __repr__(self):
+        return f"<Timer name={self.name!r} expires={self.expires} pending={self.pending}>"
+
+    @property
+    def pending(self) -> bool:
+        return self.slot is not None
+
+    # mesmo comportamento do cancel() das tasks: cancela o timer e também a task caso ele já tenha disparado.
+    def cancel(self):
+        self.wheel.remove(self)
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+    def done(self) -> bool:
+        return self.slot is None and (not self.task or self.task.done())
+
+
+# Timer wheel hierárquico (compartilhado por todos os players da pool) para os timeouts dos players
+# (inatividade, falta de membros, auto-skip, reconexão): agendar/cancelar/reagendar custa O(1) e nenhuma task
+# fica aguardando enquanto o timer não dispara (o callback só vira uma task ao expirar).
+# Cada nível tem 64 posições: nível 0 = 1 tick (1 segundo), nível 1 = 64 ticks, nível 2 = 4096 ticks...
+# e os timers dos níveis superiores descem de nível quando o wheel chega no intervalo deles.
+class TimerWheel:
+
+    def __init__(self, resolution: float = 1, slots: int = 64, levels: int = 4):
+        self.resolution = resolution
+        self.slots = slots
+        self.wheels: list[list[dict]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self.overflow: dict[Timer, None] = {}
+        self.tick = 0
+        self.origin = monotonic()
+        self.counts: Counter = Counter()
+        self.wakeup: Optional[asyncio.Event] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return self.pending
+
+    @property
+    def pending(self) -> int:
+        return sum(self.counts.values())
+
+    def stats(self) -> dict:
+        return {name: amount for name, amount in self.counts.items() if amount}
+
+    def current_tick(self) -> int:
+        return int((monotonic() - self.origin) / self.resolution)
+
+    def expiration(self, delay: float) -> int:
+        return max(ceil((monotonic() - self.origin + delay) / self.resolution), self.tick + 1)
+
+    def schedule(self, delay: float, callback: Callable[[], Awaitable], name: str = "") -> Timer:
+
+        timer = Timer(self, 0, callback, name)
+
+        if delay <= 0:
+            self.fire(timer)
+        else:
+            if not self.pending:
+                # o wheel ficou parado (sem timers): avança direto pro tick atual.
+                self.tick = max(self.tick, self.current_tick())
+            timer.expires = self.expiration(delay)
+            self.insert(timer)
+            self.counts[name] += 1
+            self.start()
+
+        return timer
+
+    def reschedule(self, timer: Timer, delay: float) -> Timer:
+        if not timer.pending:
+            return self.schedule(delay, timer.callback, timer.name)
+        self.remove(timer)
+        timer.expires = self.expiration(delay)
+        self.insert(timer)
+        self.counts[timer.name] += 1
+        return timer
+
+    def remove(self, timer: Timer):
+        if timer.slot is None:
+            return
+        del timer.slot[timer]
+        timer.slot = None
+        self.counts[timer.name] -= 1
+
+    def insert(self, timer: Timer):
+
+        delta = timer.expires - self.tick
+        span = self.slots
+
+        for level in self.wheels:
+            if delta < span:
+                slot = level[(timer.expires * self.slots // span) % self.slots]
+                break
+            span *= self.slots
+        else:
+            slot = self.overflow
+
+        slot[timer] = None
+        timer.slot = slot
+
+    def fire(self, timer: Timer):
+        timer.task = asyncio.get_event_loop().create_task(self.run_callback(timer))
+
+    async def run_callback(self, timer: Timer):
+        try:
+            await timer.callback()
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            traceback.print_exc()
+
+    def cascade(self, slot: dict):
+        timers = list(slot)
+        slot.clear()
+        for timer in timers:
+            self.insert(timer)
+
+    def advance(self, tick: int):
+
+        while self.tick < tick:
+
+            self.tick += 1
+            index = self.tick % self.slots
+
+            if not index:
+
+                # os níveis superiores são processados primeiro (os timers podem descer mais de um nível).
+                levels = []
+                span = 1
+
+                for n in range(1, len(self.wheels)):
+                    span *= self.slots
+                    levels.append(self.wheels[n][(self.tick // span) % self.slots])
+                    if (self.tick // span) % self.slots:
+                        break
+                else:
+                    levels.append(self.overflow)
+
+                for slot in reversed(levels):
+                    self.cascade(slot)
+
+            slot = self.wheels[0][index]
+
+            if not slot:
+                continue
+
+            timers = list(slot)
+            slot.clear()
+
+            for timer in timers:
+                timer.slot = None
+                self.counts[timer.name] -= 1
+                self.fire(timer)
+
+    def start(self):
+        if self.task and not self.task.done():
+            self.wakeup.set()
+            return
+        self.wakeup = asyncio.Event()
+        self.task = asyncio.get_event_loop().create_task(self.run())
+
+    async def run(self):
+
+        while True:
+
+            if not self.pending:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+
+            await asyncio.sleep(max((self.tick + 1) * self.resolution + self.origin - monotonic(), 0))
+
+            try:
+                self.advance(self.current_tick())
+            except Exception:
+                traceback.print_exc()
@@ -101,7 +101,7 @@ class YTDLTools:
                 source_name=entrie["extractor"],
             )
 
-            t.info.update({
+            t.update_info({
                 "search_uri": entrie["url"],
                 "authors": entrie["uploader"]
             })
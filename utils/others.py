@@ -6,7 +6,9 @@ import asyncio
 import datetime
 import json
 import re
+from collections import OrderedDict
 from inspect import iscoroutinefunction
+from time import monotonic
 from io import BytesIO
 from typing import TYPE_CHECKING, Union, Optional
 
@@ -142,6 +144,53 @@ class ProgressBar:
         self.end = int(bar_count - self.start) - 1
 
 
+class TTLCache:
+
+    def __init__(self, maxsize: int = 1000, ttl: Union[int, float] = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+
+        try:
+            expires, value = self.data[key]
+        except KeyError:
+            return default
+
+        if expires < monotonic():
+            del self.data[key]
+            return default
+
+        self.data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: Union[int, float] = None):
+
+        self.data[key] = (monotonic() + (ttl or self.ttl), value)
+        self.data.move_to_end(key)
+
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        try:
+            return self.data.pop(key)[1]
+        except KeyError:
+            return default
+
+    def purge_expired(self):
+        now = monotonic()
+        for key in [k for k, (expires, _) in self.data.items() if expires < now]:
+            del self.data[key]
+
+
 class PlayerControls:
     add_song = "musicplayer_add_song"
     enqueue_fav = "musicplayer_enqueue_fav"
@@ -728,57 +777,19 @@ def queue_track_index(inter: disnake.AppCmdInter, bot: BotCore, query: str, matc
     except:
         unique_id = None
 
-    query_split = query.lower().split()
-
-    tracklist = []
-
-    count = int(match_count)
-
-    for counter, track in enumerate(player.queue + player.queue_autoplay):
-
-        if unique_id is not None:
-
-            if unique_id == track.unique_id:
-                return [(counter, track,)]
-
-            if match_count < 2:
-                continue
-
-        if case_sensitive:
-
-            track_split = track.title.lower().split()
+    if unique_id is not None:
 
+        for offset, queue in ((0, player.queue), (len(player.queue), player.queue_autoplay)):
             try:
-                check = all(w == track_split[i] for i, w in enumerate(query_split))
-            except IndexError:
+                index = queue.index_by_id(unique_id)
+            except ValueError:
                 continue
+            return [(offset + index, queue[index],)]
 
-            if check:
-                tracklist.append((counter, track,))
-                count -= 1
-                if not count:
-                    break
-
-        else:
-            track_title = track.title.lower().split()
-
-            q_found = 0
-
-            for q in query_split:
-                for t in track_title:
-                    if q in t:
-                        q_found += 1
-                        track_title.remove(t)
-                        break
-
-            if q_found == len(query_split):
-
-                tracklist.append((counter, track,))
-                count -= 1
-                if not count:
-                    break
+        if match_count < 2:
+            return []
 
-    return tracklist
+    return player.search_queue(query, limit=match_count, exact=case_sensitive)
 
 def update_inter(old: Union[disnake.Interaction, CustomContext], new: disnake.Interaction):
 